@@ -0,0 +1,145 @@
+"""
+求人詳細ページ1件あたりのWebDriverコマンド数を計測するマイクロベンチマーク
+
+ブラウザやネットワークを使わず、コマンド数を数える疑似ドライバー上で
+カード項目の取得（旧: 項目ごとにページ全体のタグを再検索）と
+_scrape_job_selenium 全体のコマンド数を比較する。
+
+使い方:
+    python benchmarks/driver_commands.py [--items 12] [--tags 8] [--max-commands 30]
+
+--max-commands を超えた場合は終了コード1を返す（回帰の検出用）。
+"""
+import argparse
+import logging
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By  # noqa: E402
+
+import green_scraper  # noqa: E402
+from green_scraper import GreenScraper  # noqa: E402
+
+
+class FakeElement:
+    """読み取りのたびにドライバーへコマンドを記録する疑似要素"""
+
+    def __init__(self, driver, text="", href=None):
+        self._driver = driver
+        self._text = text
+        self._href = href
+
+    @property
+    def text(self):
+        self._driver.record("getElementText")
+        return self._text
+
+    def get_attribute(self, name):
+        self._driver.record("getElementAttribute")
+        return self._href if name == "href" else None
+
+    def click(self):
+        self._driver.record("clickElement")
+        self._driver.current_page = "company"
+
+
+class CountingDriver:
+    """求人詳細ページと会社情報ページを模した、コマンド数を数える疑似ドライバー"""
+
+    def __init__(self, items, tags):
+        self.item_texts = [f"勤務地：東京都{i}" if i == 0 else f"項目{i}" for i in range(items)]
+        self.tag_texts = [f"Lang{i}" for i in range(tags)]
+        self.fields = [["企業名", "株式会社サンプル"], ["年収", "600万円〜900万円"], ["勤務時間", "10:00〜19:00"]]
+        self.company_texts = ["設立年月\n2010年", "従業員数\n120人", "平均年齢\n32歳"]
+        self.current_page = "job"
+        self.commands = Counter()
+        self.card_commands = 0
+
+    def record(self, command):
+        self.commands[command] += 1
+
+    def get(self, url):
+        self.record("get")
+        self.current_page = "company" if "/company/" in url else "job"
+
+    def find_element(self, by, value):
+        self.record("findElement")
+        if value == green_scraper.COMPANY_LINK_XPATH:
+            return FakeElement(self, "会社情報", "https://example.com/company/1")
+        return FakeElement(self)
+
+    def find_elements(self, by, value):
+        self.record("findElements")
+        if value == ".card-tag__item":
+            return [FakeElement(self, text) for text in self.tag_texts]
+        if by == By.CSS_SELECTOR and value == green_scraper.DETAIL_ITEMS_SELECTOR:
+            return [FakeElement(self, text) for text in self.item_texts]
+        return [FakeElement(self)]
+
+    def execute_script(self, script, *args):
+        self.record("executeScript")
+        if script == green_scraper.JOB_CARD_SCRIPT:
+            self.card_commands += 1
+            return {"items": list(self.item_texts), "tags": list(self.tag_texts)}
+        if script == green_scraper.FIELD_SNAPSHOT_SCRIPT:
+            return [list(field) for field in self.fields]
+        if script == green_scraper.XPATH_TEXTS_SCRIPT:
+            if args and args[0] == green_scraper.COMPANY_CONTAINER_XPATH:
+                return list(self.company_texts)
+            return []
+        return True
+
+
+def legacy_card_pass(driver, job_data):
+    """変更前のカード項目取得（項目ごとに.card-tag__itemを再検索し、タグごとに.textを読む）"""
+    detail_items = driver.find_elements(By.CSS_SELECTOR, green_scraper.DETAIL_ITEMS_SELECTOR)
+    for item in detail_items:
+        item_text = item.text
+        if "勤務地" in item_text:
+            job_data["勤務地"] = item_text.replace("勤務地：", "").strip()
+        language_tags = driver.find_elements(By.CSS_SELECTOR, ".card-tag__item")
+        if language_tags:
+            job_data["利用言語"] = ", ".join(tag.text for tag in language_tags)
+
+
+def make_scraper(driver):
+    """ブラウザを起動せずに疑似ドライバーでGreenScraperを作成する"""
+    scraper = GreenScraper(driver=driver, base_url="https://example.com")
+    scraper.company_cache = None
+    scraper.job_store = None
+    return scraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="求人詳細ページ1件あたりのWebDriverコマンド数を計測する")
+    parser.add_argument("--items", type=int, default=12, help="カード項目の数")
+    parser.add_argument("--tags", type=int, default=8, help="利用言語タグの数")
+    parser.add_argument("--max-commands", type=int, default=0, help="1件あたりのコマンド数の上限（0は無制限）")
+    args = parser.parse_args()
+    # スクレイパーのINFOログは計測結果の表示に不要なため抑制する
+    logging.disable(logging.INFO)
+
+    legacy = CountingDriver(args.items, args.tags)
+    legacy_card_pass(legacy, GreenScraper.new_job_data("https://example.com/job/1"))
+
+    current = CountingDriver(args.items, args.tags)
+    scraper = make_scraper(current)
+    scraper._scrape_job_selenium("https://example.com/job/1", GreenScraper.new_job_data("https://example.com/job/1"))
+
+    print(f"カード項目 {args.items}件 / 利用言語タグ {args.tags}件")
+    print(f"  カード項目の取得（変更前）: {sum(legacy.commands.values())} コマンド {dict(legacy.commands)}")
+    print(f"  カード項目の取得（現在）  : {current.card_commands} コマンド")
+    total = sum(current.commands.values())
+    print(f"  求人1件あたりの合計（現在）: {total} コマンド {dict(current.commands)}")
+
+    if args.max_commands and total > args.max_commands:
+        print(f"コマンド数が上限 {args.max_commands} を超えました")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
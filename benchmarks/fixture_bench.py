@@ -0,0 +1,391 @@
+"""
+保存済みHTMLを使ったオフラインのベンチマーク
+
+benchmarks/fixtures/ のお気に入り一覧・求人詳細・会社情報ページをローカルのHTTPサーバーで配信し、
+ログインせずに抽出処理全体を計測する。
+
+- selenium: ヘッドレスChromeで scrape_favorites を実行（collect_favorites・get_detailed_info・get_company_info を含む）
+- selenium-lean: selenium と同じ処理を軽量読み込み（LEAN_LOAD: 画像・フォント・解析タグの遮断、eager）で実行
+- http: ブラウザを使わずHTTPエンジン（lxml）で各求人の scrape_job を実行
+- http-structured: http と同じ処理を構造化データ（__NEXT_DATA__）からの抽出（EXTRACTION_MODE = "structured"）で実行し、
+  構造化データから抽出した値がHTMLからの値と異なる列を structured_mismatches に表示
+  （fixtures/job.html の__NEXT_DATA__は画面と同じラベル・値の組で作成したもので、実際のレスポンスを保存したものではない）
+- selenium-pipeline / http-pipeline: 取得・抽出・出力を別スレッドで並行して行うパイプライン（PIPELINE_MODE）で実行
+- parse_requirements: fixtures/requirements.txt の応募資格テキストを解析
+
+求人数/秒・求人1件あたりのWebDriverコマンド数・1ページあたりの転送バイト数・最大RSS・処理段階ごとのp50/p95と、
+パイプラインの場合はキューごとの平均の長さ・待ち時間を表示する。
+--output で結果をJSONに保存し、--compare で別のコミットの結果と比較できる。
+
+使い方:
+    python benchmarks/fixture_bench.py [--jobs 20] [--backends selenium,selenium-pipeline,http,http-pipeline] [--output result.json] [--compare base.json]
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import green_scraper  # noqa: E402
+from green_scraper import GreenScraper, HttpFetchEngine  # noqa: E402
+
+# 計測する処理段階（GreenScraperのメソッド名）
+STAGES = (
+    "collect_favorites", "scrape_job", "get_detailed_info", "get_detailed_info_http",
+    "get_company_info", "parse_requirements",
+)
+
+# 構造化データとHTMLの両方から取得する列（http-structuredで、構造化データからの抽出結果がHTMLからの抽出結果と一致するか確認する）
+STRUCTURED_CHECK_COLUMNS = (
+    "企業名", "給与", "時間", "休日日数", "待遇・福利厚生", "働き方", "採用人数", "応募資格", "必須資格", "歓迎資格", "利用言語",
+)
+
+CARD_PATTERN = re.compile(r"<!-- card -->(.*?)<!-- /card -->", re.S)
+
+
+def load_fixture(name):
+    """fixturesディレクトリのファイルを読み込む"""
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def load_requirements_corpus():
+    """応募資格テキストのコーパス（"----" 区切り）を読み込む"""
+    return [text.strip() for text in load_fixture("requirements.txt").split("\n----\n") if text.strip()]
+
+
+class FixtureServer:
+    """保存済みHTMLを配信するローカルHTTPサーバー（求人数分のカードを一覧に展開する）"""
+
+    def __init__(self, jobs):
+        favorites = load_fixture("favorites.html")
+        card = CARD_PATTERN.search(favorites).group(1)
+        cards = "".join(card.replace("__JOB_ID__", str(i)) for i in range(1, jobs + 1))
+        self.pages = {
+            "favorites": CARD_PATTERN.sub(lambda m: cards, favorites),
+            "job": load_fixture("job.html"),
+            "company": load_fixture("company.html"),
+        }
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.job_urls = [f"{self.url}/company/{i}/job/{i}" for i in range(1, jobs + 1)]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def _handler(self):
+        pages = self.pages
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0].rstrip("/")
+                body = None
+                if path == "/favorites/sent":
+                    body = pages["favorites"]
+                elif re.fullmatch(r"/company/\d+/job/\d+", path):
+                    body = pages["job"].replace("__JOB_ID__", path.rsplit("/", 1)[1])
+                elif re.fullmatch(r"/company/\d+", path):
+                    body = pages["company"].replace("__JOB_ID__", path.rsplit("/", 1)[1])
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StageTimer:
+    """GreenScraperのメソッドをラップし、呼び出しごとの処理時間を記録する"""
+
+    def __init__(self, scraper, stages=STAGES):
+        self.durations = defaultdict(list)
+        for name in stages:
+            method = getattr(scraper, name, None)
+            if method is not None:
+                setattr(scraper, name, self._wrap(name, method))
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.durations[name].append(time.perf_counter() - started)
+        return timed
+
+    def summary(self):
+        return {name: latency_stats(values) for name, values in self.durations.items()}
+
+
+class StubDriver:
+    """HTTPバックエンド用の最小限のドライバー（Cookieなし、WebDriverコマンドは発行しない）"""
+
+    def execute_script(self, script, *args):
+        return "green-scraper-benchmark"
+
+    def get_cookies(self):
+        return []
+
+
+def count_driver_commands(driver):
+    """driver.executeをラップし、WebDriverコマンドを種類ごとに数える（要素の操作も含む）"""
+    commands = Counter()
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        commands[driver_command] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return commands
+
+
+def percentile(values, ratio):
+    """最近傍順位法によるパーセンタイル"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(ratio * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def latency_stats(values):
+    """処理時間（秒）のリストから件数・p50・p95（ミリ秒）を求める"""
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+    }
+
+
+def peak_rss_mb():
+    """このプロセスの最大RSS（MB、取得できない環境ではNone）"""
+    if not HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linuxはキロバイト、macOSはバイト単位
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def create_headless_chrome(lean=False):
+    """ベンチマーク用のヘッドレスChromeを起動する"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")
+    GreenScraper._apply_common_chrome_options(options, lean=lean)
+    return webdriver.Chrome(options=options)
+
+
+def run_selenium(server, lean=False, pipeline=False):
+    """ヘッドレスChromeでscrape_favoritesを実行する"""
+    driver = create_headless_chrome(lean)
+    try:
+        commands = count_driver_commands(driver)
+        scraper = GreenScraper(driver=driver, base_url=server.url)
+        scraper.fetch_backend = "selenium"
+        if lean:
+            scraper.enable_lean_load()
+        scraper.measure_page_bytes = True
+        timer = StageTimer(scraper)
+        started = time.perf_counter()
+        data = scraper.scrape_favorites(max_retries=0, max_workers=1, incremental=False, pipeline=pipeline)
+        elapsed = time.perf_counter() - started
+        scraper.record_page_bytes()
+        summary = scraper.metrics.summary()
+        page_bytes = summary["page_bytes"] or {}
+        jobs = len(data)
+        return {
+            "jobs": jobs,
+            "seconds": round(elapsed, 3),
+            "jobs_per_sec": round(jobs / elapsed, 2) if elapsed else None,
+            "driver_commands_per_job": round(sum(commands.values()) / jobs, 1) if jobs else None,
+            "driver_commands": dict(commands.most_common()),
+            "page_loads": scraper.page_load_count,
+            "bytes_per_page": page_bytes.get("avg"),
+            "stages": timer.summary(),
+            "queues": summary["queues"],
+        }
+    finally:
+        driver.quit()
+
+
+def structured_mismatches(server):
+    """fixturesの求人詳細ページで、構造化データから抽出した値がHTMLから抽出した値と異なる列を返す"""
+    job_url = server.job_urls[0]
+    tree = green_scraper.parse_html(server.pages["job"].replace("__JOB_ID__", job_url.rsplit("/", 1)[1]))
+    from_html = GreenScraper.new_job_data(job_url)
+    from_structured = GreenScraper.new_job_data(job_url)
+    green_scraper.extract_detail_tree(tree, from_html)
+    found, _ = green_scraper.apply_structured_data(green_scraper.html_next_data(tree), from_structured, tree)
+    if not found:
+        return list(STRUCTURED_CHECK_COLUMNS)
+    return [name for name in STRUCTURED_CHECK_COLUMNS if from_html[name] != from_structured[name]]
+
+
+def run_http(server, structured=False, pipeline=False):
+    """HTTPエンジン（lxml）で各求人のscrape_job（pipelineならscrape_jobs_pipeline）を実行する（ブラウザなし）"""
+    scraper = GreenScraper(driver=StubDriver(), base_url=server.url)
+    scraper.fetch_backend = "http"
+    if structured:
+        scraper.extraction_mode = "structured"
+    scraper.http_engine = HttpFetchEngine(user_agent="green-scraper-benchmark")
+    timer = StageTimer(scraper)
+    started = time.perf_counter()
+    if pipeline:
+        scraper.open_checkpoint()
+        scraper.scrape_jobs_pipeline(server.job_urls, ["600万円〜900万円"] * len(server.job_urls))
+        rows = list(scraper.checkpoint.rows())
+        scraper.checkpoint.close()
+    else:
+        rows = [scraper.scrape_job(job_url, "600万円〜900万円") for job_url in server.job_urls]
+    elapsed = time.perf_counter() - started
+    scraper.http_engine.close()
+    result = {
+        "jobs": len(rows),
+        "seconds": round(elapsed, 3),
+        "jobs_per_sec": round(len(rows) / elapsed, 2) if elapsed else None,
+        "driver_commands_per_job": 0,
+        "page_loads": scraper.page_load_count,
+        "stages": timer.summary(),
+        "queues": scraper.metrics.summary()["queues"],
+    }
+    if structured:
+        result["structured_mismatches"] = structured_mismatches(server)
+    return result
+
+
+def run_requirements(rounds):
+    """応募資格コーパスに対してparse_requirementsを実行する"""
+    texts = load_requirements_corpus()
+    scraper = GreenScraper.__new__(GreenScraper)
+    durations = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            text_started = time.perf_counter()
+            scraper.parse_requirements(text)
+            durations.append(time.perf_counter() - text_started)
+    elapsed = time.perf_counter() - started
+    return {
+        "texts": len(durations),
+        "seconds": round(elapsed, 3),
+        "texts_per_sec": round(len(durations) / elapsed, 1) if elapsed else None,
+        "stages": {"parse_requirements": latency_stats(durations)},
+    }
+
+
+def print_result(name, result, baseline=None):
+    """結果を表示する（baselineがあれば差分も表示する）"""
+    print(f"[{name}]")
+    for key in ("jobs", "texts", "seconds", "jobs_per_sec", "texts_per_sec", "driver_commands_per_job", "page_loads",
+                "bytes_per_page"):
+        if key not in result:
+            continue
+        line = f"  {key}: {result[key]}"
+        base = (baseline or {}).get(key)
+        if isinstance(base, (int, float)) and isinstance(result[key], (int, float)) and base:
+            line += f"  (比較: {base} → {(result[key] - base) / base * 100:+.1f}%)"
+        print(line)
+    if "structured_mismatches" in result:
+        print(f"  structured_mismatches: {', '.join(result['structured_mismatches']) or 'なし'}")
+    for stage, stats in result.get("stages", {}).items():
+        line = f"  {stage:<24} n={stats['count']:<5} p50={stats['p50_ms']:>9.2f}ms p95={stats['p95_ms']:>9.2f}ms"
+        base = ((baseline or {}).get("stages") or {}).get(stage)
+        if base and base.get("p50_ms"):
+            line += f"  (比較 p50: {base['p50_ms']:.2f}ms)"
+        print(line)
+    for name, stats in (result.get("queues") or {}).items():
+        print(f"  キュー[{name:<6}] 平均の長さ={stats['avg_depth']:<5} 最大={stats['max_depth']:<3}"
+              f" 満杯で待った時間={stats['put_wait_seconds']:.3f}秒 空で待った時間={stats['get_wait_seconds']:.3f}秒")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="保存済みHTMLを使ったオフラインのベンチマーク")
+    parser.add_argument("--jobs", type=int, default=20, help="お気に入り一覧に並べる求人数")
+    parser.add_argument("--backends", default="selenium,http", help="計測するバックエンド（カンマ区切り）")
+    parser.add_argument("--requirements-rounds", type=int, default=200, help="応募資格コーパスを解析する回数")
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    parser.add_argument("--compare", help="比較対象の結果JSONファイル（別のコミットで --output したもの）")
+    args = parser.parse_args()
+
+    # スクレイパーのINFOログは計測結果の表示に不要なため抑制する
+    logging.disable(logging.INFO)
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    results = {}
+    runners = {
+        "selenium": run_selenium,
+        "selenium-lean": functools.partial(run_selenium, lean=True),
+        "http": run_http,
+        "http-structured": functools.partial(run_http, structured=True),
+        "selenium-pipeline": functools.partial(run_selenium, pipeline=True),
+        "http-pipeline": functools.partial(run_http, pipeline=True),
+    }
+    # 出力ディレクトリ・チェックポイントは一時ディレクトリに作成する
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir, FixtureServer(args.jobs) as server:
+        os.chdir(workdir)
+        try:
+            for backend in [name.strip() for name in args.backends.split(",") if name.strip()]:
+                if backend not in runners:
+                    print(f"不明なバックエンド: {backend}")
+                    continue
+                if backend.startswith("http") and not green_scraper.HAS_LXML:
+                    print("lxmlがインストールされていないため http をスキップします")
+                    continue
+                try:
+                    results[backend] = runners[backend](server)
+                except Exception as e:
+                    print(f"{backend} を計測できませんでした: {e}")
+            results["parse_requirements"] = run_requirements(args.requirements_rounds)
+        finally:
+            os.chdir(cwd)
+
+    for name, result in results.items():
+        print_result(name, result, baseline.get(name))
+    summary = {"peak_rss_mb": peak_rss_mb(), "jobs": args.jobs, "results": results}
+    print(f"最大RSS: {summary['peak_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"結果を {args.output} に保存しました")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+取得後の正規化（normalize_job_columns）の処理時間を計測するベンチマーク
+
+実際のページで見られる書き方の給与・休日・設立年数・働き方・利用言語を組み合わせて
+指定件数の求人データ（過去の実行結果を蓄積したデータを想定）を作成し、
+列全体に対する正規表現の抽出で数値列などを追加する時間を計測する。
+紛らわしい書き方の給与などの変換結果が期待値と一致するかも確認する。
+
+使い方:
+    python benchmarks/normalize_bench.py [--rows 10000] [--repeat 5] [--max-seconds 1.0]
+
+--max-seconds を超えた場合、または変換結果が期待値と異なる場合は終了コード1を返す（回帰の検出用）。
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from green_scraper import NORMALIZED_COLUMNS, GreenScraper, normalize_job_columns  # noqa: E402
+
+# 変換結果を確認する書き方（元の列, 値, 確認する列と期待値。Noneは欠損値）
+CHECKS = [
+    ("給与", "年収500万円〜700万円 ※月給41.6万円〜", {"給与下限(円)": 5000000, "給与上限(円)": 7000000}),
+    ("給与", "月給30万円〜50万円", {"給与下限(円)": 3600000, "給与上限(円)": 6000000}),
+    ("給与", "月給：25万円〜", {"給与下限(円)": 3000000, "給与上限(円)": None}),
+    ("給与", "時給1500円〜", {"給与下限(円)": None, "給与上限(円)": None}),
+    ("給与", "日給1万円", {"給与下限(円)": None, "給与上限(円)": None}),
+    ("給与", "450〜700万円", {"給与下限(円)": 4500000, "給与上限(円)": 7000000}),
+    # 和暦は経過年数ではなく設立年として換算する（基準年は2026年）
+    ("設立年数", "平成15年", {"設立年": 2003, "設立からの年数": 23}),
+    ("設立年数", "昭和55年4月", {"設立年": 1980, "設立からの年数": 46}),
+    ("設立年数", "令和2年", {"設立年": 2020, "設立からの年数": 6}),
+    ("設立年数", "令和元年", {"設立年": 2019, "設立からの年数": 7}),
+    ("設立年数", "設立15年", {"設立年": 2011, "設立からの年数": 15}),
+    ("設立年数", "2010年", {"設立年": 2010, "設立からの年数": 16}),
+]
+
+SALARIES = [
+    "600万円〜900万円", "450〜700万円", "月給30万円〜50万円", "〜800万円", "400万円以上",
+    "年収5,000,000円～8,000,000円", "経験・能力を考慮の上決定", "",
+]
+FOUNDED = ["2010年", "1998年4月", "設立15年", "2021年", "平成15年", "昭和55年4月", ""]
+HOLIDAYS = [
+    "年間休日125日（完全週休2日制）", "完全週休2日制（土日祝）120日以上", "土日祝、夏季休暇、年末年始休暇",
+    "年間休日数：130日", "",
+]
+WORK_STYLES = ["フルリモート可", "リモートワーク可（週2出社）", "リモート不可", "在宅勤務制度あり", "出社", ""]
+LANGUAGES = ["Python, Go, TypeScript", "Java, Kotlin", "Ruby", "", "PHP, JavaScript, Vue.js, AWS"]
+
+
+def make_rows(count):
+    """組み合わせを変えた求人データをcount件作成する"""
+    rows = []
+    for i in range(count):
+        job = GreenScraper.new_job_data(f"https://example.com/company/{i % 500}/job/{i}", SALARIES[i % len(SALARIES)])
+        job["設立年数"] = FOUNDED[i % len(FOUNDED)]
+        job["休日日数"] = HOLIDAYS[i % len(HOLIDAYS)]
+        job["働き方"] = WORK_STYLES[i % len(WORK_STYLES)]
+        job["利用言語"] = LANGUAGES[i % len(LANGUAGES)]
+        job["社員数"] = f"{(i % 900) + 10}人"
+        job["平均年齢"] = f"{25 + (i % 20)}.{i % 10}歳"
+        rows.append(job)
+    return pd.DataFrame(rows)
+
+
+def check_conversions():
+    """CHECKSの書き方を変換し、期待値と異なるものを表示する（異なるものがあればTrueを返す）"""
+    rows = []
+    for source, value, _ in CHECKS:
+        job = GreenScraper.new_job_data("https://example.com/company/1/job/1")
+        job[source] = value
+        rows.append(job)
+    result = normalize_job_columns(pd.DataFrame(rows), as_of=2026)
+    mismatches = 0
+    for i, (source, value, expected) in enumerate(CHECKS):
+        for name, want in expected.items():
+            got = result[name].iloc[i]
+            got = None if pd.isna(got) else got
+            if got != want:
+                mismatches += 1
+                print(f"  期待値と異なります: {source}={value!r} → {name}={got}（期待値 {want}）")
+    print(f"変換結果の確認: {len(CHECKS)}件中 {len(CHECKS) - mismatches}件が期待値と一致" if not mismatches
+          else f"変換結果の確認: 期待値と異なるもの {mismatches}件")
+    return bool(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="取得後の正規化の処理時間を計測する")
+    parser.add_argument("--rows", type=int, default=10000, help="求人データの件数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数（最小値と中央値を表示する）")
+    parser.add_argument("--max-seconds", type=float, default=0, help="1回あたりの処理時間の上限（0は無制限）")
+    args = parser.parse_args()
+
+    data = make_rows(args.rows)
+    print(f"求人データ {len(data)}件 × {len(data.columns)}列")
+
+    timings = []
+    for _ in range(args.repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = normalize_job_columns(data)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    best, median = timings[0], timings[len(timings) // 2]
+    print(f"  normalize_job_columns  最小 {best * 1000:.1f}ms  中央値 {median * 1000:.1f}ms  {len(data) / median:,.0f} 件/秒")
+
+    # 抽出できた件数（欠損値でない行数）
+    for name in NORMALIZED_COLUMNS:
+        column = result[name]
+        filled = int(column.map(len).gt(0).sum()) if column.dtype == object else int(column.notna().sum())
+        print(f"  {name:<12} {filled:>7}件")
+
+    failed = check_conversions()
+    if args.max_seconds and median > args.max_seconds:
+        print(f"処理時間が上限 {args.max_seconds}秒 を超えました")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
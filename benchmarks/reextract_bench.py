@@ -0,0 +1,80 @@
+"""
+ページのアーカイブからの抽出し直し（reextract_archive）の処理時間を計測するベンチマーク
+
+benchmarks/fixtures/ の求人詳細・会社情報ページをローカルのHTTPサーバーで配信し、
+HTTPエンジン（ARCHIVE_PAGESを有効にした状態）で取得してアーカイブを作成したあと、
+ワーカープロセス数を変えて reextract_archive を実行する。
+取得時の抽出結果と抽出し直した結果が一致するかも確認する。
+
+使い方:
+    python benchmarks/reextract_bench.py [--jobs 2000] [--workers 1,4]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from fixture_bench import FixtureServer, StubDriver  # noqa: E402
+from green_scraper import GreenScraper, HttpFetchEngine, PageArchive, reextract_archive  # noqa: E402
+
+# 比較する項目（取得時の給与はお気に入り一覧から渡すため除く）
+COMPARED_FIELDS = ("企業名", "勤務地", "時間", "働き方", "利用言語", "応募資格", "必須資格", "歓迎資格", "設立年数", "社員数", "平均年齢")
+
+
+def build_archive(server, archive_dir):
+    """HTTPエンジンで全求人を取得し、ページをarchive_dirに保存する（取得時の抽出結果を返す）"""
+    scraper = GreenScraper(driver=StubDriver(), base_url=server.url)
+    scraper.fetch_backend = "http"
+    scraper.company_cache = None
+    scraper.http_engine = HttpFetchEngine(user_agent="green-scraper-benchmark")
+    scraper.page_archive = PageArchive(archive_dir)
+    started = time.perf_counter()
+    rows = {job_url: scraper.scrape_job(job_url) for job_url in server.job_urls}
+    elapsed = time.perf_counter() - started
+    scraper.http_engine.close()
+    scraper.page_archive.close()
+    print(f"取得とアーカイブ: 求人{len(rows)}件 {elapsed:.2f}秒"
+          f"（保存 {scraper.page_archive.stored}件 / 保存済みの内容 {scraper.page_archive.deduplicated}件）")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ページのアーカイブからの抽出し直しの処理時間を計測する")
+    parser.add_argument("--jobs", type=int, default=2000, help="求人数")
+    parser.add_argument("--workers", default="1,4", help="計測するワーカープロセス数（カンマ区切り）")
+    args = parser.parse_args()
+
+    # スクレイパーのINFOログは計測結果の表示に不要なため抑制する
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as work_dir:
+        archive_dir = os.path.join(work_dir, "archive")
+        with FixtureServer(args.jobs) as server:
+            live_rows = build_archive(server, archive_dir)
+        size = sum(
+            os.path.getsize(os.path.join(path, name)) for path, _, names in os.walk(archive_dir) for name in names
+        )
+        print(f"アーカイブの大きさ: {size / 1024:.0f}KB")
+
+        failed = False
+        for workers in (int(value) for value in args.workers.split(",")):
+            started = time.perf_counter()
+            result = reextract_archive(archive_dir, workers=workers, output=os.path.join(work_dir, "result.csv"))
+            elapsed = time.perf_counter() - started
+            print(f"  ワーカー{workers:>2}  {elapsed:.2f}秒  {len(result) / elapsed:,.0f} 件/秒")
+            mismatched = sum(
+                1 for row in result.to_dict("records")
+                if any(row[name] != live_rows[row["掲載ページ"]][name] for name in COMPARED_FIELDS)
+            )
+            if mismatched or len(result) != len(live_rows):
+                print(f"  取得時と結果が異なります: {mismatched}件 / {len(result)}件")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
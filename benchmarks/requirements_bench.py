@@ -0,0 +1,116 @@
+"""
+応募資格テキストの解析（parse_requirements）のスループットを計測するベンチマーク
+
+benchmarks/fixtures/requirements.txt のコーパスを指定件数まで複製し（各テキストの末尾に固有の行を付けて重複をなくす）、
+変更前の実装（呼び出しごとに2回の正規表現検索）と現在の実装（1回の走査でセクションに分割）、
+列をまとめて解析する parse_requirements_batch を比較する。
+日次の実行結果を蓄積した列のように同じテキストが繰り返し現れる場合の parse_requirements_batch も計測する。
+見出しと同じ行に本文が続く書き方（■必須スキル：Java、【必須】Python経験3年【歓迎】AWS経験 など）の抽出結果も確認する。
+
+使い方:
+    python benchmarks/requirements_bench.py [--texts 20000] [--show-diff]
+
+見出しと同じ行に本文が続く書き方の抽出結果が期待値と異なる場合は終了コード1を返す（回帰の検出用）。
+"""
+import argparse
+import gc
+import os
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from green_scraper import parse_requirements_batch, parse_requirements_text  # noqa: E402
+
+# 見出しと同じ行に本文が続く書き方と期待する (必須資格, 歓迎資格)
+INLINE_CASES = (
+    ("■必須スキル：Java\n■歓迎スキル：Kotlin", ("Java", "Kotlin")),
+    ("◆必須：Java経験\n◆歓迎：Kotlin", ("Java経験", "Kotlin")),
+    ("必須条件：Java経験3年以上", ("Java経験3年以上", "")),
+    ("歓迎スキル: Go\n必須：\nPython", ("Python", "Go")),
+    ("【必須】Java経験\n【歓迎】AWS", ("Java経験", "AWS")),
+    # 記号の後にコロンが続いても、必須・歓迎などで始まらない行は箇条書きの本文
+    ("◆必須要件\n・Java\n・Go：3年以上", ("・Java\n・Go：3年以上", "")),
+    # 行の途中の見出し（変更前の実装でも抽出できていた書き方）
+    ("【必須】Python経験3年【歓迎】AWS経験", ("Python経験3年", "AWS経験")),
+    ("＜必須＞PHP経験＜尚可＞Vue.js", ("PHP経験", "Vue.js")),
+    ("◆必須：Java経験 ◆歓迎：AWS", ("Java経験", "AWS")),
+    ("■必須要件■Go経験■歓迎要件■Rust経験", ("Go経験", "Rust経験")),
+    # 行の途中の括弧は必須・歓迎などの語で始まるもののみ見出しとみなす
+    ("【必須】Java（【Spring】の経験）", ("Java（【Spring】の経験）", "")),
+)
+
+
+def load_corpus():
+    """応募資格テキストのコーパス（"----" 区切り）を読み込む"""
+    with open(os.path.join(BENCH_DIR, "fixtures", "requirements.txt"), encoding="utf-8") as f:
+        return [text.strip() for text in f.read().split("\n----\n") if text.strip()]
+
+
+def legacy_parse_requirements(raw_text):
+    """変更前の parse_requirements（比較用）"""
+    must_pattern = re.search(
+        r"(?:◆必.*?|【必.*?】|■必.*?|【MUST】)([\s\S]*?)(?=◆|【|■|$)",
+        raw_text
+    )
+    want_pattern = re.search(
+        r"(?:◆歓.*?|【歓.*?】|■歓.*?|【優遇.*?】|【WANT.*?】)([\s\S]*?)(?=◆|【|■|$)",
+        raw_text
+    )
+    must = must_pattern.group(1).strip() if must_pattern else ""
+    want = want_pattern.group(1).strip() if want_pattern else ""
+    return must, want
+
+
+def measure(name, func, texts):
+    """funcでtextsを解析する時間を計測して表示する"""
+    # 前の計測で作られたオブジェクトのGCが計測に入らないようにする
+    gc.collect()
+    started = time.perf_counter()
+    results = func(texts)
+    elapsed = time.perf_counter() - started
+    print(f"  {name:<28} {elapsed * 1000:>9.1f}ms  {len(texts) / elapsed:>12,.0f} 件/秒")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="応募資格テキストの解析のスループットを計測する")
+    parser.add_argument("--texts", type=int, default=20000, help="解析するテキストの件数（コーパスを複製する）")
+    parser.add_argument("--show-diff", action="store_true", help="変更前と結果が異なるテキストと両方の結果を表示する")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    texts = [f"{corpus[i % len(corpus)]}\n・案件固有の条件{i}" for i in range(args.texts)]
+    history = (corpus * (args.texts // len(corpus) + 1))[:args.texts]
+    print(f"応募資格テキスト {len(texts)}件（コーパス {len(corpus)}件を複製）")
+
+    measure("変更前（2回の正規表現検索）", lambda items: [legacy_parse_requirements(t) for t in items], texts)
+    measure("parse_requirements_text", lambda items: [parse_requirements_text(t) for t in items], texts)
+    measure("parse_requirements_batch", parse_requirements_batch, texts)
+    measure("parse_requirements_batch（重複あり）", parse_requirements_batch, history)
+
+    # 抽出結果の違い（見出しの取りこぼし・見出し文字の混入の修正分）
+    legacy = [legacy_parse_requirements(text) for text in corpus]
+    current = [parse_requirements_text(text) for text in corpus]
+    changed = [(text, before, after) for text, before, after in zip(corpus, legacy, current) if before != after]
+    extracted = sum(1 for must, want in current if must or want)
+    print(f"コーパス {len(corpus)}件中 {extracted}件で必須・歓迎資格を抽出（変更前と結果が異なるもの {len(changed)}件）")
+    if args.show_diff:
+        # 変更前は見出しの文字（"須要件" など）が本文に混入し、＜必須＞や英語の見出しを取りこぼす
+        for text, before, after in changed:
+            print(f"----\n{text}\n  変更前: {before}\n  現在  : {after}")
+
+    failed = 0
+    for text, expected in INLINE_CASES:
+        result = parse_requirements_text(text)
+        if result != expected:
+            failed += 1
+            print(f"期待値と異なります: {text!r}\n  期待値: {expected}\n  結果  : {result}")
+    print(f"見出しと同じ行に本文が続く書き方 {len(INLINE_CASES)}件中 {len(INLINE_CASES) - failed}件が期待値と一致")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
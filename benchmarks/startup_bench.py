@@ -0,0 +1,115 @@
+"""
+green_scraper の起動時間（モジュールのインポート時間とChromeDriverのパスの解決時間）を計測するベンチマーク
+
+別プロセスで `python -X importtime -c "import green_scraper"` を繰り返し実行し、
+インポート全体の時間の中央値と、累積時間の大きいモジュールを表示する。
+起動時に読み込まないモジュール（pandas、webdriver_manager、openpyxl）が読み込まれていないかも確認する。
+ChromeDriverのパスの解決時間は、キャッシュがある場合（webdriver-managerを呼び出さない）を計測する。
+
+使い方:
+    python benchmarks/startup_bench.py [--runs 5] [--top 15] [--max-ms 400]
+
+--max-ms を超えた場合、または起動時に読み込まないモジュールが読み込まれた場合は終了コード1を返す（回帰の検出用）。
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# 起動時には読み込まず、使用する時点で読み込むモジュール
+DEFERRED_MODULES = ("pandas", "webdriver_manager", "openpyxl")
+
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)$")
+
+
+def measure_import():
+    """
+    別プロセスでgreen_scraperをインポートし、-X importtimeの出力を解析する
+
+    Returns:
+        dict: total_us（インポート全体の累積時間）/ modules（モジュール名をキー、累積時間を値とする辞書）
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import green_scraper"],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return {"total_us": modules.get("green_scraper", 0), "modules": modules}
+
+
+def measure_driver_cache():
+    """
+    DriverCacheにパスが保存されている場合のresolveの時間（秒）を計測する
+
+    Returns:
+        float: resolveの所要時間（秒）
+    """
+    from green_scraper import DriverCache
+
+    # スクレイパーのINFOログは計測結果の表示に不要なため抑制する
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as work_dir:
+        driver_path = os.path.join(work_dir, "chromedriver")
+        open(driver_path, "w").close()
+        cache_path = os.path.join(work_dir, "driver_cache.json")
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"driver_path": driver_path, "resolved_at": time.time()}, f)
+        started = time.perf_counter()
+        resolved, from_cache = DriverCache(cache_path).resolve()
+        elapsed = time.perf_counter() - started
+    assert resolved == driver_path and from_cache
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="green_scraperの起動時間を計測する")
+    parser.add_argument("--runs", type=int, default=5, help="インポートを計測する回数（中央値を表示する）")
+    parser.add_argument("--top", type=int, default=15, help="表示する累積時間の大きいモジュールの数")
+    parser.add_argument("--max-ms", type=float, default=0, help="インポート時間の中央値の上限（ミリ秒、0は無制限）")
+    args = parser.parse_args()
+
+    results = [measure_import() for _ in range(args.runs)]
+    totals = sorted(result["total_us"] / 1000 for result in results)
+    median = totals[len(totals) // 2]
+    print(f"import green_scraper: 中央値 {median:.1f}ms（最小 {totals[0]:.1f}ms / 最大 {totals[-1]:.1f}ms、{args.runs}回）")
+
+    # 最後の計測の累積時間の大きいモジュール（green_scraper自身を除く）
+    modules = results[-1]["modules"]
+    ranked = sorted(
+        ((name, us) for name, us in modules.items() if name != "green_scraper"),
+        key=lambda item: item[1], reverse=True
+    )
+    print(f"累積時間の大きいモジュール（上位{args.top}件）:")
+    for name, us in ranked[:args.top]:
+        print(f"  {us / 1000:>8.1f}ms  {name}")
+
+    loaded = [name for name in DEFERRED_MODULES if name in modules]
+    for name in DEFERRED_MODULES:
+        print(f"  {name:<18} {'起動時に読み込まれています' if name in loaded else '起動時には読み込まれません'}")
+
+    print(f"ChromeDriverのパスの解決（キャッシュあり）: {measure_driver_cache() * 1000:.2f}ms")
+
+    failed = False
+    if loaded:
+        print(f"起動時に読み込まないモジュールが読み込まれています: {', '.join(loaded)}")
+        failed = True
+    if args.max_ms and median > args.max_ms:
+        print(f"インポート時間が上限 {args.max_ms}ms を超えました")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,7 @@ Green Japan お気に入りページスクレイピングツール
 import os
 import time
 import datetime
-import pandas as pd
+import importlib
 import subprocess  # 追加
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -21,12 +21,26 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 import logging
 import getpass
 from selenium.webdriver.common.keys import Keys
 import requests
 import re  # 正規表現を使用するために追加
+import queue
+import threading
+import asyncio
+import hashlib
+import json
+import sqlite3
+import argparse
+import csv
+import functools
+import itertools
+import gzip
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
 
 try:
     import config  # 設定ファイルをインポート
@@ -34,6 +48,29 @@ try:
 except ImportError:
     HAS_CONFIG = False
 
+
+class LazyModule:
+    """最初に属性を参照したときにモジュールをインポートする代理オブジェクト（起動時間の短縮用）"""
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# pandasはデータの集計・出力時まで読み込まない（ログインに失敗した実行などでは読み込まない）
+pd = LazyModule("pandas")
+
+try:
+    import lxml.html  # HTTPエンジンでのHTML解析に使用
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
 # ロギングの設定
 logging.basicConfig(
     level=logging.INFO,
@@ -45,670 +82,4040 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class GreenScraper:
-    """Green Japanのスクレイピングを行うクラス"""
+# ページ上の全ラベル(p[class*='css-'])と、その親要素内の2番目のp要素の値を
+# 文書順に [ラベル, 値] の配列として1回のスクリプト実行で返す
+FIELD_SNAPSHOT_SCRIPT = """
+return Array.from(document.querySelectorAll("p[class*='css-']")).map(function (label) {
+    var values = label.parentElement ? label.parentElement.querySelectorAll("p") : [];
+    return [label.innerText, values.length > 1 ? values[1].innerText.trim() : null];
+});
+"""
+
+# 求人詳細ページのカード項目（勤務地・時間・働き方など）
+DETAIL_ITEMS_SELECTOR = "#__next > div.MuiBox-root[class*='css-'] > div > div.MuiContainer-root[class*='css-'] > div > div > div > div[class*='css-'] > div"
+
+# カード項目のテキストと利用言語タグ(.card-tag__item)のテキストを1回のスクリプト実行で返す
+JOB_CARD_SCRIPT = """
+function texts(selector) {
+    return Array.from(document.querySelectorAll(selector)).map(function (el) { return el.innerText; });
+}
+return {items: texts(arguments[0]), tags: texts(".card-tag__item")};
+"""
+
+# XPath(arguments[0])に一致する全要素のinnerTextを1回のスクリプト実行で返す
+XPATH_TEXTS_SCRIPT = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var texts = [];
+for (var i = 0; i < result.snapshotLength; i++) {
+    texts.push(result.snapshotItem(i).innerText);
+}
+return texts;
+"""
+
+# お気に入り一覧の求人リンク
+FAVORITE_LINK_SELECTOR = "#__next > div.MuiBox-root[class*='css-'] > div > div[class*='css-'] > div.MuiBox-root[class*='css-'] > div > a"
+
+# お気に入り一覧の各求人カード（リンク要素）からURL・給与・タイトル・タグを取得するスクリプト
+# 給与はカード内の a > div[2] > div[2] > div[1] > span
+FAVORITE_CARDS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(function (link) {
+    var salary = link.querySelector(":scope > div:nth-of-type(2) > div:nth-of-type(2) > div:nth-of-type(1) > span");
+    var title = link.querySelector("h1, h2, h3, h4, h5, h6");
+    var tags = link.querySelectorAll(".card-tag__item, [class*='MuiChip-label']");
+    return {
+        url: link.href,
+        salary: salary ? salary.innerText : "",
+        title: title ? title.innerText : "",
+        tags: Array.from(tags).map(function (tag) { return tag.innerText; })
+    };
+});
+"""
+
+# ページのfetch/XHRをラップし、お気に入り一覧APIのJSONレスポンスを記録するスクリプト
+# （Page.addScriptToEvaluateOnNewDocumentでページ自身のスクリプトより先に実行する）
+API_CAPTURE_SCRIPT = """
+(function () {
+    window.__greenApiResponses = [];
+    function record(url, text) {
+        if (!/favorite/i.test(url)) return;
+        try { window.__greenApiResponses.push({url: url, body: JSON.parse(text)}); } catch (e) {}
+    }
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function (input) {
+            var url = String((input && input.url) || input);
+            return originalFetch.apply(this, arguments).then(function (response) {
+                response.clone().text().then(function (text) { record(url, text); }).catch(function () {});
+                return response;
+            });
+        };
+    }
+    var originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.addEventListener("load", function () { record(String(url), this.responseText); });
+        return originalOpen.apply(this, arguments);
+    };
+})();
+"""
+
+# 最下部までスクロールし、要素数（セレクタ省略時はページの高さ）が増えるか、
+# MutationObserverで見たDOMの変化が一定時間止まるまでブラウザ内で待機して、その時点の値を返すスクリプト
+SCROLL_WAIT_SCRIPT = """
+var selector = arguments[0], idleMs = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+function measure() {
+    return selector ? document.querySelectorAll(selector).length : document.body.scrollHeight;
+}
+var before = measure(), started = Date.now(), lastChange = Date.now();
+var observer = new MutationObserver(function () { lastChange = Date.now(); });
+observer.observe(document.body, {childList: true, subtree: true});
+window.scrollTo(0, document.body.scrollHeight);
+(function check() {
+    var value = measure(), now = Date.now();
+    if (value > before || now - lastChange >= idleMs || now - started >= timeoutMs) {
+        observer.disconnect();
+        done(value);
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+"""
+
+
+# 一覧APIのレスポンスで総件数を表すキーの位置（最上位またはページ情報の直下のみ）
+# ※求人や会社の入れ子の中にある件数（応募者数など）を総件数と取り違えないよう、任意の深さは探さない
+FAVORITE_TOTAL_KEY_PATHS = tuple(
+    prefix + (key,)
+    for prefix in ((), ("meta",), ("pagination",), ("pageInfo",), ("page_info",), ("data",))
+    for key in ("total", "totalCount", "total_count")
+)
+
+
+def find_total_count(payload):
+    """
+    一覧APIのJSONレスポンスから総件数を取得する（FAVORITE_TOTAL_KEY_PATHSの位置のみ）
     
-    def __init__(self):
-        """初期化メソッド - WebDriverの設定とURLの定義"""
-        self.base_url = "https://www.green-japan.com"
-        self.login_url = f"{self.base_url}/login"
-        self.favorites_url = f"{self.base_url}/favorites/sent"
+    Args:
+        payload: JSONを読み込んだ値
         
-        # driver属性を明示的に初期化
-        self.driver = None
+    Returns:
+        int: 総件数（見つからない場合はNone）
+    """
+    for path in FAVORITE_TOTAL_KEY_PATHS:
+        value = payload
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+# 応募資格テキストの見出し（種類ごとのパターン。同じ位置では行頭の見出しを優先する）
+#   【必須（MUST）】 【歓迎】 【優遇スキル】 【WANT】 【求める人物像】 ＜必須＞ ＜尚可＞ ※閉じ括弧の後に本文が続いてもよい
+#   ◆必須要件 ■必須スキル ■必須要件■ ◆歓迎要件
+#   記号のない行: 必須 / 歓迎 / 尚可 / 求める人物像 / Requirements / Preferred など
+#   ◆■・記号のない見出しは行末で終わるか、コロンの後に本文が続く（■必須スキル：Java、必須条件：Java経験3年以上）
+#   ◆■の後にコロンと本文が続く見出しは必須・歓迎などの語で始まるもののみ（"■Java：3年以上" は箇条書きの本文とみなす）
+#   行の途中の【】＜＞◆■は必須・歓迎などの語で始まるもののみ見出しとみなす（"【必須】Python経験3年【歓迎】AWS経験"）
+REQUIREMENT_KEYWORDS = r"(?:必須|歓迎|尚可|優遇|求める人物像)"
+# 行頭から始まる見出し（種類ごとのパターン）
+REQUIREMENT_LINE_HEADER_SOURCES = (
+    # 括弧
+    r"[【［\[]([^】］\]\n]{1,30})[】］\]]",
+    r"[＜<〈]([^＞>〉\n]{1,30})[＞>〉]",
+    # ◆■
+    r"[◆■]("
+    + REQUIREMENT_KEYWORDS + r"[^◆■\n:：]{0,20}?(?=[◆■]?[ \t　]*[:：])"
+    r"|[^◆■\n]{1,30}?(?=[◆■]?[ \t　]*[:：]?[ \t　]*$)"
+    r")[◆■]?[ \t　]*[:：]?",
+    # 記号なし
+    r"((?i:必須(?:要件|スキル|条件|経験)?|歓迎(?:要件|スキル|条件|経験)?|尚可|求める人物像"
+    r"|Requirements?|Required(?: Skills| Qualifications)?|Must[- ]haves?"
+    r"|Preferred(?: Skills| Qualifications)?|Nice[- ]to[- ]haves?))"
+    r"[ \t　]*(?:[:：]|$)",
+)
+# 行の途中の見出し（行頭の見出しに一致しない場合は行頭でも照合する）
+# ※記号1文字の後に照合する（記号は後読みで判定する）
+REQUIREMENT_INLINE_HEADER_SOURCES = (
+    # 括弧
+    r"(?<=[【＜])((?:" + REQUIREMENT_KEYWORDS + r"|(?i:MUST|WANT|Require|Prefer))[^】＞\n]{0,20})[】＞]",
+    # ◆■（見出しの語の後に◆■・コロン・空白が続くもの）
+    r"(?<=[◆■])(" + REQUIREMENT_KEYWORDS + r"(?:要件|スキル|条件|経験)?)(?:[◆■]|[ \t　]*[:：]|[ \t　]+)",
+)
+# 1回の走査で探すため、種類ごとのパターンを1つにまとめる（各パターンのキャプチャは見出しの1つのみ）
+# 行頭の見出しは先頭文字の先読みで早く除外する（記号のない見出しを追加する場合は先頭文字も追加する）
+REQUIREMENT_HEADER_PATTERN = re.compile(
+    r"^(?=[ \t　]*[【［\[＜<〈◆■必歓尚求RrMmPpNn])[ \t　]*(?:"
+    + "|".join(REQUIREMENT_LINE_HEADER_SOURCES)
+    + r")|[【＜◆■](?:"
+    + "|".join(REQUIREMENT_INLINE_HEADER_SOURCES)
+    + r")",
+    re.M
+)
+
+
+# 見出しの種類（先に一致したものを採用する）
+REQUIREMENT_KINDS = (
+    ("must", re.compile(r"^必|必須|MUST|Require", re.I)),
+    ("want", re.compile(r"^歓|歓迎|優遇|尚可|WANT|Prefer|Nice", re.I)),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def requirement_header_kind(title):
+    """
+    見出しの種類を判定する（見出しの種類は限られるため結果をキャッシュする）
+    
+    Args:
+        title (str): 見出しの文字列（記号・括弧を除いたもの）
         
-        # Chromeオプションの設定
-        self.chrome_options = Options()
+    Returns:
+        str: "must"・"want"・"other" のいずれか
+    """
+    title = title.strip()
+    for kind, pattern in REQUIREMENT_KINDS:
+        if pattern.search(title):
+            return kind
+    return "other"
+
+
+def find_requirement_headers(raw_text):
+    """
+    応募資格テキストの見出しを文書順に返す
+    
+    Args:
+        raw_text (str): 応募資格の生テキスト
         
-        # config.pyからヘッドレスモード設定を読み込む
-        if HAS_CONFIG and hasattr(config, 'HEADLESS_MODE') and config.HEADLESS_MODE:
-            self.chrome_options.add_argument("--headless")
-            logger.info("ヘッドレスモードが有効化されました")
+    Returns:
+        list: (開始位置, 終了位置, 見出し) のリスト（見出しは記号・括弧を除いたもの）
+    """
+    # 一致したパターンのキャプチャ（見出し）がlastindexになる
+    return [(match.start(), match.end(), match.group(match.lastindex))
+            for match in REQUIREMENT_HEADER_PATTERN.finditer(raw_text)]
+
+
+def split_requirement_sections(raw_text):
+    """
+    応募資格テキストを見出しごとのセクションに分割する
+    
+    Args:
+        raw_text (str): 応募資格の生テキスト
         
-        # Chromeプロファイルの設定
-        self.using_profile = False
-        if HAS_CONFIG and hasattr(config, 'USE_CHROME_PROFILE') and config.USE_CHROME_PROFILE:
-            if hasattr(config, 'CHROME_PROFILE_PATH') and config.CHROME_PROFILE_PATH:
-                profile_path = config.CHROME_PROFILE_PATH
-                profile_name = "Default"
-                if hasattr(config, 'CHROME_PROFILE_NAME') and config.CHROME_PROFILE_NAME:
-                    profile_name = config.CHROME_PROFILE_NAME
-                
-                # プロファイルパスの設定
-                user_data_dir = profile_path
-                self.chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
-                self.chrome_options.add_argument(f"--profile-directory={profile_name}")
-                logger.info(f"Chromeプロファイルを使用: {user_data_dir}\\{profile_name}")
-                self.using_profile = True
+    Returns:
+        list: (種類, 見出し, 本文) のリスト。種類は "must"・"want"・"other"（求める人物像など）、
+              最初の見出しより前の本文は種類 None として含める
+    """
+    headers = find_requirement_headers(raw_text)
+    first = headers[0][0] if headers else len(raw_text)
+    sections = [(None, "", raw_text[:first].strip())] if raw_text[:first].strip() else []
+    for i, (_, end, title) in enumerate(headers):
+        next_start = headers[i + 1][0] if i + 1 < len(headers) else len(raw_text)
+        sections.append((requirement_header_kind(title), title.strip(), raw_text[end:next_start].strip()))
+    return sections
+
+
+def parse_requirements_text(raw_text):
+    """
+    応募資格テキストから必須資格と歓迎資格を抽出する
+    
+    Args:
+        raw_text (str): 応募資格の生テキスト
         
-        # 共通のChrome設定
-        self.chrome_options.add_argument("--window-size=1920,1080")
-        self.chrome_options.add_argument("--disable-gpu")
-        self.chrome_options.add_argument("--no-sandbox")
-        self.chrome_options.add_argument("--disable-dev-shm-usage")
-        # この設定でGoogleログインのセッション維持を改善
-        self.chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        self.chrome_options.add_experimental_option("useAutomationExtension", False)
+    Returns:
+        tuple: (必須資格, 歓迎資格)。同じ種類の見出しが複数ある場合は改行で連結する
+    """
+    if not isinstance(raw_text, str) or not raw_text:
+        return "", ""
+    must, want = [], []
+    for kind, _, body in split_requirement_sections(raw_text):
+        if kind in ("must", "want") and body:
+            (must if kind == "must" else want).append(body)
+    return "\n".join(must), "\n".join(want)
+
+
+def parse_requirements_batch(texts):
+    """
+    複数の応募資格テキスト（DataFrameの列など）をまとめて解析する
+    
+    日次の実行結果を蓄積した列では同じテキストが繰り返し現れるため、同一のテキストは1回だけ解析する。
+    
+    Args:
+        texts (iterable): 応募資格テキストの列（文字列以外の値は空として扱う）
         
-        # WebDriverの初期化
-        try:
-            # ChromeDriverManager.install() がフォルダを返す場合に対応
-            driver_path = ChromeDriverManager().install()
-            logger.info(f"ChromeDriverManagerが検出したパス: {driver_path}")
-            
-            # パスがTHIRD_PARTY_NOTICESを含む場合、親ディレクトリを検索
-            if "THIRD_PARTY_NOTICES" in driver_path:
-                driver_dir = os.path.dirname(driver_path)
-                logger.info(f"検索するディレクトリ: {driver_dir}")
-                
-                # ディレクトリ内でchromedriver.exeを検索
-                for root, dirs, files in os.walk(driver_dir):
-                    for file in files:
-                        if file.endswith("chromedriver.exe"):
-                            driver_path = os.path.join(root, file)
-                            logger.info(f"見つかったchromedriver.exe: {driver_path}")
-                            break
-                    if "chromedriver.exe" in files:
-                        break
-            
-            # パスが/を含む場合、Windowsの\に変換
-            driver_path = driver_path.replace("/", "\\")
-            
-            logger.info(f"使用するドライバーパス: {driver_path}")
-            
-            try:
-                self.driver = webdriver.Chrome(
-                    service=Service(driver_path),
-                    options=self.chrome_options
-                )
-                # Selenium検出を回避するためのJavaScriptを実行
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            except WebDriverException as e:
-                error_msg = str(e)
-                # プロファイルが使用中の場合は、リモートデバッグ接続を試みる
-                if "user data directory is already in use" in error_msg and HAS_CONFIG and getattr(config, 'USE_CHROME_PROFILE', False):
-                    logger.info("プロファイルロック検出: リモートデバッグ接続を試みます")
-                    
-                    # リモートデバッグポート
-                    debug_port = getattr(config, 'REMOTE_DEBUGGING_PORT', 9222)
-                    
-                    # Chrome実行ファイルパスの取得（エラーメッセージ用）
-                    chrome_path = getattr(config, 'CHROME_EXECUTABLE_PATH', None)
-                    if not chrome_path or not os.path.exists(chrome_path):
-                        # 代替パスを試す
-                        for p in [r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                                  r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"]:
-                            if os.path.exists(p):
-                                chrome_path = p
-                                break
-                    
-                    if not chrome_path:
-                        chrome_path = "chrome.exe"  # パスが見つからない場合は単にchrome.exeとする
-                    
-                    # プロファイル情報の取得（エラーメッセージ用）
-                    profile_path = getattr(config, 'CHROME_PROFILE_PATH', '')
-                    profile_name = getattr(config, 'CHROME_PROFILE_NAME', 'Default')
-                    
-                    # 日本語パスを含むプロファイルの場合のフォールバック
-                    if "ゆうと" in profile_path or any(ord(c) > 127 for c in profile_path):
-                        temp_profile_dir = r"C:\Temp_Chrome_Debug"
-                    else:
-                        # 元のプロファイルパスを使用
-                        temp_profile_dir = profile_path
-                    
-                    # まず既存のChromeへの接続を試みる
-                    try:
-                        # 既存の接続を確認
-                        try:
-                            logger.info(f"既存のChromeプロセスを確認中: http://127.0.0.1:{debug_port}/json")
-                            response = requests.get(f"http://127.0.0.1:{debug_port}/json", timeout=3)
-                            if response.status_code == 200:
-                                logger.info("既存のChromeプロセスに接続できます。新規ウィンドウは開きません。")
-                                
-                                # リモートデバッグ接続用のオプション
-                                fallback_options = Options()
-                                fallback_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
-                                
-                                # リモートデバッグ接続
-                                logger.info(f"既存Chromeへリモートデバッグ接続: 127.0.0.1:{debug_port}")
-                                self.driver = webdriver.Chrome(
-                                    service=Service(driver_path),
-                                    options=fallback_options
-                                )
-                                logger.info("既存Chromeへの接続に成功しました")
-                            else:
-                                logger.error(f"既存Chromeへの接続失敗: ステータスコード {response.status_code}")
-                                raise ConnectionError(f"既存Chromeへの接続に失敗しました。接続先: http://127.0.0.1:{debug_port}/json")
-                        except requests.exceptions.ConnectionError:
-                            # 自動でリモートデバッグ用Chromeを起動（共通オプションを追加）
-                            logger.info("既存のChromeリモートデバッグが有効ではありません。デバッグ用Chromeを自動起動します。")
-                            chrome_command = [
-                                chrome_path,
-                                f"--remote-debugging-port={debug_port}",
-                                f"--user-data-dir={temp_profile_dir}",
-                                f"--profile-directory={profile_name}",
-                                "--window-size=1920,1080",
-                                "--disable-gpu",
-                                "--no-sandbox",
-                                "--disable-dev-shm-usage",
-                                "--disable-blink-features=AutomationControlled",
-                                "--exclude-switches=enable-automation",
-                                "--disable-extensions",
-                                "--no-first-run",
-                                "--no-default-browser-check"
-                            ]
-                            logger.info(f"起動コマンド: {' '.join(chrome_command)}")
-                            subprocess.Popen(chrome_command)
-                            # プロセス起動を待機
-                            time.sleep(5)
-                            # 自動起動したChromeへの接続
-                            fallback_options = Options()
-                            fallback_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
-                            fallback_options.add_argument("--disable-dev-shm-usage")
-                            fallback_options.add_argument("--no-sandbox")
-                            self.driver = webdriver.Chrome(
-                                service=Service(driver_path),
-                                options=fallback_options
-                            )
-                            logger.info("自動起動したChromeへの接続に成功しました")
-                        except Exception as check_error:
-                            logger.error(f"既存Chrome確認中にエラー: {str(check_error)}")
-                            raise
-                        
-                    except Exception as connect_error:
-                        # エラーがConnectionErrorの場合はそのまま伝播させる（すでにメッセージを表示済み）
-                        if isinstance(connect_error, ConnectionError):
-                            raise
-                        
-                        # その他のエラーの場合は追加情報を表示
-                        logger.error(f"Chrome接続エラー: {str(connect_error)}")
-                        logger.error("自動的にChromeを起動せず、エラーで終了します。")
-                        raise
-                else:
-                    logger.error(f"ChromeDriverの初期化中にエラーが発生しました: {error_msg}")
-                    raise
-            
-        except Exception as e:
-            logger.error(f"ChromeDriverの初期化中にエラーが発生しました: {str(e)}")
-            raise
+    Returns:
+        list: 各テキストの (必須資格, 歓迎資格) のリスト（入力と同じ順序）
+    """
+    parsed = {}
+    results = []
+    for text in texts:
+        if not isinstance(text, str):
+            results.append(("", ""))
+            continue
+        result = parsed.get(text)
+        if result is None:
+            result = parsed[text] = parse_requirements_text(text)
+        results.append(result)
+    return results
 
-        # ドライバーの初期化確認
-        if self.driver is None:
-            logger.error("WebDriverの初期化に失敗しました")
-            raise Exception("WebDriverの初期化に失敗しました")
-            
-        # タイムアウト時間を延長（30秒）
-        self.wait = WebDriverWait(self.driver, 30)
+
+# 金額の直前の給与の種類（年収・月給など）。金額と離れた位置の「月給」（"年収500万円 ※月給41.6万円〜"）は参照しない
+SALARY_PERIOD_PATTERN = r"(?:(?P<period>年収|年俸|月給|月収|月額|時給|日給)\s*[:：]?\s*)?"
+# 給与の範囲（600万円〜900万円、600〜900万円 など。下限の単位が省略された場合は上限の単位を使う）
+SALARY_RANGE_PATTERN = (
+    SALARY_PERIOD_PATTERN +
+    r"(?P<low>\d[\d,]*(?:\.\d+)?)\s*(?P<low_unit>万)?円?\s*[〜～~\-－]\s*"
+    r"(?P<high>\d[\d,]*(?:\.\d+)?)\s*(?P<high_unit>万)?円"
+)
+# 給与の単一の金額（〜800万円 は上限のみ、400万円以上・400万円〜 は下限のみ）
+SALARY_SINGLE_PATTERN = (
+    SALARY_PERIOD_PATTERN +
+    r"(?P<prefix>[〜～~]\s*)?(?P<amount>\d[\d,]*(?:\.\d+)?)\s*(?P<unit>万)?円\s*(?P<suffix>以上|[〜～~])?"
+)
+# 月額の給与（年額に換算する）
+MONTHLY_SALARY_PERIODS = ("月給", "月収", "月額")
+# 時給・日給は勤務時間・日数がわからず年額に換算できないため、金額を求めない
+UNCONVERTIBLE_SALARY_PERIODS = ("時給", "日給")
+HEADCOUNT_PATTERN = r"(\d[\d,]*)\s*(?:人|名)"
+FOUNDED_YEAR_PATTERN = r"((?:18|19|20)\d{2})\s*年"
+# 和暦の設立年（"平成15年"、"令和元年" など）。元号の元年の前年（西暦 = 前年 + 和暦の年）
+FOUNDED_ERA_PATTERN = r"(?P<era>明治|大正|昭和|平成|令和)\s*(?P<year>元|\d{1,2})\s*年"
+ERA_BASE_YEARS = {"明治": 1867, "大正": 1911, "昭和": 1925, "平成": 1988, "令和": 2018}
+# 設立年ではなく経過年数で書かれている場合（"設立15年"、"15年目" など。和暦は除く）
+FOUNDED_YEARS_PATTERN = r"^(?!\D{0,4}?(?:明治|大正|昭和|平成|令和))\D{0,4}?(\d{1,3})\s*年(?!\d)"
+AVERAGE_AGE_PATTERN = r"(\d+(?:\.\d+)?)\s*歳"
+ANNUAL_HOLIDAYS_PATTERN = r"年間休日\D{0,5}?(\d{2,3})\s*日"
+# 「年間休日」の記載がない場合は3桁の日数（"125日以上" など）を年間休日とみなす
+HOLIDAY_DAYS_PATTERN = r"(?<!\d)(\d{3})\s*日"
+REMOTE_WORK_PATTERN = r"(?i)リモート|在宅|テレワーク|remote|WFH"
+NO_REMOTE_PATTERN = r"(?:リモート|在宅|テレワーク)\S{0,4}?(?:不可|なし|無し)"
+# 利用言語（", " 区切り）の各タグ（前後の空白を含まない）
+LANGUAGE_TAG_PATTERN = r"[^,、/\s](?:[^,、/]*[^,、/\s])?"
+
+# normalize_job_columnsが追加する列（利用言語リストは文字列のリスト、リモート可は真偽値、それ以外は数値）
+NORMALIZED_COLUMNS = (
+    "給与下限(円)", "給与上限(円)", "社員数(人)", "設立年", "設立からの年数", "平均年齢(歳)", "年間休日(日)",
+    "リモート可", "利用言語リスト",
+)
+# 値がリストの列（Excelには書き込めないため出力時に除く）
+LIST_COLUMNS = ("利用言語リスト",)
+
+
+def _extract_number(text, pattern):
+    """文字列の列から正規表現の1番目のグループの数値を取り出す（カンマ区切りに対応、該当なしはNaN）"""
+    return pd.to_numeric(text.str.extract(pattern, expand=False).str.replace(",", "", regex=False), errors="coerce")
+
+
+def _man_unit(unit):
+    """単位「万」の列を倍率（1万 / 1）に変換する"""
+    return unit.fillna("").eq("万").astype("float64") * 9999 + 1
+
+
+def parse_salary_range(salary):
+    """
+    給与の列から下限・上限の金額（円、年額）を求める
+    
+    金額の直前に「月給」などがある場合は12倍して年額にし、「時給」「日給」の場合は金額を求めない（NaN）。
+    
+    Args:
+        salary (pd.Series): 給与の文字列の列（例: "600万円〜900万円"、"月給30万円〜"）
         
-        # データ保存用のディレクトリ作成
-        today = datetime.datetime.now().strftime("%Y%m%d")
-        self.output_dir = f"output_{today}"
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+    Returns:
+        tuple: (下限の列, 上限の列)。金額がない場合はNaN
+    """
+    text = salary.astype("string")
+    ranged = text.str.extract(SALARY_RANGE_PATTERN)
+    high_unit = _man_unit(ranged["high_unit"])
+    low_unit = ranged["low_unit"].fillna(ranged["high_unit"])
+    low = _extract_number(ranged["low"], r"(.+)") * _man_unit(low_unit)
+    high = _extract_number(ranged["high"], r"(.+)") * high_unit
     
-    def login(self, use_google=False):
-        """Green Japanにログインする"""
-        # ヘッダー要素でログイン状態を確認
-        self.driver.get(self.base_url)
-        time.sleep(3)
-        try:
-            header_elem = self.driver.find_element(
-                By.CSS_SELECTOR,
-                "#js-react-header > header > div > nav > div.js-header-menu-target.mdl-navigation__link > div"
-            )
-            if "阪" in header_elem.text:
-                logger.info("ヘッダー要素に '阪' が含まれており、ログイン済みと判断します。")
-                return True
-        except Exception as e:
-            logger.debug(f"ヘッダー要素確認失敗: {str(e)}")
+    # 範囲でない場合は単一の金額を、前後の「〜」「以上」で下限・上限に振り分ける
+    single = text.str.extract(SALARY_SINGLE_PATTERN)
+    amount = _extract_number(single["amount"], r"(.+)") * _man_unit(single["unit"])
+    no_range = low.isna() & high.isna()
+    low = low.mask(no_range & single["prefix"].isna(), amount)
+    high = high.mask(no_range & single["suffix"].isna(), amount)
+    
+    # 採用した金額（範囲または単一の金額）の直前の給与の種類
+    period = ranged["period"].mask(no_range, single["period"])
+    monthly = period.isin(MONTHLY_SALARY_PERIODS).fillna(False).astype(bool)
+    low = low.mask(monthly, low * 12)
+    high = high.mask(monthly, high * 12)
+    unconvertible = period.isin(UNCONVERTIBLE_SALARY_PERIODS).fillna(False).astype(bool)
+    low = low.mask(unconvertible)
+    high = high.mask(unconvertible)
+    return low.round().astype("Int64"), high.round().astype("Int64")
+
+
+def normalize_job_columns(data, as_of=None):
+    """
+    求人データのDataFrameに、文字列の項目から取り出した列（NORMALIZED_COLUMNS）を追加する
+    
+    列全体に対する正規表現の抽出で処理するため、行ごとのPythonの処理は行わない。元の文字列の列はそのまま残す。
+    
+    Args:
+        data (pd.DataFrame): scrape_favoritesが返す求人データ
+        as_of (int): 設立からの年数の基準年（省略時は今年）
         
-        # プロファイルを使用している場合は、ログイン済みの可能性が高いのでチェック
-        if self.using_profile:
-            logger.info("Chromeプロファイルを使用しているため、ログイン状態を確認します...")
-            # まずホームページを開く
-            self.driver.get(self.base_url)
-            time.sleep(3)
-            
-            # マイページなどのリンクがあるかチェック
-            try:
-                my_page_link = self.driver.find_elements(By.XPATH, "//a[contains(@href, '/mypage')]")
-                if my_page_link:
-                    logger.info("すでにログインしています。ログイン処理をスキップします。")
-                    return True
-                
-                # 他のログイン済み要素の確認
-                logged_in_elements = self.driver.find_elements(By.CSS_SELECTOR, ".header-utility__login-status")
+    Returns:
+        pd.DataFrame: 列を追加したコピー（該当する元の列がない場合はその列は欠損値になる）
+    """
+    result = data.copy()
+    if as_of is None:
+        as_of = datetime.date.today().year
+    
+    def column(name):
+        if name in result:
+            return result[name].astype("string")
+        return pd.Series(pd.NA, index=result.index, dtype="string")
+    
+    result["給与下限(円)"], result["給与上限(円)"] = parse_salary_range(column("給与"))
+    result["社員数(人)"] = _extract_number(column("社員数"), HEADCOUNT_PATTERN).astype("Int64")
+    
+    # 設立年数は設立年（"2010年"・"平成15年"）と経過年数（"設立15年"）のどちらの書き方にも対応する
+    founded = column("設立年数")
+    era = founded.str.extract(FOUNDED_ERA_PATTERN)
+    era_year = pd.to_numeric(era["year"].replace("元", "1"), errors="coerce") + era["era"].map(ERA_BASE_YEARS).astype("Float64")
+    founded_year = _extract_number(founded, FOUNDED_YEAR_PATTERN).fillna(era_year)
+    elapsed = (as_of - founded_year).fillna(_extract_number(founded, FOUNDED_YEARS_PATTERN))
+    result["設立年"] = founded_year.fillna(as_of - elapsed).astype("Int64")
+    result["設立からの年数"] = elapsed.astype("Int64")
+    
+    result["平均年齢(歳)"] = _extract_number(column("平均年齢"), AVERAGE_AGE_PATTERN).astype("Float64")
+    holidays = column("休日日数")
+    result["年間休日(日)"] = (
+        _extract_number(holidays, ANNUAL_HOLIDAYS_PATTERN)
+        .fillna(_extract_number(holidays, HOLIDAY_DAYS_PATTERN))
+        .astype("Int64")
+    )
+    
+    # 働き方の記載がない求人は不明（欠損値）とする
+    work_style = column("働き方")
+    remote = work_style.str.contains(REMOTE_WORK_PATTERN, regex=True) & ~work_style.str.contains(NO_REMOTE_PATTERN, regex=True)
+    result["リモート可"] = remote.mask(work_style.fillna("").str.strip() == "").astype("boolean")
+    
+    result["利用言語リスト"] = column("利用言語").fillna("").str.findall(LANGUAGE_TAG_PATTERN).astype(object)
+    return result
+
+
+def normalize_job_rows(rows, as_of=None):
+    """
+    求人データの辞書のリストにnormalize_job_columnsの列を追加する（出力ファイルに数件ずつ書き込む場合に使用）
+    
+    Args:
+        rows (list): 求人データ辞書のリスト
+        as_of (int): 設立からの年数の基準年（省略時は今年）
+        
+    Returns:
+        list: 列を追加した辞書のリスト（欠損値はNone、数値・真偽値はPythonの値にしてJSONに書き込めるようにする）
+    """
+    result = normalize_job_columns(pd.DataFrame(rows), as_of=as_of)
+    return result.astype(object).where(result.notna(), None).to_dict("records")
+
+
+# 求人詳細ページ・会社情報ページの要素のXPath（HTTPエンジンでも使用するため、Seleniumのセレクタと同じ要素を指す）
+DETAIL_ITEMS_XPATH = (
+    "//*[@id='__next']/div[contains(@class, 'MuiBox-root') and contains(@class, 'css-')]/div"
+    "/div[contains(@class, 'MuiContainer-root') and contains(@class, 'css-')]/div/div/div"
+    "/div[contains(@class, 'css-')]/div"
+)
+CARD_TAG_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' card-tag__item ')]"
+COMPANY_NAME_XPATH = (
+    "//*[@id='__next']/div[contains(@class, 'MuiBox-root') and contains(@class, 'css-')]"
+    "//div[contains(@class, 'MuiContainer-root')]//aside//div[contains(@class, 'MuiCard-root')]"
+    "//a//div[contains(@class, 'MuiCardContent-root')]//h6"
+)
+LANGUAGE_XPATH = "//*[@id=\"__next\"]/div[1]/div/div[1]/div/div/div/div[1]/div[3]/div[4]/span"
+COMPANY_LINK_XPATH = "/html/body/div[1]/header/div[3]/div[2]/nav/div/div/a[1]"
+COMPANY_CONTAINER_XPATH = "/html/body/div[1]/div[1]/div/div[2]/div[2]/div/div"
+
+# innerTextと同様に改行を入れるブロック要素
+HTML_BLOCK_TAGS = {"p", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "section", "tr", "dt", "dd"}
+
+
+def parse_html(html):
+    """
+    HTML文字列を解析し、<br>やブロック要素の境界に改行を補ったツリーを返す
+    
+    Args:
+        html (str): HTML文字列
+        
+    Returns:
+        lxml.html.HtmlElement: 解析したツリー
+    """
+    tree = lxml.html.fromstring(html)
+    for element in tree.iter():
+        if element.tag == "br" or element.tag in HTML_BLOCK_TAGS:
+            element.tail = "\n" + (element.tail or "")
+    return tree
+
+
+def html_inner_text(element):
+    """
+    要素のテキストをSeleniumの.textに近い形（行ごとにstrip、空行除去）で返す
+    
+    Args:
+        element (lxml.html.HtmlElement): parse_htmlで解析したツリーの要素
+        
+    Returns:
+        str: 要素のテキスト
+    """
+    lines = [line.strip() for line in element.text_content().split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def apply_card_items(item_texts, tag_texts, job_data):
+    """
+    求人詳細ページのカード項目と利用言語タグのテキストをjob_dataに反映する
+    
+    Args:
+        item_texts (list): カード項目のテキストのリスト
+        tag_texts (list): 利用言語タグのテキストのリスト
+        job_data (dict): 更新する求人データの辞書
+    """
+    for item_text in item_texts:
+        if "勤務地" in item_text:
+            job_data["勤務地"] = item_text.replace("勤務地：", "").strip()
+        elif "時間" in item_text:
+            job_data["時間"] = item_text.replace("時間：", "").strip()
+        elif "働き方" in item_text:
+            job_data["働き方"] = item_text.replace("働き方：", "").strip()
+    if tag_texts:
+        job_data["利用言語"] = ", ".join(tag_texts)
+
+
+def html_company_url(tree, page_url):
+    """
+    求人詳細ページのHTMLから会社情報ページのURLを取得する
+    
+    Args:
+        tree (lxml.html.HtmlElement): parse_htmlで解析したツリー
+        page_url (str): 求人詳細ページのURL（相対リンクの解決に使用）
+        
+    Returns:
+        str: 会社情報ページのURL（見つからない場合はNone）
+    """
+    links = tree.xpath(COMPANY_LINK_XPATH)
+    href = links[0].get("href") if links else None
+    return urljoin(page_url, href) if href else None
+
+
+def html_company_texts(tree):
+    """
+    会社情報ページのHTMLからコンテナ内の各div要素のテキストを取得する
+    
+    Args:
+        tree (lxml.html.HtmlElement): parse_htmlで解析したツリー
+        
+    Returns:
+        list: 各div要素のテキスト（ラベルと値が改行で区切られる）
+    """
+    return [html_inner_text(div) for div in tree.xpath(COMPANY_CONTAINER_XPATH)]
+
+
+def html_field_snapshot(tree):
+    """
+    FIELD_SNAPSHOT_SCRIPTと同じ [ラベル, 値] のリストをHTMLから作成する
+    
+    Args:
+        tree (lxml.html.HtmlElement): parse_htmlで解析したツリー
+        
+    Returns:
+        list: [ラベル, 値] のリスト（文書順）
+    """
+    snapshot = []
+    for label in tree.xpath("//p[contains(@class, 'css-')]"):
+        parent = label.getparent()
+        values = parent.xpath(".//p") if parent is not None else []
+        snapshot.append([html_inner_text(label), html_inner_text(values[1]) if len(values) > 1 else None])
+    return snapshot
+
+
+# Next.jsがページに埋め込む初期データ（<script id="__NEXT_DATA__">）のJSON文字列を返すスクリプト
+NEXT_DATA_SCRIPT = """
+var element = document.getElementById('__NEXT_DATA__');
+return element ? element.textContent : null;
+"""
+
+# ラベルと値の組（[{label: "勤務時間", value: "..."}] など）として扱うキー
+# ※JSONのキー名（salary・employeeCountなど）から項目を推測しない（実際のレスポンスで確認できていないため）。
+#   画面と同じラベル（get_field_value・apply_company_textsが参照する名前）を持つ組のみ項目として使う
+STRUCTURED_LABEL_KEYS = ("label", "title", "heading", "name")
+STRUCTURED_VALUE_KEYS = ("value", "body", "text", "content", "description")
+# 会社情報ページの項目（apply_company_textsに渡す）
+STRUCTURED_COMPANY_LABELS = ("設立年月", "社員数", "平均年齢")
+# 求人の詳細項目（いずれかがなければ構造化データから取得できなかったとみなし、画面の要素から取得する）
+STRUCTURED_DETAIL_LABELS = ("年収", "勤務地", "勤務時間", "休日・休暇", "待遇・福利厚生", "働き方", "採用人数", "応募資格")
+# ページの求人・会社を表すオブジェクトのキー（小文字、"_"・"-"を除く）
+STRUCTURED_JOB_KEYS = {"job", "joboffer", "offer", "jobdetail"}
+STRUCTURED_COMPANY_KEYS = {"company", "client"}
+STRUCTURED_JOB_ID_KEYS = ("jobId", "jobOfferId", "job_offer_id", "offerId")
+# 他の求人・会社の一覧（おすすめの求人など）のキー。ページの求人の項目として扱わない
+STRUCTURED_UNRELATED_KEY_PATTERN = re.compile(r"recommend|related|similar|other|popular|ranking|history|viewed|pickup")
+# 数値で返される項目に付ける単位（正規化・画面表示と同じ書き方にする）
+STRUCTURED_UNITS = {"社員数": "人", "平均年齢": "歳", "設立年月": "年", "採用人数": "名"}
+
+
+def _structured_text(value, label=None):
+    """構造化データの値を画面表示と同じ書き方の文字列にする（変換できない値は空文字）"""
+    if isinstance(value, bool) or value is None:
+        return ""
+    if isinstance(value, (int, float)):
+        number = int(value) if float(value).is_integer() else value
+        return f"{number}{STRUCTURED_UNITS.get(label, '')}"
+    if isinstance(value, str):
+        date = re.match(r"^(\d{4})-(\d{2})(?:-\d{2})?(?:T|$)", value)
+        if date and label == "設立年月":
+            return f"{date.group(1)}年{int(date.group(2))}月"
+        return value.strip()
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return "\n".join(item.strip() for item in value if item.strip())
+    return ""
+
+
+def _structured_key(key):
+    """構造化データのキーを比較用に正規化する（小文字、"_"・"-"を除く）"""
+    return re.sub(r"[_\-]", "", str(key)).lower()
+
+
+def _is_structured_entity(key, node, path, job_id, company_id):
+    """nodeがページの求人（求人詳細ページ）または会社を表すオブジェクトか"""
+    for url_key in ("url", "href", "path"):
+        if isinstance(node.get(url_key), str) and urlparse(node[url_key]).path.rstrip("/") == path:
+            return True
+    node_id = str(node.get("id")) if node.get("id") is not None else None
+    if job_id is not None:
+        if node_id == job_id and (key is None or key in STRUCTURED_JOB_KEYS):
+            return True
+        if any(str(node.get(id_key)) == job_id for id_key in STRUCTURED_JOB_ID_KEYS if node.get(id_key) is not None):
+            return True
+        return node_id == company_id and key in STRUCTURED_COMPANY_KEYS
+    return node_id == company_id and (key is None or key in STRUCTURED_COMPANY_KEYS)
+
+
+def structured_scope(payloads, page_url, max_nodes=20000):
+    """
+    構造化データから、page_urlの求人・会社を表すオブジェクトを探す
+    
+    IDがURLの求人ID・会社IDと一致するオブジェクト（job・companyなどのキーの値、またはレスポンス全体）か、
+    URLがページと一致するオブジェクトを浅いものから探す。おすすめの求人など他の求人・会社の一覧は探さない。
+    
+    Args:
+        payloads (list): JSONを読み込んだ値のリスト
+        page_url (str): 求人詳細ページ（/company/<会社ID>/job/<求人ID>）または会社情報ページ（/company/<会社ID>）のURL
+        max_nodes (int): 走査する要素数の上限（巨大なレスポンス対策）
+        
+    Returns:
+        list: 見つかったオブジェクトのリスト（見つからない場合は空）
+    """
+    path = urlparse(page_url or "").path.rstrip("/")
+    match = re.search(r"/company/(\d+)(?:/job/(\d+))?$", path)
+    if not match:
+        return []
+    company_id, job_id = match.groups()
+    scopes = []
+    # 幅優先で探す（(親のキー, 値) の組、レスポンス全体の親のキーはNone）
+    pending = [(None, payload) for payload in payloads]
+    visited = 0
+    while pending and visited < max_nodes:
+        next_pending = []
+        for key, node in pending:
+            visited += 1
+            if isinstance(node, list):
+                next_pending.extend((key, item) for item in node)
+            elif isinstance(node, dict):
+                if _is_structured_entity(key, node, path, job_id, company_id):
+                    scopes.append(node)
+                    continue
+                for child_key, child in node.items():
+                    child_key = _structured_key(child_key)
+                    if isinstance(child, (dict, list)) and not STRUCTURED_UNRELATED_KEY_PATTERN.search(child_key):
+                        next_pending.append((child_key, child))
+        pending = next_pending
+    return scopes
+
+
+def structured_fields(payloads, page_url, max_nodes=20000):
+    """
+    構造化データ（__NEXT_DATA__・APIのJSON）から、page_urlの求人・会社の [ラベル, 値] の組を取り出す
+    
+    structured_scopeで見つけたオブジェクトの中から、ラベル・値の組になったオブジェクトを探す
+    （おすすめの求人など他の求人・会社の項目は取り出さない）。
+    
+    Args:
+        payloads (list): JSONを読み込んだ値のリスト
+        page_url (str): 求人詳細ページまたは会社情報ページのURL
+        max_nodes (int): 走査する要素数の上限（巨大なレスポンス対策）
+        
+    Returns:
+        list: [ラベル, 値] のリスト（FIELD_SNAPSHOT_SCRIPTと同じ形式、出現順）
+    """
+    snapshot = []
+    seen = set()
+    stack = list(reversed(structured_scope(payloads, page_url, max_nodes)))
+    visited = 0
+    while stack and visited < max_nodes:
+        node = stack.pop()
+        visited += 1
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        
+        label = next((node[key] for key in STRUCTURED_LABEL_KEYS if isinstance(node.get(key), str)), None)
+        value = next((node[key] for key in STRUCTURED_VALUE_KEYS if key in node), None)
+        if label and value is not None and len(label) <= 30:
+            text = _structured_text(value, label)
+            if text and (label, text) not in seen:
+                seen.add((label, text))
+                snapshot.append([label, text])
+        
+        children = []
+        for key, child in node.items():
+            normalized = _structured_key(key)
+            if STRUCTURED_UNRELATED_KEY_PATTERN.search(normalized):
+                continue
+            if isinstance(child, (dict, list)):
+                children.append(child)
+        # 出現順に走査するため、後の要素から積む
+        stack.extend(reversed(children))
+    return snapshot
+
+
+def html_next_data(tree):
+    """
+    解析済みのHTMLから__NEXT_DATA__のJSONを取り出す
+    
+    Args:
+        tree (lxml.html.HtmlElement): parse_htmlで解析したツリー
+        
+    Returns:
+        list: JSONを読み込んだ値のリスト（埋め込まれていない・読み込めない場合は空）
+    """
+    for text in tree.xpath("//script[@id='__NEXT_DATA__']/text()"):
+        try:
+            return [json.loads(text)]
+        except ValueError:
+            logger.warning("__NEXT_DATA__のJSONを読み込めませんでした")
+    return []
+
+
+def snapshot_lookup(snapshot):
+    """
+    [ラベル, 値] のリストから項目の値を返す関数を作成する（get_field_valueの索引と同じく、ラベルに項目名を含む最初の値）
+    
+    Args:
+        snapshot (list): [ラベル, 値] のリスト（文書順）
+        
+    Returns:
+        callable: 項目名を受け取り値（見つからない場合は空文字）を返す関数
+    """
+    cache = {}
+    
+    def get_value(field_name):
+        if field_name not in cache:
+            cache[field_name] = next(
+                (label_value or "" for label, label_value in snapshot if field_name in (label or "")), ""
+            )
+        return cache[field_name]
+    
+    return get_value
+
+
+def apply_field_values(get_value, job_data):
+    """
+    ラベルから取得できる詳細項目をjob_dataに格納する
+    
+    Args:
+        get_value (callable): 項目名を受け取り値（見つからない場合は空文字）を返す関数
+        job_data (dict): 更新する求人データの辞書
+    """
+    if not job_data["給与"]:
+        salary = get_value("年収")
+        if salary and "円" in salary:
+            job_data["給与"] = salary
+
+    if not job_data["勤務地"]:
+        location = get_value("勤務地")
+        if location:
+            job_data["勤務地"] = location
+
+    work_time = get_value("勤務時間")
+    if work_time:
+        job_data["時間"] = work_time
+
+    holiday = get_value("休日・休暇")
+    if holiday:
+        job_data["休日日数"] = holiday
+
+    benefits = get_value("待遇・福利厚生")
+    if benefits:
+        job_data["待遇・福利厚生"] = benefits
+
+    work_style = get_value("働き方")
+    if work_style:
+        job_data["働き方"] = work_style
+
+    number_of_employees = get_value("採用人数")
+    if number_of_employees:
+        job_data["採用人数"] = number_of_employees
+
+    application_qualification = get_value("応募資格")
+    if application_qualification:
+        job_data["応募資格"] = application_qualification
+        # 応募資格テキストを解析して必須資格と歓迎資格に分割
+        must, want = parse_requirements_text(application_qualification)
+        if must:
+            job_data["必須資格"] = must
+        # 必須資格が抽出できなかった場合はページ上のフィールドをフォールバック取得
+        elif get_value("必須資格"):
+            job_data["必須資格"] = get_value("必須資格")
+        if want:
+            job_data["歓迎資格"] = want
+        # 歓迎資格が抽出できなかった場合はページ上のフィールドをフォールバック取得
+        elif get_value("歓迎資格"):
+            job_data["歓迎資格"] = get_value("歓迎資格")
+
+    hope_degree = get_value("希望度")
+    if hope_degree:
+        job_data["希望度"] = hope_degree
+
+
+def apply_company_texts(div_texts, job_data):
+    """
+    会社情報ページの各div要素のテキストからラベルに応じて情報を格納する
+    
+    Args:
+        div_texts (list): 各div要素のテキスト（1行目がラベル、2行目以降が値）
+        job_data (dict): 更新する求人データ辞書
+    
+    Returns:
+        dict: 更新された求人データ辞書
+    """
+    try:
+        logger.info(f"コンテナ内のdiv要素数: {len(div_texts)}")
+        
+        # すべてのdiv要素を処理 （ラベル／値を改行で分割して抽出）
+        for i, div_text in enumerate(div_texts):
+            div_text = div_text.strip()
+            logger.info(f"div[{i}] テキスト: {div_text}")
+            
+            # 改行で分割
+            lines = div_text.split('\n')
+            if len(lines) < 2:
+                continue
+            
+            label = lines[0].strip()
+            value = '\n'.join(lines[1:]).strip()
+            
+            # ラベルに応じて job_data を更新
+            if "設立" in label:
+                job_data["設立年数"] = value
+                logger.info(f"設立年数を格納: {value}")
+                continue
+            if "社員数" in label or "従業員数" in label:
+                job_data["社員数"] = value
+                logger.info(f"社員数を格納: {value}")
+                continue
+            if "平均年齢" in label:
+                job_data["平均年齢"] = value
+                logger.info(f"平均年齢を格納: {value}")
+                continue
+        
+        # （必要であればこれまでのSVGアイコン検索やバックアップ処理を後段に残します）
+        
+        logger.info(f"最終取得情報: 設立年数={job_data.get('設立年数','未取得')}, 社員数={job_data.get('社員数','未取得')}, 平均年齢={job_data.get('平均年齢','未取得')}")
+        return job_data
+        
+    except Exception as e:
+        logger.error(f"会社情報の取得中にエラー: {e}")
+        return job_data
+
+
+def extract_detail_tree(tree, job_data):
+    """
+    解析済みの求人詳細ページのHTMLからカード項目・詳細項目を抽出する
+    
+    Args:
+        tree (lxml.html.HtmlElement): parse_htmlで解析したツリー
+        job_data (dict): 更新する求人データの辞書
+        
+    Returns:
+        bool: 抽出できた場合はTrue（サーバーレンダリング結果にラベルがない場合はFalseでjob_dataは変更しない）
+    """
+    snapshot = html_field_snapshot(tree)
+    if not snapshot:
+        return False
+    get_value = snapshot_lookup(snapshot)
+    
+    # カード項目（勤務地・時間・働き方・利用言語タグ）
+    apply_card_items(
+        [html_inner_text(item) for item in tree.xpath(DETAIL_ITEMS_XPATH)],
+        [html_inner_text(tag) for tag in tree.xpath(CARD_TAG_XPATH)],
+        job_data,
+    )
+    
+    # 詳細項目
+    company_name = get_value("企業名")
+    if not company_name:
+        company_names = tree.xpath(COMPANY_NAME_XPATH)
+        company_name = html_inner_text(company_names[0]) if company_names else ""
+    if company_name:
+        job_data["企業名"] = company_name
+    apply_field_values(get_value, job_data)
+    
+    languages = [html_inner_text(elem) for elem in tree.xpath(LANGUAGE_XPATH)]
+    languages = [language for language in languages if language]
+    if languages:
+        job_data["利用言語"] = ", ".join(languages)
+    return True
+
+
+def apply_structured_data(payloads, job_data, tree=None):
+    """
+    構造化データから詳細項目・会社情報をjob_dataに格納する（画面の要素からの抽出と同じ項目名に変換）
+    
+    利用言語と、構造化データにない企業名はtreeが渡された場合にHTMLから取得する。
+    
+    Args:
+        payloads (list): JSONを読み込んだ値のリスト
+        job_data (dict): 更新する求人データの辞書
+        tree (lxml.html.HtmlElement): 求人詳細ページをparse_htmlで解析したツリー（省略可）
+        
+    Returns:
+        tuple: (詳細項目を格納した場合はTrue, 会社情報を格納した場合はTrue)。詳細項目がない場合はjob_dataを変更しない
+    """
+    job_url = job_data["掲載ページ"]
+    snapshot = structured_fields(payloads, job_url)
+    # 企業名だけでは画面の要素からの取得を省略しない（詳細項目が空のままになるため）
+    if not {label for label, _ in snapshot} & set(STRUCTURED_DETAIL_LABELS):
+        return False, False
+    
+    get_value = snapshot_lookup(snapshot)
+    company_name = get_value("企業名")
+    if not company_name and tree is not None:
+        company_names = tree.xpath(COMPANY_NAME_XPATH)
+        company_name = html_inner_text(company_names[0]) if company_names else ""
+    if company_name:
+        job_data["企業名"] = company_name
+    apply_field_values(get_value, job_data)
+    if tree is not None:
+        languages = [html_inner_text(elem) for elem in tree.xpath(LANGUAGE_XPATH)]
+        languages = [language for language in languages if language]
+        if languages:
+            job_data["利用言語"] = ", ".join(languages)
+    
+    company_texts = structured_company_texts(payloads, job_url, snapshot)
+    if company_texts:
+        apply_company_texts(company_texts, job_data)
+    logger.info(f"構造化データから取得しました: 項目{len(snapshot)}件")
+    return True, bool(company_texts)
+
+
+def structured_company_texts(payloads, page_url, snapshot=None):
+    """
+    構造化データの会社情報をapply_company_textsに渡す "ラベル\n値" の形式にする
+    
+    Args:
+        payloads (list): JSONを読み込んだ値のリスト
+        page_url (str): 求人詳細ページまたは会社情報ページのURL（このページの会社の情報のみ取り出す）
+        snapshot (list): structured_fieldsで取り出し済みの [ラベル, 値] のリスト（省略時はpayloadsから取り出す）
+        
+    Returns:
+        list: "ラベル\n値" の文字列のリスト（会社情報がない場合は空）
+    """
+    if snapshot is None:
+        snapshot = structured_fields(payloads, page_url)
+    texts = []
+    for label, value in snapshot:
+        if label in STRUCTURED_COMPANY_LABELS and not any(text.startswith(f"{label}\n") for text in texts):
+            texts.append(f"{label}\n{value}")
+    return texts
+
+
+class CompanyCache:
+    """
+    会社情報（設立年数・社員数・平均年齢）のキャッシュ
+    
+    会社情報ページのURL（会社IDを含む場合はID）をキーとし、
+    メモリ上のLRUとSQLiteファイルの2層で保持する。有効期限を過ぎたものは使用しない。
+    """
+    
+    FIELDS = ("設立年数", "社員数", "平均年齢")
+    
+    def __init__(self, path, ttl_hours=168, max_entries=256):
+        """
+        Args:
+            path (str): キャッシュを保存するSQLiteファイルのパス
+            ttl_hours (float): キャッシュの有効期限（時間）
+            max_entries (int): メモリ上に保持する件数の上限
+        """
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS company_cache ("
+            "key TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(company_url):
+        """
+        会社情報ページのURLからキャッシュキーを作成する
+        
+        Args:
+            company_url (str): 会社情報ページのURL
+            
+        Returns:
+            str: 会社IDを含むURLなら "company:<ID>"、それ以外はクエリを除いたURL
+        """
+        parsed = urlparse(company_url)
+        match = re.search(r"/company/(\d+)", parsed.path)
+        if match:
+            return f"company:{match.group(1)}"
+        return f"{parsed.netloc}{parsed.path.rstrip('/')}"
+    
+    def get(self, company_url):
+        """
+        キャッシュから会社情報を取得する
+        
+        Args:
+            company_url (str): 会社情報ページのURL
+            
+        Returns:
+            dict: 会社情報（キャッシュにない・期限切れの場合はNone）
+        """
+        key = self.make_key(company_url)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT data, fetched_at FROM company_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (json.loads(row[0]), row[1])
+            if entry is None or now - entry[1] > self.ttl:
+                self._memory.pop(key, None)
+                self.misses += 1
+                return None
+            self._remember(key, entry)
+            self.hits += 1
+            return dict(entry[0])
+    
+    def put(self, company_url, job_data):
+        """
+        求人データ辞書から会社情報を取り出してキャッシュに保存する（値が1つもなければ保存しない）
+        
+        Args:
+            company_url (str): 会社情報ページのURL
+            job_data (dict): 会社情報を格納済みの求人データ辞書
+        """
+        values = {field: job_data.get(field, "") for field in self.FIELDS}
+        if not any(values.values()):
+            return
+        key = self.make_key(company_url)
+        entry = (values, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO company_cache (key, data, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(values, ensure_ascii=False), entry[1])
+            )
+            self._conn.commit()
+    
+    def _remember(self, key, entry):
+        """メモリ上のLRUに登録する（上限を超えた分は古い順に破棄）"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def close(self):
+        """SQLiteファイルを閉じる"""
+        self._conn.close()
+
+
+class JobStore:
+    """
+    スクレイピング済みの求人データの保存先（掲載ページURLをキーとするSQLite）
+    
+    求人ごとに最終取得日時、抽出した項目のフィンガープリント、
+    お気に入り一覧に表示された内容（給与など）のフィンガープリントを記録し、増分取得に使用する。
+    実行ごとにお気に入りの求人を記録し、項目の変更履歴（job_changes）とあわせて
+    実行をまたいだ比較（給与が上がった求人、お気に入りから外れた求人など）に使用する。
+    """
+    
+    # jobsテーブルに後から追加した列（既存のファイルはALTER TABLEで追加する）
+    COLUMNS = {
+        "company": "TEXT",
+        "salary_low": "INTEGER",
+        "salary_high": "INTEGER",
+        "first_seen": "REAL",
+        "last_seen_run": "INTEGER",
+        "removed_at": "REAL",
+    }
+    # 変更履歴に記録する、給与から求めた数値の項目
+    SALARY_FIELDS = ("給与下限(円)", "給与上限(円)")
+    # query()で使用できる問い合わせ
+    QUERIES = ("salary-rose", "removed", "new", "changes", "search")
+    
+    def __init__(self, path):
+        """
+        Args:
+            path (str): 保存先のSQLiteファイルのパス
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "url TEXT PRIMARY KEY, data TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "listing_fingerprint TEXT NOT NULL, scraped_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, started_at REAL NOT NULL, job_count INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_changes ("
+            "url TEXT NOT NULL, run_id INTEGER, field TEXT NOT NULL, "
+            "old_value TEXT, new_value TEXT, changed_at REAL NOT NULL)"
+        )
+        self._migrate()
+        for statement in (
+            "CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company)",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_salary ON jobs (salary_low, salary_high)",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs (scraped_at)",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_last_seen_run ON jobs (last_seen_run)",
+            "CREATE INDEX IF NOT EXISTS idx_job_changes_url ON job_changes (url, changed_at)",
+            "CREATE INDEX IF NOT EXISTS idx_job_changes_field ON job_changes (field, changed_at)",
+        ):
+            self._conn.execute(statement)
+        self._conn.commit()
+        self.run_id = None
+    
+    def _migrate(self):
+        """以前の形式のjobsテーブルに列を追加し、保存済みの求人から企業名・給与の数値を埋める"""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        missing = [name for name in self.COLUMNS if name not in existing]
+        for name in missing:
+            self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {self.COLUMNS[name]}")
+        if "company" not in missing:
+            return
+        rows = self._conn.execute("SELECT url, data, scraped_at FROM jobs").fetchall()
+        saved_rows = [json.loads(data) for _, data, _ in rows]
+        salaries = self.salary_values([job_data.get("給与", "") for job_data in saved_rows])
+        for (url, _, scraped_at), job_data, (low, high) in zip(rows, saved_rows, salaries):
+            self._conn.execute(
+                "UPDATE jobs SET company = ?, salary_low = ?, salary_high = ?, first_seen = ? WHERE url = ?",
+                (job_data.get("企業名", ""), low, high, scraped_at, url)
+            )
+        if rows:
+            logger.info(f"求人データの保存先に列を追加しました（{len(rows)}件）")
+    
+    @staticmethod
+    def fingerprint(values):
+        """
+        値のフィンガープリント（JSONのSHA-1）を計算する
+        
+        Args:
+            values: JSONに変換できる値（辞書・リストなど）
+            
+        Returns:
+            str: 16進数のハッシュ値
+        """
+        payload = json.dumps(values, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def salary_values(salaries):
+        """
+        複数の給与の文字列から下限・上限の金額（円、年額）をまとめて求める（parse_salary_rangeを1回だけ呼び出す）
+        
+        Args:
+            salaries (list): 給与の文字列のリスト
+            
+        Returns:
+            list: salariesと同じ順序の (下限, 上限) のリスト。金額がない場合はNone
+        """
+        if not salaries:
+            return []
+        low, high = parse_salary_range(pd.Series([salary or "" for salary in salaries], dtype="string"))
+        return [
+            (None if pd.isna(low_value) else int(low_value), None if pd.isna(high_value) else int(high_value))
+            for low_value, high_value in zip(low, high)
+        ]
+    
+    def get(self, url):
+        """
+        保存済みの求人を取得する
+        
+        Args:
+            url (str): 掲載ページのURL
+            
+        Returns:
+            dict: data / fingerprint / listing_fingerprint / scraped_at（未保存の場合はNone）
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, fingerprint, listing_fingerprint, scraped_at FROM jobs WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "data": json.loads(row[0]),
+            "fingerprint": row[1],
+            "listing_fingerprint": row[2],
+            "scraped_at": row[3],
+        }
+    
+    def start_run(self, job_urls):
+        """
+        今回のお気に入りの求人を記録する（以降のsaveの変更履歴はこの実行に紐付ける）
+        
+        前回までお気に入りにあって今回ない求人には、外れた日時を記録する。
+        
+        Args:
+            job_urls (list): 今回のお気に入りの全求人URL
+            
+        Returns:
+            int: 実行のID
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (started_at, job_count) VALUES (?, ?)", (now, len(job_urls))
+            )
+            self.run_id = cursor.lastrowid
+            self._conn.executemany(
+                "UPDATE jobs SET last_seen_run = ?, removed_at = NULL WHERE url = ?",
+                [(self.run_id, job_url) for job_url in job_urls]
+            )
+            self._conn.execute(
+                "UPDATE jobs SET removed_at = ? WHERE removed_at IS NULL AND last_seen_run IS NOT NULL "
+                "AND last_seen_run < ?", (now, self.run_id)
+            )
+            self._conn.commit()
+        return self.run_id
+    
+    def save(self, job_data, listing_fingerprint, salary=None):
+        """
+        求人を保存し、前回から変わった項目を変更履歴に記録する
+        
+        Args:
+            job_data (dict): 求人データ辞書（"掲載ページ"をキーとする）
+            listing_fingerprint (str): お気に入り一覧に表示された内容のフィンガープリント
+            salary (tuple): salary_valuesで求めた給与の (下限, 上限)（省略時はjob_dataの給与から求める）
+            
+        Returns:
+            bool: 新規の求人、または前回から内容が変わっていた場合はTrue
+        """
+        url = job_data["掲載ページ"]
+        fingerprint = self.fingerprint(job_data)
+        low, high = salary if salary is not None else self.salary_values([job_data.get("給与", "")])[0]
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, data, salary_low, salary_high FROM jobs WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None and row[0] != fingerprint:
+                self._record_changes(url, json.loads(row[1]), job_data, (row[2], row[3]), (low, high), now)
+            self._conn.execute(
+                "INSERT INTO jobs (url, data, fingerprint, listing_fingerprint, scraped_at, "
+                "company, salary_low, salary_high, first_seen, last_seen_run, removed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL) "
+                "ON CONFLICT (url) DO UPDATE SET data = excluded.data, fingerprint = excluded.fingerprint, "
+                "listing_fingerprint = excluded.listing_fingerprint, scraped_at = excluded.scraped_at, "
+                "company = excluded.company, salary_low = excluded.salary_low, salary_high = excluded.salary_high, "
+                "last_seen_run = COALESCE(excluded.last_seen_run, jobs.last_seen_run), removed_at = NULL",
+                (url, json.dumps(job_data, ensure_ascii=False), fingerprint, listing_fingerprint, now,
+                 job_data.get("企業名", ""), low, high, now, self.run_id)
+            )
+            self._conn.commit()
+        return row is None or row[0] != fingerprint
+    
+    def _record_changes(self, url, old_data, new_data, old_salary, new_salary, changed_at):
+        """変わった項目（給与から求めた下限・上限を含む）を変更履歴に追加する"""
+        changes = [
+            (field, old_data.get(field), value)
+            for field, value in new_data.items()
+            if old_data.get(field) != value
+        ]
+        for field, old_value, new_value in zip(self.SALARY_FIELDS, old_salary, new_salary):
+            if old_value != new_value:
+                changes.append((field, old_value, new_value))
+        self._conn.executemany(
+            "INSERT INTO job_changes (url, run_id, field, old_value, new_value, changed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [(url, self.run_id, field, None if old is None else str(old), None if new is None else str(new), changed_at)
+             for field, old, new in changes]
+        )
+    
+    def query(self, name, since=None, company=None, min_salary=None):
+        """
+        保存済みの求人を問い合わせる
+        
+        Args:
+            name (str): 問い合わせの種類（QUERIESのいずれか）
+                salary-rose: 期間内に給与の下限か上限が上がった求人
+                removed: 前回の実行ではお気に入りにあり、最新の実行でなくなった求人
+                new: 期間内に初めて保存した求人
+                changes: 期間内の項目の変更履歴
+                search: 企業名・給与の下限で絞り込んだ求人
+            since (float): 期間の開始（UNIX時刻、省略時は全期間）
+            company (str): 企業名に含まれる文字列（省略時は絞り込まない）
+            min_salary (int): 給与の上限（下限のみの求人は下限）がこの金額（円）以上の求人に絞り込む
+            
+        Returns:
+            pd.DataFrame: 問い合わせ結果
+        """
+        since = since or 0
+        conditions, params = [], []
+        if company:
+            conditions.append("jobs.company LIKE ?")
+            params.append(f"%{company}%")
+        if min_salary:
+            conditions.append("COALESCE(jobs.salary_high, jobs.salary_low) >= ?")
+            params.append(min_salary)
+        filters = "".join(f" AND {condition}" for condition in conditions)
+        
+        if name == "salary-rose":
+            sql = (
+                "SELECT jobs.company AS 企業名, jobs.url AS 掲載ページ, job_changes.field AS 項目, "
+                "CAST(job_changes.old_value AS INTEGER) AS 変更前, CAST(job_changes.new_value AS INTEGER) AS 変更後, "
+                "datetime(job_changes.changed_at, 'unixepoch', 'localtime') AS 変更日時 "
+                "FROM job_changes JOIN jobs ON jobs.url = job_changes.url "
+                "WHERE job_changes.field IN (?, ?) AND job_changes.changed_at >= ? "
+                "AND CAST(job_changes.new_value AS INTEGER) > CAST(job_changes.old_value AS INTEGER)"
+                f"{filters} ORDER BY job_changes.changed_at DESC"
+            )
+            params = [*self.SALARY_FIELDS, since, *params]
+        elif name == "removed":
+            sql = (
+                "SELECT company AS 企業名, url AS 掲載ページ, salary_low AS 給与下限, salary_high AS 給与上限, "
+                "datetime(removed_at, 'unixepoch', 'localtime') AS 外れた日時 FROM jobs "
+                "WHERE last_seen_run = (SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET 1)"
+                f"{filters} ORDER BY company"
+            )
+        elif name == "new":
+            sql = (
+                "SELECT company AS 企業名, url AS 掲載ページ, salary_low AS 給与下限, salary_high AS 給与上限, "
+                "datetime(first_seen, 'unixepoch', 'localtime') AS 初回取得日時 FROM jobs "
+                f"WHERE first_seen >= ?{filters} ORDER BY first_seen DESC"
+            )
+            params = [since, *params]
+        elif name == "changes":
+            sql = (
+                "SELECT jobs.company AS 企業名, jobs.url AS 掲載ページ, job_changes.field AS 項目, "
+                "job_changes.old_value AS 変更前, job_changes.new_value AS 変更後, "
+                "datetime(job_changes.changed_at, 'unixepoch', 'localtime') AS 変更日時 "
+                "FROM job_changes JOIN jobs ON jobs.url = job_changes.url "
+                f"WHERE job_changes.changed_at >= ?{filters} ORDER BY job_changes.changed_at DESC"
+            )
+            params = [since, *params]
+        elif name == "search":
+            sql = (
+                "SELECT company AS 企業名, url AS 掲載ページ, salary_low AS 給与下限, salary_high AS 給与上限, "
+                "datetime(scraped_at, 'unixepoch', 'localtime') AS 最終取得日時, "
+                "CASE WHEN removed_at IS NULL THEN '' ELSE '外れた' END AS お気に入り FROM jobs "
+                f"WHERE scraped_at >= ?{filters} ORDER BY salary_high DESC"
+            )
+            params = [since, *params]
+        else:
+            raise ValueError(f"対応していない問い合わせです: {name}")
+        with self._lock:
+            result = pd.read_sql_query(sql, self._conn, params=params)
+        for column in ("給与下限", "給与上限", "変更前", "変更後"):
+            if column in result and name != "changes":
+                result[column] = result[column].astype("Int64")
+        return result
+    
+    def close(self):
+        """SQLiteファイルを閉じる"""
+        self._conn.close()
+
+
+class CheckpointJournal:
+    """
+    完了した求人データを1件ずつ追記するチェックポイント（JSONL）
+    
+    各行は書き込みのたびにディスクへ書き出すため、途中で異常終了しても
+    完了済みの求人は失われず、再開時に取得をスキップできる。
+    keep_rows=Falseの場合は完了済みの求人URLのみを保持し、求人データはrowsでファイルから読み直す。
+    """
+    
+    def __init__(self, path, resume=False, keep_rows=True):
+        """
+        Args:
+            path (str): JSONLファイルのパス
+            resume (bool): Trueなら既存の記録を読み込んで追記、Falseなら記録を消して新規に開始
+            keep_rows (bool): Trueなら求人データをメモリ上に保持する、FalseならURLのみ保持する
+        """
+        self.path = path
+        self.keep_rows = keep_rows
+        self._lock = threading.Lock()
+        self.completed = OrderedDict()
+        if resume and os.path.exists(path):
+            self._load()
+        else:
+            open(path, "w", encoding="utf-8").close()
+        self._file = open(path, "a", encoding="utf-8")
+    
+    def _read(self):
+        """記録を1件ずつ読み込む（書き込み途中で終了した行は無視する）"""
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    yield json.loads(line.decode("utf-8", errors="replace"))
+                except json.JSONDecodeError:
+                    logger.warning("チェックポイントの不完全な行をスキップしました")
+    
+    def _load(self):
+        """記録を読み込む"""
+        for job_data in self._read():
+            self.completed[job_data["掲載ページ"]] = job_data if self.keep_rows else None
+        # 最終行が途中で切れている場合、次の追記が同じ行に続かないよう改行を補う
+        with open(self.path, "rb+") as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        logger.info(f"チェックポイントから{len(self.completed)}件の完了済み求人を読み込みました: {self.path}")
+    
+    def pending(self, job_urls, job_salaries):
+        """
+        完了済みの求人を除いたURLと給与情報を返す
+        
+        Args:
+            job_urls (list): 求人URLのリスト
+            job_salaries (list): job_urlsと同じ順序の給与情報
+            
+        Returns:
+            tuple: (未完了の求人URL, 同じ順序の給与情報)
+        """
+        pending = [(job_url, salary) for job_url, salary in zip(job_urls, job_salaries)
+                   if job_url not in self.completed]
+        if len(pending) < len(job_urls):
+            logger.info(f"完了済みの{len(job_urls) - len(pending)}件をスキップします")
+        return [job_url for job_url, _ in pending], [salary for _, salary in pending]
+    
+    def append(self, job_data):
+        """
+        完了した求人データを追記する
+        
+        Args:
+            job_data (dict): 求人データ辞書
+        """
+        line = json.dumps(job_data, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.completed[job_data["掲載ページ"]] = job_data if self.keep_rows else None
+    
+    def rows(self, job_urls=None):
+        """
+        完了済みの求人データを1件ずつ返す（同じ求人は1回だけ返す）
+        
+        Args:
+            job_urls (list): 指定した場合、このURLの求人のみ返す
+            
+        Yields:
+            dict: 求人データ辞書
+        """
+        wanted = set(job_urls) if job_urls is not None else None
+        if self.keep_rows:
+            for job_url, job_data in list(self.completed.items()):
+                if wanted is None or job_url in wanted:
+                    yield job_data
+            return
+        seen = set()
+        for job_data in self._read():
+            job_url = job_data["掲載ページ"]
+            if job_url not in seen and (wanted is None or job_url in wanted):
+                seen.add(job_url)
+                yield job_data
+    
+    def close(self):
+        """ファイルを閉じる"""
+        self._file.close()
+
+
+class PageArchive:
+    """
+    取得したページ（HTML・APIのJSON）を圧縮して保存するコンテンツアドレス方式のアーカイブ
+    
+    本文はSHA-256をファイル名として objects/<先頭2文字>/<残り>.gz に保存し（同じ内容は1回だけ保存）、
+    URL・種類（job / company）・本文のハッシュを index.jsonl に1行ずつ追記する。
+    セレクタの修正後に reextract_archive でブラウザやネットワークなしに抽出し直すために使用する。
+    """
+    
+    INDEX_NAME = "index.jsonl"
+    
+    def __init__(self, root):
+        """
+        Args:
+            root (str): アーカイブのディレクトリ
+        """
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._index = open(os.path.join(root, self.INDEX_NAME), "a", encoding="utf-8")
+        self.stored = 0
+        self.deduplicated = 0
+    
+    @staticmethod
+    def page_kind(url):
+        """
+        URLからページの種類を判定する
+        
+        Args:
+            url (str): ページのURL
+            
+        Returns:
+            str: "job"（求人詳細ページ）/ "company"（会社情報ページ）/ "other"
+        """
+        path = urlparse(url).path.rstrip("/")
+        if re.search(r"/job/\d+$", path):
+            return "job"
+        if re.search(r"/company/\d+$", path):
+            return "company"
+        return "other"
+    
+    def object_path(self, digest):
+        """本文のハッシュから保存先のパスを求める"""
+        return os.path.join(self.root, "objects", digest[:2], f"{digest[2:]}.gz")
+    
+    def add(self, url, content, content_type="html"):
+        """
+        ページの本文を保存し、索引に追記する
+        
+        Args:
+            url (str): ページのURL
+            content (str): HTML、またはJSONの文字列
+            content_type (str): "html" または "json"
+            
+        Returns:
+            str: 本文のSHA-256（16進数）
+        """
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        record = {
+            "url": url, "kind": self.page_kind(url), "type": content_type,
+            "sha256": digest, "fetched_at": time.time(),
+        }
+        with self._lock:
+            if os.path.exists(path):
+                self.deduplicated += 1
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.tmp"
+                with gzip.open(temp_path, "wb", compresslevel=6) as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                self.stored += 1
+            self._index.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._index.flush()
+        return digest
+    
+    @classmethod
+    def read_index(cls, root):
+        """
+        索引を読み込み、URL・種類ごとに最後に保存した本文の記録を返す
+        
+        Args:
+            root (str): アーカイブのディレクトリ
+            
+        Returns:
+            OrderedDict: (URL, 種類, html/json) をキー、索引の記録を値とする辞書（最初に保存した順）
+        """
+        latest = OrderedDict()
+        with open(os.path.join(root, cls.INDEX_NAME), encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                latest[(record["url"], record["kind"], record["type"])] = record
+        return latest
+    
+    @classmethod
+    def read(cls, root, digest):
+        """
+        保存した本文を読み込む
+        
+        Args:
+            root (str): アーカイブのディレクトリ
+            digest (str): 本文のSHA-256
+            
+        Returns:
+            str: 本文
+        """
+        with gzip.open(os.path.join(root, "objects", digest[:2], f"{digest[2:]}.gz"), "rb") as f:
+            return f.read().decode("utf-8")
+    
+    def close(self):
+        """索引を閉じる"""
+        self._index.close()
+
+
+# 再試行の対象とするHTTPステータスコード
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class StreamingExporter:
+    """
+    求人データを取得のたびに1件ずつ追記する出力ファイル（xlsx / csv / jsonl）
+    
+    全件のDataFrameやブック全体をメモリ上に作らずに出力する。csv・jsonlは1件ごとに書き出すため、
+    実行中も取得済みの行までの有効なファイルが存在する。xlsxは同じ場所の *.partial.jsonl に追記し、
+    close時にopenpyxlの書き込み専用モードで1行ずつxlsxへ変換する（変換後に *.partial.jsonl は削除する）。
+    xlsx（zip形式）は追記できないため、実行中や異常終了後にはxlsxは存在せず *.partial.jsonl のみ残る。
+    実行中・異常終了後も表計算ソフトで開けるファイルが必要な場合はcsvを使用する。
+    """
+    
+    FORMATS = ("xlsx", "csv", "jsonl")
+    
+    def __init__(self, path, columns):
+        """
+        Args:
+            path (str): 出力ファイルのパス（拡張子で形式を判定）
+            columns (list): 列の並び（csvの見出し・xlsxの列順の先頭に使用）
+        """
+        self.path = path
+        self.format = os.path.splitext(path)[1].lstrip(".").lower()
+        if self.format not in self.FORMATS:
+            raise ValueError(f"対応していない出力形式です: {self.format}")
+        self.columns = list(columns)
+        self.written = set()
+        self._lock = threading.Lock()
+        self.partial_path = f"{path}.partial.jsonl" if self.format == "xlsx" else path
+        encoding = "utf-8-sig" if self.format == "csv" else "utf-8"
+        self._file = open(self.partial_path, "w", encoding=encoding, newline="")
+        self._csv = None
+        if self.format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            self._csv.writeheader()
+            self._file.flush()
+    
+    def write(self, job_data):
+        """
+        求人データを1行追記する（同じ求人URLは1回だけ書き込む）
+        
+        Args:
+            job_data (dict): 求人データ辞書
+        """
+        with self._lock:
+            job_url = job_data.get("掲載ページ")
+            if job_url in self.written:
+                return
+            self.written.add(job_url)
+            if self._csv is not None:
+                self._csv.writerow(job_data)
+            else:
+                self._file.write(json.dumps(job_data, ensure_ascii=False) + "\n")
+            self._file.flush()
+    
+    def read_frame(self):
+        """
+        書き込んだ行をDataFrameとして読み込む（全行をメモリ上に読み込む。closeの前に呼び出す）
+        
+        Returns:
+            pd.DataFrame: 書き込んだ行（csvの場合は全列が文字列）
+        """
+        with self._lock:
+            self._file.flush()
+        if self.format == "csv":
+            return pd.read_csv(self.path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+        with open(self.partial_path, encoding="utf-8") as f:
+            return pd.DataFrame([json.loads(line) for line in f])
+    
+    def close(self):
+        """
+        ファイルを閉じる（xlsxの場合は追記した行をxlsxに変換する）
+        
+        Returns:
+            str: 出力ファイルのパス
+        """
+        self._file.close()
+        if self.format == "xlsx":
+            self._write_xlsx()
+            os.remove(self.partial_path)
+        return self.path
+    
+    def _write_xlsx(self):
+        """追記した行をopenpyxlの書き込み専用モードでxlsxに変換する（save_to_excelと同じくB2セルから開始）"""
+        from openpyxl import Workbook
+        
+        # 列は指定の並びの後に、途中で現れた項目を出現順に追加する（DataFrameと同じ）
+        columns = [name for name in self.columns if name not in LIST_COLUMNS]
+        # リストの列はExcelに書き込めないため除く（save_to_excelと同じ）
+        known = set(columns) | set(LIST_COLUMNS)
+        with open(self.partial_path, encoding="utf-8") as f:
+            for line in f:
+                for key in json.loads(line):
+                    if key not in known:
+                        known.add(key)
+                        columns.append(key)
+        
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("求人情報")
+        sheet.append([])
+        sheet.append([None] + columns)
+        with open(self.partial_path, encoding="utf-8") as f:
+            for line in f:
+                job_data = json.loads(line)
+                sheet.append([None] + [job_data.get(column) for column in columns])
+        workbook.save(self.path)
+
+
+class RunMetrics:
+    """
+    1回の実行の計測値（WebDriverコマンドの種類ごとの回数・所要時間、処理段階ごとの所要時間）
+    
+    並列モードのワーカーとも共有するため、記録はロックで保護する。
+    """
+    
+    # 処理段階（summary・Prometheus出力の並び順）
+    STAGES = (
+        "list_load", "scroll", "card_extraction", "detail_navigation",
+        "field_extraction", "company_navigation", "company_fetch", "postprocess", "export",
+    )
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = threading.local()
+        self.started_at = datetime.datetime.now()
+        self._started = time.monotonic()
+        self.command_counts = Counter()
+        self.command_seconds = defaultdict(float)
+        self.stage_seconds = defaultdict(list)
+        self.page_bytes = []
+        self.unmeasured_resources = 0
+        self.queues = defaultdict(lambda: {"depths": [], "put_seconds": 0.0, "get_seconds": 0.0})
+        self.jobs = 0
+    
+    def instrument_driver(self, driver):
+        """
+        WebDriverの全コマンド（要素の操作を含む）が通るdriver.executeをラップして計測する
+        
+        Args:
+            driver (webdriver.Chrome): 計測するWebDriver
+        """
+        execute = getattr(driver, "execute", None)
+        if execute is None:
+            return
+        
+        def timed_execute(driver_command, params=None):
+            started = time.monotonic()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.record_command(driver_command, time.monotonic() - started)
+        
+        driver.execute = timed_execute
+    
+    def record_command(self, command, seconds):
+        """WebDriverコマンド1回の所要時間を記録する"""
+        with self._lock:
+            self.command_counts[command] += 1
+            self.command_seconds[command] += seconds
+    
+    def record_stage(self, stage, seconds):
+        """処理段階1回の所要時間を記録する"""
+        with self._lock:
+            self.stage_seconds[stage].append(seconds)
+    
+    def record_page_bytes(self, transferred, unmeasured=0):
+        """
+        1ページで転送したバイト数を記録する
+        
+        Args:
+            transferred (int): Resource Timingから求めた転送バイト数（別オリジンのリソースを含まない場合がある下限）
+            unmeasured (int): サイズを取得できなかった別オリジンのリソース数
+        """
+        with self._lock:
+            self.page_bytes.append(transferred)
+            self.unmeasured_resources += unmeasured
+    
+    def record_queue(self, name, depth=None, put_seconds=0.0, get_seconds=0.0):
+        """
+        パイプラインの処理段階の間のキューの深さと、キューで待機した時間を記録する
+        
+        Args:
+            name (str): キューの名前（取り出す側の処理段階）
+            depth (int): 追加した直後のキューの長さ（省略時は記録しない）
+            put_seconds (float): キューが満杯で追加を待った時間（取り出す側が遅い）
+            get_seconds (float): キューが空で取り出しを待った時間（追加する側が遅い）
+        """
+        with self._lock:
+            stats = self.queues[name]
+            if depth is not None:
+                stats["depths"].append(depth)
+            stats["put_seconds"] += put_seconds
+            stats["get_seconds"] += get_seconds
+    
+    def record_job(self):
+        """取得した求人数を数える"""
+        with self._lock:
+            self.jobs += 1
+    
+    @contextmanager
+    def stage(self, stage):
+        """
+        withブロックの所要時間を処理段階として記録する（同じスレッドで同じ段階が入れ子になった場合は外側のみ記録）
+        
+        Args:
+            stage (str): 処理段階の名前
+        """
+        active = getattr(self._active, "stages", None)
+        if active is None:
+            active = self._active.stages = set()
+        if stage in active:
+            yield
+            return
+        active.add(stage)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            active.discard(stage)
+            self.record_stage(stage, time.monotonic() - started)
+    
+    @staticmethod
+    def _percentile(values, ratio):
+        """最近傍順位法によるパーセンタイル"""
+        ordered = sorted(values)
+        return ordered[max(0, min(len(ordered) - 1, int(ratio * len(ordered) + 0.5) - 1))]
+    
+    def summary(self, page_loads=None):
+        """
+        計測結果を辞書にまとめる
+        
+        Args:
+            page_loads (int): ページ読み込み回数（GreenScraper.page_load_count）
+            
+        Returns:
+            dict: JSONに変換できる計測結果
+        """
+        with self._lock:
+            total_commands = sum(self.command_counts.values())
+            stage_names = [name for name in self.STAGES if name in self.stage_seconds]
+            stage_names += sorted(name for name in self.stage_seconds if name not in self.STAGES)
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "elapsed_seconds": round(time.monotonic() - self._started, 3),
+                "jobs": self.jobs,
+                "page_loads": page_loads,
+                "driver_commands": {
+                    "total": total_commands,
+                    "per_job": round(total_commands / self.jobs, 1) if self.jobs else None,
+                    "by_command": {
+                        command: {
+                            "count": count,
+                            "seconds": round(self.command_seconds[command], 3),
+                            "avg_ms": round(self.command_seconds[command] / count * 1000, 2),
+                        }
+                        for command, count in self.command_counts.most_common()
+                    },
+                },
+                "stages": {
+                    name: {
+                        "count": len(self.stage_seconds[name]),
+                        "seconds": round(sum(self.stage_seconds[name]), 3),
+                        "p50_ms": round(self._percentile(self.stage_seconds[name], 0.50) * 1000, 2),
+                        "p95_ms": round(self._percentile(self.stage_seconds[name], 0.95) * 1000, 2),
+                        "max_ms": round(max(self.stage_seconds[name]) * 1000, 2),
+                    }
+                    for name in stage_names
+                },
+                "page_bytes": {
+                    "pages": len(self.page_bytes),
+                    "total": sum(self.page_bytes),
+                    "avg": round(sum(self.page_bytes) / len(self.page_bytes)),
+                    "p50": self._percentile(self.page_bytes, 0.50),
+                    "p95": self._percentile(self.page_bytes, 0.95),
+                    # 転送バイト数に含まれていないリソース数（0でなければ各値は実際の転送量より少ない）
+                    "unmeasured_resources": self.unmeasured_resources,
+                } if self.page_bytes else None,
+                "queues": {
+                    name: {
+                        "samples": len(stats["depths"]),
+                        "avg_depth": round(sum(stats["depths"]) / len(stats["depths"]), 2) if stats["depths"] else 0,
+                        "p95_depth": self._percentile(stats["depths"], 0.95) if stats["depths"] else 0,
+                        "max_depth": max(stats["depths"], default=0),
+                        "put_wait_seconds": round(stats["put_seconds"], 3),
+                        "get_wait_seconds": round(stats["get_seconds"], 3),
+                    }
+                    for name, stats in self.queues.items()
+                } or None,
+            }
+    
+    def write_json(self, path, page_loads=None):
+        """計測結果をJSONファイルに書き出す"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(page_loads), f, ensure_ascii=False, indent=2)
+    
+    def write_prometheus(self, path, page_loads=None):
+        """
+        計測結果をPrometheusのテキスト形式で書き出す（node_exporterのtextfileコレクター向けに一時ファイルから置き換える）
+        
+        Args:
+            path (str): 出力先のファイル（*.prom）
+            page_loads (int): ページ読み込み回数
+        """
+        summary = self.summary(page_loads)
+        lines = []
+        
+        def metric(name, metric_type, help_text, samples):
+            lines.append(f"# HELP green_scraper_{name} {help_text}")
+            lines.append(f"# TYPE green_scraper_{name} {metric_type}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{label}"' for key, label in labels.items())
+                lines.append(f"green_scraper_{name}{{{label_text}}} {value}" if label_text else f"green_scraper_{name} {value}")
+        
+        commands = summary["driver_commands"]["by_command"]
+        stages = summary["stages"]
+        metric("jobs_total", "counter", "Jobs scraped in the last run.", [({}, summary["jobs"])])
+        metric("page_loads_total", "counter", "Pages loaded in the last run.", [({}, summary["page_loads"] or 0)])
+        metric("run_seconds", "gauge", "Wall-clock duration of the last run.", [({}, summary["elapsed_seconds"])])
+        if summary["page_bytes"]:
+            metric("page_bytes_total", "counter",
+                   "Bytes transferred by the measured pages (lower bound: cross-origin resources without "
+                   "Timing-Allow-Origin report 0).",
+                   [({}, summary["page_bytes"]["total"])])
+            metric("page_unmeasured_resources_total", "counter",
+                   "Cross-origin resources whose size was not exposed to Resource Timing.",
+                   [({}, summary["page_bytes"]["unmeasured_resources"])])
+            metric("measured_pages_total", "counter", "Pages whose transferred bytes were measured.",
+                   [({}, summary["page_bytes"]["pages"])])
+        metric("driver_commands_total", "counter", "WebDriver commands by command type.",
+               [({"command": name}, stats["count"]) for name, stats in commands.items()])
+        metric("driver_command_seconds_total", "counter", "Time spent in WebDriver commands by command type.",
+               [({"command": name}, stats["seconds"]) for name, stats in commands.items()])
+        metric("stage_calls_total", "counter", "Executions of each scraping stage.",
+               [({"stage": name}, stats["count"]) for name, stats in stages.items()])
+        metric("stage_seconds_total", "counter", "Time spent in each scraping stage.",
+               [({"stage": name}, stats["seconds"]) for name, stats in stages.items()])
+        if summary["queues"]:
+            queues = summary["queues"]
+            metric("queue_depth_avg", "gauge", "Average depth of each pipeline queue.",
+                   [({"queue": name}, stats["avg_depth"]) for name, stats in queues.items()])
+            metric("queue_depth_max", "gauge", "Maximum depth of each pipeline queue.",
+                   [({"queue": name}, stats["max_depth"]) for name, stats in queues.items()])
+            metric("queue_put_wait_seconds_total", "counter", "Time producers waited on a full pipeline queue.",
+                   [({"queue": name}, stats["put_wait_seconds"]) for name, stats in queues.items()])
+            metric("queue_get_wait_seconds_total", "counter", "Time consumers waited on an empty pipeline queue.",
+                   [({"queue": name}, stats["get_wait_seconds"]) for name, stats in queues.items()])
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+class StageQueue:
+    """
+    パイプラインの処理段階の間の上限付きキュー（深さと待ち時間をRunMetricsに記録する）
+    
+    追加側の待ち時間が長ければ取り出す側の処理段階が、取り出し側の待ち時間が長ければ追加する側の処理段階がボトルネック。
+    """
+    
+    # 処理の終了を伝える値
+    DONE = object()
+    
+    def __init__(self, name, maxsize, metrics):
+        """
+        Args:
+            name (str): キューの名前（取り出す側の処理段階）
+            maxsize (int): キューの長さの上限
+            metrics (RunMetrics): 計測値の記録先
+        """
+        self.name = name
+        self.metrics = metrics
+        self._queue = queue.Queue(maxsize=max(1, maxsize))
+    
+    def put(self, item):
+        """項目を追加する（満杯の場合は空くまで待つ）"""
+        started = time.monotonic()
+        self._queue.put(item)
+        self.metrics.record_queue(self.name, depth=self._queue.qsize(), put_seconds=time.monotonic() - started)
+    
+    def get(self):
+        """項目を取り出す（空の場合は追加されるまで待つ）"""
+        started = time.monotonic()
+        item = self._queue.get()
+        self.metrics.record_queue(self.name, get_seconds=time.monotonic() - started)
+        return item
+
+
+class TokenBucket:
+    """ホストごとのリクエスト送信を一定の速度（回/秒）に抑えるトークンバケット"""
+    
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate (float): 1秒あたりに補充するトークン数（=許可するリクエスト数）
+            capacity (float): 貯められるトークンの上限（省略時はrateと同じ、最低1）
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """トークンを1つ取得する（不足している場合は補充されるまで待機）"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HttpFetchEngine:
+    """ログイン済みブラウザのCookieを引き継ぎ、ページをブラウザなしでHTTP取得するエンジン"""
+    
+    def __init__(self, cookies=None, user_agent=None, timeout=10, pool_size=10):
+        """
+        Args:
+            cookies (list): driver.get_cookies()形式のCookieのリスト
+            user_agent (str): リクエストに付与するUser-Agent
+            timeout (float): リクエストのタイムアウト（秒）
+            pool_size (int): ホストごとに保持するKeep-Alive接続数
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        for cookie in cookies or []:
+            # "localhost"のようにドットを含まないドメインはホスト限定Cookieとして扱う
+            domain = cookie.get("domain") or ""
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=domain if "." in domain else "",
+                path=cookie.get("path", "/")
+            )
+    
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """WebDriverのCookieとUser-Agentを引き継いだエンジンを作成する"""
+        user_agent = driver.execute_script("return navigator.userAgent")
+        return cls(cookies=driver.get_cookies(), user_agent=user_agent, **kwargs)
+    
+    def fetch(self, url):
+        """
+        ページを取得する
+        
+        Args:
+            url (str): 取得するURL
+            
+        Returns:
+            str: HTML文字列（取得できない・ログインページへ転送された場合はNone）
+        """
+        return self.response_html(self.get(url), url)
+    
+    def get(self, url):
+        """
+        GETリクエストを送信する
+        
+        Args:
+            url (str): 取得するURL
+            
+        Returns:
+            requests.Response: レスポンス（通信エラーの場合はNone）
+        """
+        try:
+            return self.session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"HTTP取得中にエラー: {url}: {str(e)}")
+            return None
+    
+    def response_html(self, response, url):
+        """
+        レスポンスを検証してHTML文字列を取り出す
+        
+        Args:
+            response (requests.Response): getの戻り値
+            url (str): リクエストしたURL（ログ用）
+            
+        Returns:
+            str: HTML文字列（取得できない・ログインページへ転送された場合はNone）
+        """
+        if response is None:
+            return None
+        if response.status_code != 200:
+            logger.warning(f"HTTP取得失敗: {url}: ステータスコード {response.status_code}")
+            return None
+        if urlparse(response.url).path.startswith("/login"):
+            logger.warning(f"ログインページへ転送されました（Cookieが無効）: {url}")
+            return None
+        # charset指定がない場合、requestsはISO-8859-1と見なすためUTF-8を明示する
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            response.encoding = "utf-8"
+        return response.text
+    
+    def close(self):
+        """セッションを閉じる"""
+        self.session.close()
+
+
+def install_chromedriver():
+    """
+    webdriver-managerでChromeのバージョンに合ったChromeDriverを取得し、実行ファイルのパスを返す
+    
+    Returns:
+        str: ChromeDriverの実行ファイルのパス
+    """
+    # webdriver-managerはドライバーの取得が必要な場合だけ読み込む
+    from webdriver_manager.chrome import ChromeDriverManager
+    
+    # ChromeDriverManager.install() がフォルダを返す場合に対応
+    driver_path = ChromeDriverManager().install()
+    logger.info(f"ChromeDriverManagerが検出したパス: {driver_path}")
+    
+    # パスがTHIRD_PARTY_NOTICESを含む場合、親ディレクトリを検索
+    if "THIRD_PARTY_NOTICES" in driver_path:
+        driver_dir = os.path.dirname(driver_path)
+        logger.info(f"検索するディレクトリ: {driver_dir}")
+        
+        # ディレクトリ内でchromedriver.exeを検索
+        for root, dirs, files in os.walk(driver_dir):
+            for file in files:
+                if file.endswith("chromedriver.exe"):
+                    driver_path = os.path.join(root, file)
+                    logger.info(f"見つかったchromedriver.exe: {driver_path}")
+                    break
+            if "chromedriver.exe" in files:
+                break
+    
+    # パスが/を含む場合、Windowsの\に変換
+    return driver_path.replace("/", "\\")
+
+
+class DriverCache:
+    """
+    解決済みのChromeDriverのパスとバージョンを保存するJSONファイル
+    
+    有効期限内で実行ファイルが存在する場合はwebdriver-managerを呼び出さずに同じパスを使う。
+    起動したChromeとChromeDriverのメジャーバージョンが異なる場合は無効にし、次回は取得し直す。
+    """
+    
+    def __init__(self, path, ttl_hours=24):
+        """
+        Args:
+            path (str): 保存先のJSONファイルのパス
+            ttl_hours (float): 保存したパスを使用する期間（時間）
+        """
+        self.path = path
+        self.ttl = ttl_hours * 3600
+    
+    def load(self):
+        """
+        保存済みのChromeDriverのパスを読み込む
+        
+        Returns:
+            str: ChromeDriverのパス（ない・期限切れ・実行ファイルがない場合はNone）
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("resolved_at", 0) > self.ttl:
+            logger.info("ChromeDriverのキャッシュの有効期限が切れています")
+            return None
+        driver_path = entry.get("driver_path")
+        if not driver_path or not os.path.exists(driver_path):
+            return None
+        return driver_path
+    
+    def resolve(self, force=False):
+        """
+        ChromeDriverのパスを返す（キャッシュがない・forceの場合はwebdriver-managerで取得して保存する）
+        
+        Args:
+            force (bool): Trueならキャッシュを使わずに取得し直す
+            
+        Returns:
+            tuple: (ChromeDriverのパス, キャッシュから取得した場合はTrue)
+        """
+        if not force:
+            driver_path = self.load()
+            if driver_path:
+                logger.info(f"キャッシュしたChromeDriverを使用します: {driver_path}")
+                return driver_path, True
+        started = time.monotonic()
+        driver_path = install_chromedriver()
+        logger.info(f"ChromeDriverを取得しました（{time.monotonic() - started:.2f}秒）")
+        self._write({"driver_path": driver_path, "resolved_at": time.time()})
+        return driver_path, False
+    
+    def record_versions(self, driver):
+        """
+        起動したChromeとChromeDriverのバージョンを記録する（メジャーバージョンが異なる場合はキャッシュを無効にする）
+        
+        Args:
+            driver (webdriver.Chrome): 起動したWebDriver
+        """
+        capabilities = getattr(driver, "capabilities", None) or {}
+        browser_version = capabilities.get("browserVersion", "")
+        driver_version = (capabilities.get("chrome") or {}).get("chromedriverVersion", "").split(" ")[0]
+        if not browser_version or not driver_version:
+            return
+        if browser_version.split(".")[0] != driver_version.split(".")[0]:
+            logger.warning(f"ChromeとChromeDriverのバージョンが異なります（{browser_version} / {driver_version}）。"
+                           "次回の起動時にChromeDriverを取得し直します")
+            self.clear()
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return
+        if entry.get("browser_version") != browser_version:
+            entry.update(browser_version=browser_version, driver_version=driver_version)
+            self._write(entry)
+    
+    def _write(self, entry):
+        """一時ファイルに書き込んでから置き換える"""
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"ChromeDriverのキャッシュを保存できませんでした: {str(e)}")
+    
+    def clear(self):
+        """保存済みのパスを削除する"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def is_driver_version_error(error):
+    """セッション作成時のエラーがChromeとChromeDriverのバージョン不一致によるものか判定する"""
+    message = str(error)
+    return "only supports Chrome version" in message or ("session not created" in message and "version" in message)
+
+
+# 軽量読み込み（config.LEAN_LOAD）で読み込まないURLのパターン（画像・動画・音声・Webフォント・解析/広告タグ）
+LEAN_BLOCKED_URL_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*googleadservices.com*", "*facebook.net*", "*connect.facebook.com*", "*analytics.twitter.com*",
+    "*ads-twitter.com*", "*hotjar.com*", "*clarity.ms*", "*bat.bing.com*", "*criteo.com*", "*criteo.net*",
+    "*yimg.jp/images/listing*", "*nr-data.net*",
+)
+
+# 現在のページで転送したバイト数（ページ本体と読み込んだリソースのtransferSizeの合計）とリソース数を返すスクリプト
+# ※Resource Timingは、Timing-Allow-Originヘッダーのない別オリジンのリソースのサイズを0として返すため、
+#   合計は実際の転送量の下限になる。サイズを取得できなかった別オリジンのリソース数をunmeasuredとして返す
+PAGE_BYTES_SCRIPT = """
+var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+var total = 0;
+var unmeasured = 0;
+for (var i = 0; i < entries.length; i++) {
+    var entry = entries[i];
+    total += entry.transferSize || 0;
+    if (!entry.transferSize && !entry.decodedBodySize && entry.name.indexOf(window.location.origin + '/') !== 0) {
+        unmeasured++;
+    }
+}
+return {url: window.location.href, bytes: total, resources: entries.length, unmeasured: unmeasured};
+"""
+
+
+def lean_load_enabled():
+    """config.LEAN_LOADが有効か"""
+    return getattr(config, 'LEAN_LOAD', False) if HAS_CONFIG else False
+
+
+def structured_extraction_enabled():
+    """config.EXTRACTION_MODEが"structured"（__NEXT_DATA__・APIのJSONから抽出）か"""
+    return (getattr(config, 'EXTRACTION_MODE', "dom") if HAS_CONFIG else "dom") == "structured"
+
+
+# 保存したlocalStorageを、対象サイトのページを開く前に書き戻すスクリプト（引数のJSONは {オリジン: {キー: 値}}）
+LOCAL_STORAGE_RESTORE_SCRIPT = """
+(function(saved) {
+    var items = saved[window.location.origin];
+    if (!items) { return; }
+    try {
+        Object.keys(items).forEach(function(key) {
+            if (window.localStorage.getItem(key) === null) { window.localStorage.setItem(key, items[key]); }
+        });
+    } catch (e) {}
+})(%s);
+"""
+
+
+class SessionStore:
+    """
+    ログイン済みのセッション（Cookie・localStorage・User-Agent）を保存するJSONファイル
+    
+    ログイン情報と同等に扱う必要があるため、ファイルは所有者のみ読み書きできる権限で作成する。
+    """
+    
+    def __init__(self, path, max_age_hours=168):
+        """
+        Args:
+            path (str): 保存先のJSONファイルのパス
+            max_age_hours (float): 保存から使用しなくなるまでの時間（Cookieの有効期限とは別に、古いセッションを使わない）
+        """
+        self.path = path
+        self.max_age = max_age_hours * 3600
+    
+    def load(self):
+        """
+        保存済みのセッションを読み込む
+        
+        Returns:
+            dict: cookies / local_storage / user_agent / saved_at（ない・期限切れ・読み込めない場合はNone）
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                session = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"保存済みセッションを読み込めませんでした: {str(e)}")
+            return None
+        if time.time() - session.get("saved_at", 0) > self.max_age:
+            logger.info("保存済みセッションの有効期限が切れています")
+            return None
+        # 有効期限を過ぎたCookieは復元しない
+        now = time.time()
+        session["cookies"] = [
+            cookie for cookie in session.get("cookies", [])
+            if not cookie.get("expiry") or cookie["expiry"] > now
+        ]
+        return session if session["cookies"] else None
+    
+    def save(self, cookies, local_storage, user_agent):
+        """
+        セッションを保存する（一時ファイルに書き込んでから置き換える）
+        
+        Args:
+            cookies (list): driver.get_cookies()形式のCookieのリスト
+            local_storage (dict): オリジンをキー、localStorageの内容を値とする辞書
+            user_agent (str): ログインしたブラウザのUser-Agent
+        """
+        session = {
+            "cookies": cookies,
+            "local_storage": local_storage,
+            "user_agent": user_agent,
+            "saved_at": time.time(),
+        }
+        temp_path = f"{self.path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(session, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+    
+    def clear(self):
+        """保存済みのセッションを削除する"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class GreenScraper:
+    """Green Japanのスクレイピングを行うクラス"""
+    
+    def __init__(self, driver=None, base_url=None, metrics=None):
+        """
+        初期化メソッド - WebDriverの設定とURLの定義
+        
+        Args:
+            driver (webdriver.Chrome): 使用するWebDriver（省略時は新規に起動）
+            base_url (str): 対象サイトのURL（省略時はconfig.BASE_URLまたは本番サイト）
+            metrics (RunMetrics): 計測値の記録先（ワーカーには親の記録先を共有する、省略時は新規に作成）
+        """
+        if base_url is None:
+            base_url = getattr(config, 'BASE_URL', None) if HAS_CONFIG else None
+        self.base_url = (base_url or "https://www.green-japan.com").rstrip("/")
+        self.login_url = f"{self.base_url}/login"
+        self.favorites_url = f"{self.base_url}/favorites/sent"
+        
+        # driver属性を明示的に初期化
+        self.driver = None
+        
+        # ラベル→値のスナップショット（get_field_value用の索引）
+        self.use_field_snapshot = getattr(config, 'USE_FIELD_SNAPSHOT', True) if HAS_CONFIG else True
+        self._field_snapshot = None
+        self._field_cache = {}
+        
+        # ページ読み込み回数（求人ごとの読み込み回数をログで確認するため）
+        self.page_load_count = 0
+        
+        # お気に入り一覧APIのレスポンス記録スクリプトを登録済みかどうか
+        self._api_capture_installed = False
+        
+        # お気に入り一覧から取得した求人カードの情報（URLをキーとする）
+        self.favorite_cards = OrderedDict()
+        
+        # 詳細ページ・会社情報ページの取得方法（"selenium" または "http"）
+        self.fetch_backend = getattr(config, 'FETCH_BACKEND', "selenium") if HAS_CONFIG else "selenium"
+        if self.fetch_backend == "http" and not HAS_LXML:
+            logger.warning("lxmlがインストールされていないため、HTTPエンジンを無効化します")
+            self.fetch_backend = "selenium"
+        self.http_engine = None
+        
+        # 詳細項目の抽出方法（"dom": 画面の要素から取得、"structured": __NEXT_DATA__・APIのJSONから取得し、なければ画面の要素）
+        self.extraction_mode = "structured" if structured_extraction_enabled() else "dom"
+        
+        # ログイン済みセッションの保存先（次回の実行でログイン処理を省略する）
+        self.session_store = None
+        if driver is None and (getattr(config, 'REUSE_SESSION', True) if HAS_CONFIG else True):
+            session_path = getattr(config, 'SESSION_PATH', "session.json") if HAS_CONFIG else "session.json"
+            max_age_hours = getattr(config, 'SESSION_MAX_AGE_HOURS', 168) if HAS_CONFIG else 168
+            self.session_store = SessionStore(session_path, max_age_hours=max_age_hours)
+        
+        # WebDriverコマンド・処理段階ごとの計測値
+        self.metrics = metrics if metrics is not None else RunMetrics()
+        self.metrics_enabled = getattr(config, 'METRICS_ENABLED', True) if HAS_CONFIG else True
+        
+        # 会社情報のキャッシュ（ワーカーには親のキャッシュを共有する）
+        self.company_cache = None
+        self.owns_company_cache = False
+        if driver is None and (getattr(config, 'USE_COMPANY_CACHE', True) if HAS_CONFIG else True):
+            cache_path = getattr(config, 'COMPANY_CACHE_PATH', "company_cache.db") if HAS_CONFIG else "company_cache.db"
+            ttl_hours = getattr(config, 'COMPANY_CACHE_TTL_HOURS', 168) if HAS_CONFIG else 168
+            self.company_cache = CompanyCache(cache_path, ttl_hours=ttl_hours)
+            self.owns_company_cache = True
+        
+        # 完了した求人のチェックポイント（scrape_favoritesの開始時に作成）
+        self.checkpoint = None
+        
+        # 取得のたびに1件ずつ追記する出力ファイル（config.STREAMING_EXPORTが有効な場合にscrape_favoritesの開始時に作成）
+        self.export_sink = None
+        self.export_path = None
+        self.columnar_path = None
+        
+        # スクレイピング済み求人の保存先（増分取得に使用）
+        self.job_store = None
+        if driver is None and (getattr(config, 'USE_JOB_STORE', True) if HAS_CONFIG else True):
+            store_path = getattr(config, 'JOB_STORE_PATH', "job_store.db") if HAS_CONFIG else "job_store.db"
+            self.job_store = JobStore(store_path)
+        
+        # 取得したページのアーカイブ（ワーカーには親のアーカイブを共有する、output_dirの作成後に開く）
+        self.page_archive = None
+        self.owns_page_archive = False
+        
+        # WebDriverの初期化（ワーカー用に生成済みのドライバーが渡された場合はそれを使用）
+        self.driver_path = None
+        if driver is not None:
+            self.driver = driver
+            self.using_profile = False
+        else:
+            self._create_driver()
+
+        # ドライバーの初期化確認
+        if self.driver is None:
+            logger.error("WebDriverの初期化に失敗しました")
+            raise Exception("WebDriverの初期化に失敗しました")
+        if self.metrics_enabled:
+            self.metrics.instrument_driver(self.driver)
+        
+        # 軽量読み込み（画像・フォント・解析タグを遮断）と、ページごとの転送バイト数の計測
+        self.lean_load = False
+        if lean_load_enabled():
+            self.enable_lean_load()
+        self.measure_page_bytes = getattr(config, 'PAGE_BYTES_METRICS', False) if HAS_CONFIG else False
+            
+        # タイムアウト時間を延長（30秒）
+        self.wait = WebDriverWait(self.driver, getattr(config, 'WAIT_TIMEOUT', 30) if HAS_CONFIG else 30)
+        
+        # 固定時間のsleepの代わりに条件が満たされるまで待機する際のタイムアウト（秒）
+        self.page_wait_timeout = getattr(config, 'PAGE_WAIT_TIMEOUT', 10) if HAS_CONFIG else 10
+        self.login_wait_timeout = getattr(config, 'LOGIN_WAIT_TIMEOUT', 60) if HAS_CONFIG else 60
+        
+        # データ保存用のディレクトリ作成
+        today = datetime.datetime.now().strftime("%Y%m%d")
+        self.output_dir = f"output_{today}"
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        
+        if driver is None and (getattr(config, 'ARCHIVE_PAGES', False) if HAS_CONFIG else False):
+            archive_dir = getattr(config, 'PAGE_ARCHIVE_DIR', "") if HAS_CONFIG else ""
+            self.page_archive = PageArchive(archive_dir or os.path.join(self.output_dir, "archive"))
+            self.owns_page_archive = True
+    
+    @staticmethod
+    def _apply_common_chrome_options(options, lean=None, structured=None):
+        """
+        メイン・ワーカー共通のChrome設定を追加する
+        
+        Args:
+            options (Options): 設定を追加するChromeオプション
+            lean (bool): 軽量読み込み（画像を読み込まず、DOM構築完了で遷移を終える）にするか（省略時はconfig.LEAN_LOAD）
+            structured (bool): APIのJSONレスポンスを記録するか（省略時はconfig.EXTRACTION_MODEが"structured"の場合）
+        """
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        # この設定でGoogleログインのセッション維持を改善
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        if lean is None:
+            lean = lean_load_enabled()
+        if lean:
+            # 読み取るのはテキストのみのため、画像は読み込まず、driver.getはDOM構築の完了で戻る
+            # （必要な要素の描画はwait_for_page_readyで待機する。フォント・解析タグはenable_lean_loadで遮断）
+            options.page_load_strategy = "eager"
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if structured is None:
+            structured = structured_extraction_enabled()
+        if structured:
+            # DevToolsのNetworkイベント（responseReceived）をパフォーマンスログで受け取る
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def _create_driver(self):
+        """Chromeオプションを設定してWebDriverを起動する"""
+        # Chromeオプションの設定
+        self.chrome_options = Options()
+        
+        # config.pyからヘッドレスモード設定を読み込む
+        if HAS_CONFIG and hasattr(config, 'HEADLESS_MODE') and config.HEADLESS_MODE:
+            self.chrome_options.add_argument("--headless")
+            logger.info("ヘッドレスモードが有効化されました")
+        
+        # Chromeプロファイルの設定
+        self.using_profile = False
+        if HAS_CONFIG and hasattr(config, 'USE_CHROME_PROFILE') and config.USE_CHROME_PROFILE:
+            if hasattr(config, 'CHROME_PROFILE_PATH') and config.CHROME_PROFILE_PATH:
+                profile_path = config.CHROME_PROFILE_PATH
+                profile_name = "Default"
+                if hasattr(config, 'CHROME_PROFILE_NAME') and config.CHROME_PROFILE_NAME:
+                    profile_name = config.CHROME_PROFILE_NAME
+                
+                # プロファイルパスの設定
+                user_data_dir = profile_path
+                self.chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+                self.chrome_options.add_argument(f"--profile-directory={profile_name}")
+                logger.info(f"Chromeプロファイルを使用: {user_data_dir}\\{profile_name}")
+                self.using_profile = True
+        
+        # 共通のChrome設定
+        self._apply_common_chrome_options(self.chrome_options)
+        
+        # WebDriverの初期化
+        try:
+            # 解決済みのChromeDriverはキャッシュし、起動のたびにwebdriver-managerでバージョンを確認しない
+            driver_cache = None
+            if getattr(config, 'USE_DRIVER_CACHE', True) if HAS_CONFIG else True:
+                cache_path = getattr(config, 'DRIVER_CACHE_PATH', "driver_cache.json") if HAS_CONFIG else "driver_cache.json"
+                ttl_hours = getattr(config, 'DRIVER_CACHE_TTL_HOURS', 24) if HAS_CONFIG else 24
+                driver_cache = DriverCache(cache_path, ttl_hours=ttl_hours)
+                driver_path, from_cache = driver_cache.resolve()
+            else:
+                driver_path, from_cache = install_chromedriver(), False
+            
+            logger.info(f"使用するドライバーパス: {driver_path}")
+            self.driver_path = driver_path
+            
+            try:
+                try:
+                    self.driver = webdriver.Chrome(
+                        service=Service(driver_path),
+                        options=self.chrome_options
+                    )
+                except WebDriverException as e:
+                    # Chromeの更新でキャッシュしたChromeDriverが使えなくなった場合は取得し直して1回だけ再試行
+                    if not (from_cache and is_driver_version_error(e)):
+                        raise
+                    logger.info("キャッシュしたChromeDriverがChromeのバージョンと一致しないため、取得し直します")
+                    driver_path, from_cache = driver_cache.resolve(force=True)
+                    self.driver_path = driver_path
+                    self.driver = webdriver.Chrome(
+                        service=Service(driver_path),
+                        options=self.chrome_options
+                    )
+                if driver_cache is not None:
+                    driver_cache.record_versions(self.driver)
+                # Selenium検出を回避するためのJavaScriptを実行
+                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            except WebDriverException as e:
+                error_msg = str(e)
+                # プロファイルが使用中の場合は、リモートデバッグ接続を試みる
+                if "user data directory is already in use" in error_msg and HAS_CONFIG and getattr(config, 'USE_CHROME_PROFILE', False):
+                    logger.info("プロファイルロック検出: リモートデバッグ接続を試みます")
+                    
+                    # リモートデバッグポート
+                    debug_port = getattr(config, 'REMOTE_DEBUGGING_PORT', 9222)
+                    
+                    # Chrome実行ファイルパスの取得（エラーメッセージ用）
+                    chrome_path = getattr(config, 'CHROME_EXECUTABLE_PATH', None)
+                    if not chrome_path or not os.path.exists(chrome_path):
+                        # 代替パスを試す
+                        for p in [r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+                                  r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"]:
+                            if os.path.exists(p):
+                                chrome_path = p
+                                break
+                    
+                    if not chrome_path:
+                        chrome_path = "chrome.exe"  # パスが見つからない場合は単にchrome.exeとする
+                    
+                    # プロファイル情報の取得（エラーメッセージ用）
+                    profile_path = getattr(config, 'CHROME_PROFILE_PATH', '')
+                    profile_name = getattr(config, 'CHROME_PROFILE_NAME', 'Default')
+                    
+                    # 日本語パスを含むプロファイルの場合のフォールバック
+                    if "ゆうと" in profile_path or any(ord(c) > 127 for c in profile_path):
+                        temp_profile_dir = r"C:\Temp_Chrome_Debug"
+                    else:
+                        # 元のプロファイルパスを使用
+                        temp_profile_dir = profile_path
+                    
+                    # まず既存のChromeへの接続を試みる
+                    try:
+                        # 既存の接続を確認
+                        try:
+                            logger.info(f"既存のChromeプロセスを確認中: http://127.0.0.1:{debug_port}/json")
+                            response = requests.get(f"http://127.0.0.1:{debug_port}/json", timeout=3)
+                            if response.status_code == 200:
+                                logger.info("既存のChromeプロセスに接続できます。新規ウィンドウは開きません。")
+                                
+                                # リモートデバッグ接続用のオプション
+                                fallback_options = Options()
+                                fallback_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
+                                
+                                # リモートデバッグ接続
+                                logger.info(f"既存Chromeへリモートデバッグ接続: 127.0.0.1:{debug_port}")
+                                self.driver = webdriver.Chrome(
+                                    service=Service(driver_path),
+                                    options=fallback_options
+                                )
+                                logger.info("既存Chromeへの接続に成功しました")
+                            else:
+                                logger.error(f"既存Chromeへの接続失敗: ステータスコード {response.status_code}")
+                                raise ConnectionError(f"既存Chromeへの接続に失敗しました。接続先: http://127.0.0.1:{debug_port}/json")
+                        except requests.exceptions.ConnectionError:
+                            # 自動でリモートデバッグ用Chromeを起動（共通オプションを追加）
+                            logger.info("既存のChromeリモートデバッグが有効ではありません。デバッグ用Chromeを自動起動します。")
+                            chrome_command = [
+                                chrome_path,
+                                f"--remote-debugging-port={debug_port}",
+                                f"--user-data-dir={temp_profile_dir}",
+                                f"--profile-directory={profile_name}",
+                                "--window-size=1920,1080",
+                                "--disable-gpu",
+                                "--no-sandbox",
+                                "--disable-dev-shm-usage",
+                                "--disable-blink-features=AutomationControlled",
+                                "--exclude-switches=enable-automation",
+                                "--disable-extensions",
+                                "--no-first-run",
+                                "--no-default-browser-check"
+                            ]
+                            logger.info(f"起動コマンド: {' '.join(chrome_command)}")
+                            subprocess.Popen(chrome_command)
+                            # デバッグポートが応答するまで待機
+                            self._wait_for_debug_port(debug_port)
+                            # 自動起動したChromeへの接続
+                            fallback_options = Options()
+                            fallback_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
+                            fallback_options.add_argument("--disable-dev-shm-usage")
+                            fallback_options.add_argument("--no-sandbox")
+                            self.driver = webdriver.Chrome(
+                                service=Service(driver_path),
+                                options=fallback_options
+                            )
+                            logger.info("自動起動したChromeへの接続に成功しました")
+                        except Exception as check_error:
+                            logger.error(f"既存Chrome確認中にエラー: {str(check_error)}")
+                            raise
+                        
+                    except Exception as connect_error:
+                        # エラーがConnectionErrorの場合はそのまま伝播させる（すでにメッセージを表示済み）
+                        if isinstance(connect_error, ConnectionError):
+                            raise
+                        
+                        # その他のエラーの場合は追加情報を表示
+                        logger.error(f"Chrome接続エラー: {str(connect_error)}")
+                        logger.error("自動的にChromeを起動せず、エラーで終了します。")
+                        raise
+                else:
+                    logger.error(f"ChromeDriverの初期化中にエラーが発生しました: {error_msg}")
+                    raise
+            
+        except Exception as e:
+            logger.error(f"ChromeDriverの初期化中にエラーが発生しました: {str(e)}")
+            raise
+
+    def _wait_for_debug_port(self, debug_port, timeout=30):
+        """
+        自動起動したChromeのリモートデバッグポートが応答するまで待機する
+        
+        Args:
+            debug_port (int): リモートデバッグポート
+            timeout (float): 最大待機時間（秒）
+        """
+        started = time.monotonic()
+        while time.monotonic() - started < timeout:
+            try:
+                if requests.get(f"http://127.0.0.1:{debug_port}/json", timeout=1).status_code == 200:
+                    logger.info(f"待機[デバッグポート応答]: {time.monotonic() - started:.2f}秒")
+                    return
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.2)
+        logger.warning(f"デバッグポートが{timeout}秒以内に応答しませんでした: {debug_port}")
+
+    def restore_session(self):
+        """
+        保存済みのセッションを1回のHTTPリクエストで検証し、有効ならブラウザに復元する
+        
+        Cookieは対象サイトのページを開かずにCDP（Network.setCookies）で設定し、
+        localStorageは次に開くページの読み込み前に書き戻す。CDPを使えない場合はトップページを開いて設定する。
+        
+        Returns:
+            bool: セッションを復元できた場合はTrue（ない・期限切れ・無効な場合はFalse）
+        """
+        if self.session_store is None:
+            return False
+        session = self.session_store.load()
+        if session is None:
+            return False
+        
+        started = time.monotonic()
+        timeout = getattr(config, 'HTTP_TIMEOUT', 10) if HAS_CONFIG else 10
+        engine = HttpFetchEngine(cookies=session["cookies"], user_agent=session.get("user_agent"), timeout=timeout)
+        if engine.fetch(self.favorites_url) is None:
+            engine.close()
+            logger.info("保存済みセッションが無効なため、ログイン処理を実行します")
+            self.session_store.clear()
+            return False
+        
+        try:
+            self._restore_browser_session(session["cookies"], session.get("local_storage") or {})
+        except Exception as e:
+            engine.close()
+            logger.warning(f"保存済みセッションをブラウザに復元できませんでした: {str(e)}")
+            return False
+        # 検証に使用したセッション（Keep-Alive接続）はHTTPエンジンとしてそのまま使う
+        if self.http_engine is None:
+            self.http_engine = engine
+        else:
+            engine.close()
+        logger.info(f"保存済みセッションを復元しました（{time.monotonic() - started:.2f}秒）")
+        return True
+
+    def _restore_browser_session(self, cookies, local_storage):
+        """CookieとlocalStorageをブラウザに設定する"""
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": [
+                {key: value for key, value in {
+                    "name": cookie["name"],
+                    "value": cookie["value"],
+                    "domain": cookie.get("domain"),
+                    "path": cookie.get("path", "/"),
+                    "secure": cookie.get("secure", False),
+                    "httpOnly": cookie.get("httpOnly", False),
+                    "sameSite": cookie.get("sameSite"),
+                    "expires": cookie.get("expiry"),
+                }.items() if value is not None}
+                for cookie in cookies
+            ]})
+            if local_storage:
+                self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                    "source": LOCAL_STORAGE_RESTORE_SCRIPT % json.dumps(local_storage, ensure_ascii=False)
+                })
+            return
+        # WebDriverのadd_cookieは同じドメインのページを開いている必要がある
+        self.load_page(self.base_url)
+        for cookie in cookies:
+            self.driver.add_cookie({key: value for key, value in cookie.items() if key != "sameSite"})
+        origin = f"{urlparse(self.base_url).scheme}://{urlparse(self.base_url).netloc}"
+        for key, value in (local_storage.get(origin) or {}).items():
+            self.driver.execute_script("window.localStorage.setItem(arguments[0], arguments[1]);", key, value)
+
+    def save_session(self):
+        """ログイン後のCookie・localStorage・User-Agentを保存する（次回の実行でrestore_sessionが使用）"""
+        if self.session_store is None:
+            return
+        try:
+            cookies = self.driver.get_cookies()
+            user_agent = self.driver.execute_script("return navigator.userAgent")
+            local_storage = {}
+            origin = self.driver.execute_script("return window.location.origin")
+            if origin and urlparse(origin).netloc == urlparse(self.base_url).netloc:
+                local_storage[origin] = self.driver.execute_script(
+                    "var items = {};"
+                    "for (var i = 0; i < window.localStorage.length; i++) {"
+                    "  var key = window.localStorage.key(i); items[key] = window.localStorage.getItem(key);"
+                    "}"
+                    "return items;"
+                )
+            self.session_store.save(cookies, local_storage, user_agent)
+            logger.info(f"ログイン済みセッションを保存しました: {self.session_store.path}")
+        except Exception as e:
+            logger.warning(f"ログイン済みセッションの保存中にエラーが発生しました: {str(e)}")
+
+    def login(self, use_google=False):
+        """
+        Green Japanにログインし、成功した場合はセッションを保存する
+        
+        Args:
+            use_google (bool): TrueならGoogleアカウントでログインする
+            
+        Returns:
+            bool: ログイン済み、またはログインに成功した場合はTrue
+        """
+        logged_in = self._login(use_google)
+        if logged_in:
+            self.save_session()
+        return logged_in
+
+    def _login(self, use_google=False):
+        """ログイン状態を確認し、未ログインならログイン処理を実行する"""
+        # ヘッダー要素でログイン状態を確認
+        self.driver.get(self.base_url)
+        self.wait_for_page_ready("トップページ")
+        try:
+            header_elem = self.driver.find_element(
+                By.CSS_SELECTOR,
+                "#js-react-header > header > div > nav > div.js-header-menu-target.mdl-navigation__link > div"
+            )
+            if "阪" in header_elem.text:
+                logger.info("ヘッダー要素に '阪' が含まれており、ログイン済みと判断します。")
+                return True
+        except Exception as e:
+            logger.debug(f"ヘッダー要素確認失敗: {str(e)}")
+        
+        # プロファイルを使用している場合は、ログイン済みの可能性が高いのでチェック
+        if self.using_profile:
+            logger.info("Chromeプロファイルを使用しているため、ログイン状態を確認します...")
+            # まずホームページを開く
+            self.driver.get(self.base_url)
+            self.wait_for_page_ready("トップページ")
+            
+            # マイページなどのリンクがあるかチェック
+            try:
+                my_page_link = self.driver.find_elements(By.XPATH, "//a[contains(@href, '/mypage')]")
+                if my_page_link:
+                    logger.info("すでにログインしています。ログイン処理をスキップします。")
+                    return True
+                
+                # 他のログイン済み要素の確認
+                logged_in_elements = self.driver.find_elements(By.CSS_SELECTOR, ".header-utility__login-status")
                 if logged_in_elements:
                     logger.info("すでにログインしています。ログイン処理をスキップします。")
                     return True
-                    
-                logger.info("ログインしていないようです。ログイン処理を実行します。")
+                    
+                logger.info("ログインしていないようです。ログイン処理を実行します。")
+            except Exception as e:
+                logger.warning(f"ログイン状態の確認中にエラー: {str(e)}")
+                logger.info("ログイン処理を実行します。")
+        
+        # 通常のログイン処理を実行
+        if use_google:
+            return self.login_with_google()
+        else:
+            # 既存のメールアドレスとパスワードでのログイン処理
+            return self.login_with_email_password()
+    
+    def login_with_google(self):
+        """Google アカウントでログインする"""
+        try:
+            logger.info("Google アカウントでログインを試みています...")
+            self.driver.get(self.login_url)
+            self.wait_for_page_ready("ログインページ")
+
+            # Google アカウントでログインボタンをクリック
+            logger.info("Googleログインボタンを探しています...")
+            
+            # より正確なセレクタを使用（CSSセレクタ）
+            try:
+                # CSSセレクタを使ってボタンを特定
+                google_login_button = self.wait.until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, "#content_cont > div.wrap640 > div > form > div > div.mt30 > a.social-login-button.google-button"))
+                )
+                logger.info("CSSセレクタでGoogleログインボタンを見つけました")
+            except Exception as e:
+                logger.warning(f"CSSセレクタでのボタン特定に失敗: {str(e)}")
+                # フォールバック: クラス名で検索
+                try:
+                    google_login_button = self.wait.until(
+                        EC.element_to_be_clickable((By.CSS_SELECTOR, "a.social-login-button.google-button"))
+                    )
+                    logger.info("クラス名でGoogleログインボタンを見つけました")
+                except Exception as e:
+                    logger.warning(f"クラス名でのボタン特定に失敗: {str(e)}")
+                    # 最後の手段: テキスト内容で検索
+                    google_login_button = self.wait.until(
+                        EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Google')]"))
+                    )
+                    logger.info("テキスト内容でGoogleログインボタンを見つけました")
+            
+            logger.info("Googleログインボタンをクリック...")
+            google_login_button.click()
+            # Googleの認証ページへのリダイレクト（または新しいウィンドウ）を待機
+            self.wait_for(
+                lambda driver: len(driver.window_handles) > 1 or "accounts.google.com" in driver.current_url,
+                "Google認証ページへのリダイレクト"
+            )
+
+            # 新しいウィンドウが開いたか確認
+            if len(self.driver.window_handles) > 1:
+                logger.info("新しいウィンドウに切り替えます...")
+                self.driver.switch_to.window(self.driver.window_handles[-1])
+            
+            # Googleのログインページに遷移
+            current_url = self.driver.current_url
+            logger.info(f"現在のURL: {current_url}")
+            
+            if "accounts.google.com" in current_url:
+                # Googleアカウントのメールアドレスを入力
+                logger.info("メールアドレス入力フィールドを待機しています...")
+                email_field = self.wait.until(
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, "input[type='email']"))
+                )
+                
+                # configファイルからGoogleメールアドレスを取得
+                email = ""
+                if HAS_CONFIG and hasattr(config, 'GOOGLE_EMAIL') and config.GOOGLE_EMAIL:
+                    email = config.GOOGLE_EMAIL
+                    logger.info("設定ファイルからGoogleメールアドレスを読み込みました")
+                
+                # 設定が無い場合はユーザー入力を求める
+                if not email:
+                    email = input("Googleアカウントのメールアドレスを入力してください: ")
+                
+                email_field.clear()
+                email_field.send_keys(email)
+                email_field.send_keys(Keys.RETURN)
+                
+                # パスワードを入力
+                logger.info("パスワード入力フィールドを待機しています...")
+                password_field = self.wait.until(
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, "input[type='password']"))
+                )
+                
+                # configファイルからGoogleパスワードを取得
+                password = ""
+                if HAS_CONFIG and hasattr(config, 'GOOGLE_PASSWORD') and config.GOOGLE_PASSWORD:
+                    password = config.GOOGLE_PASSWORD
+                    logger.info("設定ファイルからGoogleパスワードを読み込みました")
+                
+                # 設定が無い場合はユーザー入力を求める
+                if not password:
+                    password = getpass.getpass("Googleアカウントのパスワードを入力してください: ")
+                
+                password_field.clear()
+                password_field.send_keys(password)
+                password_field.send_keys(Keys.RETURN)
+                
+                # 認証が完了するまで待機
+                logger.info("認証が完了するまで待機しています...")
+                if self.wait_for(
+                    lambda driver: self.base_url in driver.current_url,
+                    "Google認証の完了",
+                    timeout=self.login_wait_timeout
+                ):
+                    logger.info("認証が完了し、Green Japanに戻りました")
+                    return True
+                
+                # タイムアウト
+                logger.error("認証のタイムアウトが発生しました")
+                return False
+            else:
+                logger.error(f"Googleアカウント認証ページに遷移できませんでした: {current_url}")
+                return False
+
+        except Exception as e:
+            logger.error(f"Google アカウントでのログイン中にエラーが発生しました: {str(e)}")
+            # エラー発生時にスクリーンショットを保存
+            try:
+                screenshot_path = os.path.join(self.output_dir, "error_screenshot.png")
+                self.driver.save_screenshot(screenshot_path)
+                logger.info(f"エラー時のスクリーンショットを保存しました: {screenshot_path}")
+            except:
+                pass
+            return False
+    
+    def login_with_email_password(self):
+        """
+        Green Japanにログインする
+        
+        Returns:
+            bool: ログイン成功ならTrue、失敗ならFalse
+        """
+        try:
+            logger.info("ログインページにアクセスしています...")
+            self.driver.get(self.login_url)
+            
+            # config.pyからログイン情報を読み込む
+            email = ""
+            password = ""
+            
+            if HAS_CONFIG and hasattr(config, 'EMAIL') and config.EMAIL:
+                email = config.EMAIL
+                
+            if HAS_CONFIG and hasattr(config, 'PASSWORD') and config.PASSWORD:
+                password = config.PASSWORD
+            
+            # メールアドレスとパスワードの入力を要求（未指定の場合）
+            if not email:
+                email = input("Green Japanのメールアドレスを入力してください: ")
+            if not password:
+                password = getpass.getpass("Green Japanのパスワードを入力してください: ")
+            
+            # メールアドレス入力
+            email_field = self.wait.until(EC.presence_of_element_located((By.ID, "user_email")))
+            email_field.clear()
+            email_field.send_keys(email)
+            
+            # パスワード入力
+            password_field = self.driver.find_element(By.ID, "user_password")
+            password_field.clear()
+            password_field.send_keys(password)
+            
+            # ログインボタンをクリック
+            login_button = self.driver.find_element(By.NAME, "commit")
+            login_button.click()
+            
+            # ログイン成功の確認
+            self.wait.until(lambda driver: self.base_url in driver.current_url)
+            logger.info("ログインに成功しました")
+            return True
+            
+        except Exception as e:
+            logger.error(f"ログイン中にエラーが発生しました: {str(e)}")
+            return False
+    
+    def scrape_favorites(self, max_retries=None, retry_delay=None, max_workers=None, incremental=None, resume=False,
+                         pipeline=None):
+        """
+        お気に入りページから求人情報をスクレイピングする
+        
+        Args:
+            max_retries (int): スクレイピング失敗時の最大リトライ回数
+            retry_delay (int): リトライまでの待機時間（秒）
+            max_workers (int): 詳細ページを並列取得するChromeセッション数（1なら逐次処理）
+            incremental (bool): Trueなら新規・一覧の内容が変わった求人のみ取得し、残りは保存済みデータを使う
+            resume (bool): Trueなら前回のチェックポイントを読み込み、完了済みの求人をスキップする
+            pipeline (bool): Trueならページの取得・項目の抽出・出力を別々のスレッドで並行して行う（逐次処理の場合のみ）
+            
+        Returns:
+            pd.DataFrame: スクレイピングしたデータのデータフレーム（STREAMING_EXPORTが有効な場合は空。データは出力ファイルに保存される）
+        """
+        # config.pyから設定を読み込む
+        if max_retries is None and HAS_CONFIG and hasattr(config, 'MAX_RETRIES'):
+            max_retries = config.MAX_RETRIES
+        elif max_retries is None:
+            max_retries = 2
+            
+        if retry_delay is None and HAS_CONFIG and hasattr(config, 'RETRY_DELAY'):
+            retry_delay = config.RETRY_DELAY
+        elif retry_delay is None:
+            retry_delay = 5
+        
+        if max_workers is None:
+            max_workers = getattr(config, 'MAX_WORKERS', 1) if HAS_CONFIG else 1
+        if pipeline is None:
+            pipeline = getattr(config, 'PIPELINE_MODE', False) if HAS_CONFIG else False
+        if pipeline and not HAS_LXML:
+            logger.warning("lxmlがインストールされていないため、パイプラインを無効化します")
+            pipeline = False
+        
+        # 完了した求人はチェックポイントに記録し、リトライ・再開時には取得し直さない
+        self.open_checkpoint(resume)
+        self.open_export()
+        retry_count = 0
+        favorites = None
+        
+        while retry_count <= max_retries:
+            try:
+                job_urls, job_salaries = self.collect_favorites()
+                job_urls, job_salaries, favorites = self.select_jobs_to_scrape(job_urls, job_salaries, incremental)
+                job_urls, job_salaries = self.checkpoint.pending(job_urls, job_salaries)
+                self.export_completed(favorites)
+                
+                # 並列モード：ワーカーのChromeセッションに求人URLを分配
+                if max_workers > 1 and len(job_urls) > 1:
+                    self.scrape_jobs_parallel(job_urls, job_salaries, max_workers)
+                    break
+                
+                # パイプライン：ページの取得中に前の求人の抽出・出力を行う
+                if pipeline and len(job_urls) > 1:
+                    self.scrape_jobs_pipeline(job_urls, job_salaries)
+                    break
+                
+                # URLごとに詳細ページにアクセスして情報を取得
+                for i, job_url in enumerate(job_urls):
+                    try:
+                        # ループ回数の制御
+                        # if i >= 4:
+                        #     break  
+                        logger.info(f"求人 {i+1}/{len(job_urls)} の情報を取得中...")
+                        loads_before = self.page_load_count
+                        job_salary = job_salaries[i] if i < len(job_salaries) else ""
+                        job_data = self.scrape_job(job_url, job_salary)
+                        
+                        self.complete_job(job_data)
+                        logger.info(f"求人 {i+1} のページ読み込み回数: {self.page_load_count - loads_before}")
+                        
+                    except Exception as e:
+                        logger.error(f"求人 {i+1} の処理中にエラーが発生しました: {str(e)}")
+                
+                # 全ての求人の処理が完了したらループを抜ける
+                break
+                
             except Exception as e:
-                logger.warning(f"ログイン状態の確認中にエラー: {str(e)}")
-                logger.info("ログイン処理を実行します。")
+                logger.error(f"スクレイピング中にエラーが発生しました: {str(e)}")
+                retry_count += 1
+                
+                if retry_count <= max_retries:
+                    logger.info(f"{retry_delay}秒後にリトライします ({retry_count}/{max_retries})...")
+                    time.sleep(retry_delay)
+                else:
+                    logger.error("最大リトライ回数に達しました。処理を終了します。")
+                    break
         
-        # 通常のログイン処理を実行
-        if use_google:
-            return self.login_with_google()
-        else:
-            # 既存のメールアドレスとパスワードでのログイン処理
-            return self.login_with_email_password()
+        # 保存済みデータと統合してDataFrameに変換
+        return self.finish_run(favorites)
+
+    def open_checkpoint(self, resume=False):
+        """
+        チェックポイントを開く
+        
+        Args:
+            resume (bool): Trueなら前回の記録を引き継ぐ、Falseなら記録を消して新規に開始
+            
+        Returns:
+            CheckpointJournal: チェックポイント
+        """
+        # 日付ごとの出力フォルダに置くと日付をまたいだ--resumeで前回の記録が見つからないため、
+        # 既定ではjob_store.dbと同じく実行をまたいで同じ場所を使用する
+        path = getattr(config, 'CHECKPOINT_PATH', None) if HAS_CONFIG else None
+        if not path:
+            path = "checkpoint.jsonl"
+        # 出力ファイルに1件ずつ書き込む場合は求人データをメモリ上に保持しない
+        streaming = getattr(config, 'STREAMING_EXPORT', False) if HAS_CONFIG else False
+        self.checkpoint = CheckpointJournal(path, resume=resume, keep_rows=not streaming)
+        return self.checkpoint
+
+    def open_export(self):
+        """
+        config.STREAMING_EXPORTが有効な場合、取得のたびに1件ずつ追記する出力ファイルを作成する
+        
+        Returns:
+            StreamingExporter: 出力ファイル（無効な場合はNone）
+        """
+        if not (getattr(config, 'STREAMING_EXPORT', False) if HAS_CONFIG else False):
+            return None
+        export_format = getattr(config, 'EXPORT_FORMAT', "xlsx") if HAS_CONFIG else "xlsx"
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = os.path.join(self.output_dir, f"green_jobs_{timestamp}.{export_format}")
+        # テンプレートの項目に加え、詳細ページにある場合のみ追加される項目も列に含める
+        columns = list(self.new_job_data("").keys()) + ["待遇・福利厚生"]
+        if self.normalize_enabled():
+            # リストの列はjsonlにのみ書き込む（csv・xlsxでは利用言語の文字列の列を使用する）
+            columns += [name for name in NORMALIZED_COLUMNS if export_format == "jsonl" or name not in LIST_COLUMNS]
+        self.export_sink = StreamingExporter(file_path, columns=columns)
+        logger.info(f"取得した求人を1件ずつ {self.export_sink.partial_path} に書き込みます")
+        if export_format == "xlsx":
+            logger.info("xlsxは終了時に変換するため、途中で終了した場合は *.partial.jsonl のみ残ります"
+                        "（実行中も開けるファイルが必要な場合は EXPORT_FORMAT = \"csv\" を使用してください）")
+        return self.export_sink
+
+    def export_completed(self, favorites):
+        """
+        再開時、チェックポイントに記録済みの求人のうち現在のお気に入りにあるものを出力ファイルに書き込む
+        
+        お気に入りから外れた求人は書き込まない（DataFrameに含まれる求人と揃えるため）。
+        
+        Args:
+            favorites (tuple): select_jobs_to_scrapeが返したお気に入り情報
+        """
+        if self.export_sink is None:
+            return
+        self.export_rows(self.checkpoint.rows(favorites[0]))
+
+    def export_rows(self, job_rows, batch_size=500):
+        """
+        求人データを出力ファイルに書き込む（正規化が有効な場合はpostprocessと同じ列を加える）
+        
+        Args:
+            job_rows (iterable): 求人データ（書き込み済みの求人は除く）
+            batch_size (int): まとめて正規化する件数
+        """
+        normalize = self.normalize_enabled()
+        job_rows = iter(job_rows)
+        while True:
+            batch = list(itertools.islice(job_rows, batch_size))
+            if not batch:
+                return
+            batch = [job_data for job_data in batch if job_data.get("掲載ページ") not in self.export_sink.written]
+            if normalize and batch:
+                batch = normalize_job_rows(batch)
+            for job_data in batch:
+                self.export_sink.write(job_data)
+
+    def complete_job(self, job_data):
+        """
+        取得が完了した求人をチェックポイントと出力ファイルに追記する
+        
+        Args:
+            job_data (dict): 求人データ辞書
+        """
+        self.checkpoint.append(job_data)
+        if self.export_sink is not None:
+            self.export_rows([job_data])
+
+    def finish_run(self, favorites):
+        """
+        チェックポイントの求人を保存済みデータと統合し、チェックポイントと出力ファイルを閉じる
+        
+        STREAMING_EXPORTが有効な場合、求人データ（正規化した列を含む）は出力ファイルに書き込み済みのため
+        メモリ上に集めず、空のDataFrameを返す（COLUMNAR_FORMATの出力は出力ファイルから作成する）。
+        
+        Args:
+            favorites (tuple): select_jobs_to_scrapeが返したお気に入り情報（一覧取得に失敗した場合はNone）
+            
+        Returns:
+            pd.DataFrame: お気に入りの並び順の求人データ
+        """
+        if self.export_sink is None:
+            job_rows = self.update_job_store(self.checkpoint.rows(), favorites)
+            self.checkpoint.close()
+            return pd.DataFrame(job_rows)
+        
+        self.update_job_store(self.checkpoint.rows(), favorites, merge=False)
+        self.checkpoint.close()
+        # 増分取得で保存済みデータを使用した求人をお気に入りの並び順で書き込む
+        stored_rows = []
+        if favorites is not None:
+            job_urls, _, stored = favorites
+            stored_rows = (stored[job_url] for job_url in job_urls if job_url in stored)
+        self.finish_export(stored_rows)
+        logger.info(
+            "STREAMING_EXPORTが有効なため、求人データは出力ファイルにのみ保存しました"
+            f"（{self.export_path}。呼び出し元には空のDataFrameを返します）"
+        )
+        return pd.DataFrame()
+
+    def finish_export(self, job_rows):
+        """
+        今回取得していない求人（増分取得で保存済みデータを使用したもの）を書き込み、出力ファイルを閉じる
+        
+        Args:
+            job_rows (iterable): 書き込む求人データ（書き込み済みの求人は無視される）
+        """
+        if self.export_sink is None:
+            return
+        try:
+            with self.metrics.stage("export"):
+                self.export_rows(job_rows)
+            # 列形式の出力は書き込んだ行から作成する（数値列は元の文字列の項目から求め直す）
+            if getattr(config, 'COLUMNAR_FORMAT', "") if HAS_CONFIG else "":
+                written = self.export_sink.read_frame()
+                if not written.empty:
+                    written = written.drop(columns=[name for name in NORMALIZED_COLUMNS if name in written])
+                    self.columnar_path = self.save_columnar(written)
+            with self.metrics.stage("export"):
+                self.export_path = self.export_sink.close()
+            logger.info(f"データを {self.export_path} に保存しました（{len(self.export_sink.written)}件）")
+        except Exception as e:
+            logger.error(f"出力ファイルの保存中にエラーが発生しました: {str(e)}")
+        finally:
+            self.export_sink = None
+
+    def select_jobs_to_scrape(self, job_urls, job_salaries, incremental=None):
+        """
+        増分取得モードの場合、取得が必要な求人（新規・一覧の内容が変わった・保存から期限切れ）に絞り込む
+        
+        Args:
+            job_urls (list): お気に入りの全求人URL
+            job_salaries (list): job_urlsと同じ順序の給与情報
+            incremental (bool): 増分取得するかどうか（省略時はconfig.INCREMENTAL_MODE）
+            
+        Returns:
+            tuple: (取得する求人URL, 同じ順序の給与情報, update_job_storeに渡すお気に入り情報)
+        """
+        if incremental is None:
+            incremental = getattr(config, 'INCREMENTAL_MODE', False) if HAS_CONFIG else False
+        max_age_hours = getattr(config, 'INCREMENTAL_MAX_AGE_HOURS', 168) if HAS_CONFIG else 168
+        
+        job_salaries = [job_salaries[i] if i < len(job_salaries) else "" for i in range(len(job_urls))]
+        listing_fingerprints = {}
+        for job_url, salary in zip(job_urls, job_salaries):
+            card = self.favorite_cards.get(job_url, {})
+            listing_fingerprints[job_url] = JobStore.fingerprint(
+                [job_url, salary, card.get("title", ""), card.get("tags", [])]
+            )
+        stored_rows = {}
+        if self.job_store is None or not incremental:
+            return job_urls, job_salaries, (job_urls, listing_fingerprints, stored_rows)
+        
+        urls_to_scrape = []
+        salaries_to_scrape = []
+        for job_url, salary in zip(job_urls, job_salaries):
+            stored = self.job_store.get(job_url)
+            if (stored is not None
+                    and stored["listing_fingerprint"] == listing_fingerprints[job_url]
+                    and time.time() - stored["scraped_at"] < max_age_hours * 3600):
+                stored_rows[job_url] = stored["data"]
+            else:
+                urls_to_scrape.append(job_url)
+                salaries_to_scrape.append(salary)
+        logger.info(f"増分取得: {len(urls_to_scrape)}件を取得、{len(stored_rows)}件は保存済みデータを使用します")
+        return urls_to_scrape, salaries_to_scrape, (job_urls, listing_fingerprints, stored_rows)
+
+    def update_job_store(self, job_rows, favorites, merge=True, batch_size=500):
+        """
+        取得した求人を保存し、保存済みデータと合わせてお気に入りの並び順に並べる
+        
+        Args:
+            job_rows (iterable): 今回取得した求人データ
+            favorites (tuple): select_jobs_to_scrapeが返したお気に入り情報（一覧取得に失敗した場合はNone）
+            merge (bool): Falseなら保存のみ行い、求人データをメモリ上に集めない
+            batch_size (int): 給与の金額をまとめて求める件数
+            
+        Returns:
+            list: お気に入りの並び順の求人データのリスト（merge=Falseの場合はNone）
+        """
+        if favorites is None:
+            return list(job_rows) if merge else None
+        job_urls, listing_fingerprints, stored_rows = favorites
+        
+        scraped = {}
+        saved = 0
+        changed = 0
+        if self.job_store is not None:
+            self.job_store.start_run(job_urls)
+        job_rows = iter(job_rows)
+        while True:
+            batch = list(itertools.islice(job_rows, batch_size))
+            if not batch:
+                break
+            if merge:
+                scraped.update((job_data["掲載ページ"], job_data) for job_data in batch)
+            if self.job_store is None:
+                continue
+            salaries = JobStore.salary_values([job_data.get("給与", "") for job_data in batch])
+            for job_data, salary in zip(batch, salaries):
+                saved += 1
+                if self.job_store.save(job_data, listing_fingerprints.get(job_data["掲載ページ"], ""), salary):
+                    changed += 1
+        if self.job_store is not None:
+            logger.info(f"求人データを保存しました: {saved}件（新規・変更あり {changed}件）")
+        if not merge:
+            return None
+        
+        merged = []
+        for job_url in job_urls:
+            if job_url in scraped:
+                merged.append(scraped[job_url])
+            elif job_url in stored_rows:
+                merged.append(stored_rows[job_url])
+        return merged
     
-    def login_with_google(self):
-        """Google アカウントでログインする"""
-        try:
-            logger.info("Google アカウントでログインを試みています...")
-            self.driver.get(self.login_url)
-            time.sleep(3)  # ページの読み込みを待機
+    def extract_favorite_cards(self):
+        """
+        お気に入り一覧の全求人カードからURL・給与・タイトル・タグを1回のexecute_scriptで取得する
+        
+        Returns:
+            OrderedDict: 求人URLをキー、{"salary", "title", "tags"} を値とする辞書（一覧の並び順）
+        """
+        cards = OrderedDict()
+        for card in self.driver.execute_script(FAVORITE_CARDS_SCRIPT, FAVORITE_LINK_SELECTOR) or []:
+            job_url = card.get("url")
+            if not job_url or job_url in cards:
+                continue
+            salary = (card.get("salary") or "").strip()
+            cards[job_url] = {
+                # 「円」が含まれる値のみを給与とする
+                "salary": salary if "円" in salary else "",
+                "title": (card.get("title") or "").strip(),
+                "tags": [tag.strip() for tag in card.get("tags") or [] if tag.strip()],
+            }
+        self.favorite_cards = cards
+        return cards
 
-            # Google アカウントでログインボタンをクリック
-            logger.info("Googleログインボタンを探しています...")
+    def collect_favorites(self):
+        """
+        お気に入りページを読み込み、求人URLと一覧に表示された給与情報を取得する
+        
+        Returns:
+            tuple: (求人URLのリスト, 同じ順序の給与情報のリスト)
+        """
+        logger.info("お気に入りページにアクセスしています...")
+        self.install_api_capture()
+        with self.metrics.stage("list_load"):
+            self.record_page_bytes()
+            self.driver.get(self.favorites_url)
+            self.wait_for_page_ready("お気に入りページ", (By.CSS_SELECTOR, FAVORITE_LINK_SELECTOR))
+        # 動的ロード対応: ページ最下部までスクロールして全件読み込む
+        scroll_idle = getattr(config, 'SCROLL_IDLE_SECONDS', 1.0) if HAS_CONFIG else 1.0
+        with self.metrics.stage("scroll"):
+            self.infinite_scroll(
+                scroll_pause_time=scroll_idle, max_scrolls=100, link_selector=FAVORITE_LINK_SELECTOR
+            )
+
+        # 全求人カードのURL・給与・タイトル・タグを1回のスクリプト実行で取得（URLをキーとする）
+        with self.metrics.stage("card_extraction"):
+            cards = self.extract_favorite_cards()
+        if not cards:
+            raise TimeoutException("お気に入りの求人リンクが見つかりませんでした")
+        logger.info(f"{len(cards)}件の求人リンクが見つかりました")
+        # 一覧APIの総件数は読み込み漏れの確認にのみ使用する（スクロールの終了条件には使わない）
+        total = self.favorites_total()
+        if total is not None and len(cards) < total:
+            logger.warning(f"お気に入りの総件数 {total}件のうち {len(cards)}件しか読み込めませんでした")
+        
+        job_urls = list(cards)
+        job_salaries = [cards[job_url]["salary"] for job_url in job_urls]
+        logger.info(f"取得したURL数: {len(job_urls)}")
+        logger.info(f"給与情報を取得できた求人: {sum(1 for salary in job_salaries if salary)}件")
+        
+        return job_urls, job_salaries
+
+    async def scrape_favorites_async(self, max_concurrency=None, requests_per_second=None, incremental=None, resume=False):
+        """
+        お気に入りの求人詳細ページ・会社情報ページをHTTPエンジンで並行取得する
+        
+        同時リクエスト数をセマフォで、ホストごとの送信速度をトークンバケットで制限し、
+        429/5xxの場合は指数バックオフで再試行する。HTMLから取得できない求人・会社情報は
+        並行取得の終了後にSeleniumで1件ずつ取得する。
+        
+        Args:
+            max_concurrency (int): 同時に送信するリクエスト数の上限（省略時はconfig.ASYNC_MAX_CONCURRENCY）
+            requests_per_second (float): ホストごとの1秒あたりのリクエスト数（省略時はconfig.REQUESTS_PER_SECOND）
+            incremental (bool): Trueなら新規・一覧の内容が変わった求人のみ取得する（scrape_favoritesと同じ）
+            resume (bool): Trueなら前回のチェックポイントから再開する（scrape_favoritesと同じ）
             
-            # より正確なセレクタを使用（CSSセレクタ）
+        Returns:
+            pd.DataFrame: スクレイピングしたデータのデータフレーム（STREAMING_EXPORTが有効な場合は空。データは出力ファイルに保存される）
+        """
+        if not HAS_LXML:
+            logger.warning("lxmlがインストールされていないため、逐次モードで取得します")
+            return self.scrape_favorites(incremental=incremental, resume=resume)
+        
+        if max_concurrency is None:
+            max_concurrency = getattr(config, 'ASYNC_MAX_CONCURRENCY', 8) if HAS_CONFIG else 8
+        if requests_per_second is None:
+            requests_per_second = getattr(config, 'REQUESTS_PER_SECOND', 2.0) if HAS_CONFIG else 2.0
+        max_retries = getattr(config, 'HTTP_MAX_RETRIES', 3) if HAS_CONFIG else 3
+        backoff = getattr(config, 'HTTP_BACKOFF', 1.0) if HAS_CONFIG else 1.0
+        
+        # 一覧の読み込みはブラウザで行う（並行処理の開始前なのでそのまま実行）
+        job_urls, job_salaries = self.collect_favorites()
+        job_urls, job_salaries, favorites = self.select_jobs_to_scrape(job_urls, job_salaries, incremental)
+        job_urls, job_salaries = self.open_checkpoint(resume).pending(job_urls, job_salaries)
+        self.open_export()
+        self.export_completed(favorites)
+        engine = self.get_http_engine()
+        
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        buckets = {}
+        company_tasks = {}
+        # HTMLから取得できなかった求人・会社情報（gatherの終了後にブラウザで1件ずつ取得する）
+        job_fallbacks = []
+        company_fallbacks = []
+        
+        async def fetch(url):
+            host = urlparse(url).netloc
+            if host not in buckets:
+                buckets[host] = TokenBucket(requests_per_second)
+            for attempt in range(max_retries + 1):
+                async with semaphore:
+                    await buckets[host].acquire()
+                    self.page_load_count += 1
+                    response = await loop.run_in_executor(executor, engine.get, url)
+                if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                    html = engine.response_html(response, url)
+                    if html is not None:
+                        self.archive_page(url, html)
+                    return html
+                if attempt < max_retries:
+                    delay = backoff * (2 ** attempt)
+                    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+                    if retry_after.isdigit():
+                        delay = max(delay, int(retry_after))
+                    logger.warning(f"{delay}秒後に再試行します ({attempt+1}/{max_retries}): {url}")
+                    await asyncio.sleep(delay)
+            logger.warning(f"再試行回数の上限に達しました: {url}")
+            return None
+        
+        async def scrape(i, job_url):
+            job_salary = job_salaries[i] if i < len(job_salaries) else ""
+            job_data = self.new_job_data(job_url, job_salary)
+            self.metrics.record_job()
             try:
-                # CSSセレクタを使ってボタンを特定
-                google_login_button = self.wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "#content_cont > div.wrap640 > div > form > div > div.mt30 > a.social-login-button.google-button"))
-                )
-                logger.info("CSSセレクタでGoogleログインボタンを見つけました")
+                started = time.monotonic()
+                html = await fetch(job_url)
+                self.metrics.record_stage("detail_navigation", time.monotonic() - started)
+                with self.metrics.stage("field_extraction"):
+                    tree = parse_html(html) if html is not None else None
+                    extracted = tree is not None and extract_detail_tree(tree, job_data)
+                if not extracted:
+                    # ブラウザの操作はイベントループを止めるため、他の求人の取得が終わってから行う
+                    job_fallbacks.append((i, job_url, job_salary))
+                    return None
+                else:
+                    company_url = html_company_url(tree, job_url)
+                    if company_url and not self.load_cached_company_info(company_url, job_data):
+                        # 同じ会社の取得が進行中であればその結果を待つ
+                        key = CompanyCache.make_key(company_url)
+                        if key not in company_tasks:
+                            company_tasks[key] = asyncio.ensure_future(fetch(company_url))
+                        started = time.monotonic()
+                        company_html = await company_tasks[key]
+                        if company_html is None:
+                            # 再試行の上限に達したURLはHTTPで取得し直さず、あとでブラウザで取得する
+                            company_fallbacks.append((i, job_data, company_url))
+                            return None
+                        apply_company_texts(html_company_texts(parse_html(company_html)), job_data)
+                        self.store_company_info(company_url, job_data)
+                        self.metrics.record_stage("company_fetch", time.monotonic() - started)
+                self.complete_job(job_data)
+                logger.info(f"求人 {i+1}/{len(job_urls)} の情報を取得しました")
+                return job_data
             except Exception as e:
-                logger.warning(f"CSSセレクタでのボタン特定に失敗: {str(e)}")
-                # フォールバック: クラス名で検索
-                try:
-                    google_login_button = self.wait.until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "a.social-login-button.google-button"))
-                    )
-                    logger.info("クラス名でGoogleログインボタンを見つけました")
-                except Exception as e:
-                    logger.warning(f"クラス名でのボタン特定に失敗: {str(e)}")
-                    # 最後の手段: テキスト内容で検索
-                    google_login_button = self.wait.until(
-                        EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Google')]"))
-                    )
-                    logger.info("テキスト内容でGoogleログインボタンを見つけました")
-            
-            logger.info("Googleログインボタンをクリック...")
-            google_login_button.click()
-            time.sleep(3)  # リダイレクトを待機
+                logger.error(f"求人 {i+1} の処理中にエラーが発生しました: {str(e)}")
+                return None
+        
+        try:
+            started = time.monotonic()
+            await asyncio.gather(*(scrape(i, job_url) for i, job_url in enumerate(job_urls)))
+            logger.info(f"{len(job_urls)}件を{time.monotonic() - started:.1f}秒で取得しました（同時{max_concurrency}件、{requests_per_second}件/秒/ホスト）")
+        finally:
+            executor.shutdown(wait=False)
+        
+        # HTMLから取得できなかった分はブラウザで取得する（並行処理は終了済み）
+        for i, job_url, job_salary in sorted(job_fallbacks):
+            try:
+                logger.info(f"求人 {i+1} はSeleniumで取得します: {job_url}")
+                self.complete_job(self._scrape_job_selenium(job_url, self.new_job_data(job_url, job_salary)))
+            except Exception as e:
+                logger.error(f"求人 {i+1} の処理中にエラーが発生しました: {str(e)}")
+        for i, job_data, company_url in sorted(company_fallbacks, key=lambda item: item[0]):
+            try:
+                logger.info(f"求人 {i+1} の会社情報はSeleniumで取得します: {company_url}")
+                self.get_company_info(job_data, company_url=company_url, browser=True)
+                self.complete_job(job_data)
+            except Exception as e:
+                logger.error(f"求人 {i+1} の処理中にエラーが発生しました: {str(e)}")
+        
+        return self.finish_run(favorites)
 
-            # 新しいウィンドウが開いたか確認
-            if len(self.driver.window_handles) > 1:
-                logger.info("新しいウィンドウに切り替えます...")
-                self.driver.switch_to.window(self.driver.window_handles[-1])
+    def scrape_job(self, job_url, salary=""):
+        """
+        求人詳細ページを1回だけ読み込み、カード項目・詳細項目・会社情報を取得する
+        
+        Args:
+            job_url (str): 求人詳細ページのURL
+            salary (str): お気に入り一覧から取得済みの給与情報
             
-            # Googleのログインページに遷移
-            current_url = self.driver.current_url
-            logger.info(f"現在のURL: {current_url}")
+        Returns:
+            dict: 求人データの辞書
+        """
+        job_data = self.new_job_data(job_url, salary)
+        self.metrics.record_job()
+        
+        # HTTPエンジンで取得・解析できればブラウザでの読み込みは不要
+        if self.fetch_backend == "http" and self.get_detailed_info_http(job_url, job_data):
+            return job_data
+        
+        return self._scrape_job_selenium(job_url, job_data)
+
+    def _scrape_job_selenium(self, job_url, job_data):
+        """
+        求人詳細ページをブラウザで読み込み、カード項目・詳細項目・会社情報を取得する
+        
+        Args:
+            job_url (str): 求人詳細ページのURL
+            job_data (dict): 更新する求人データの辞書
             
-            if "accounts.google.com" in current_url:
-                # Googleアカウントのメールアドレスを入力
-                logger.info("メールアドレス入力フィールドを待機しています...")
-                email_field = self.wait.until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, "input[type='email']"))
-                )
-                
-                # configファイルからGoogleメールアドレスを取得
-                email = ""
-                if HAS_CONFIG and hasattr(config, 'GOOGLE_EMAIL') and config.GOOGLE_EMAIL:
-                    email = config.GOOGLE_EMAIL
-                    logger.info("設定ファイルからGoogleメールアドレスを読み込みました")
-                
-                # 設定が無い場合はユーザー入力を求める
-                if not email:
-                    email = input("Googleアカウントのメールアドレスを入力してください: ")
-                
-                email_field.clear()
-                email_field.send_keys(email)
-                email_field.send_keys(Keys.RETURN)
-                time.sleep(3)
-                
-                # パスワードを入力
-                logger.info("パスワード入力フィールドを待機しています...")
-                password_field = self.wait.until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, "input[type='password']"))
-                )
-                
-                # configファイルからGoogleパスワードを取得
-                password = ""
-                if HAS_CONFIG and hasattr(config, 'GOOGLE_PASSWORD') and config.GOOGLE_PASSWORD:
-                    password = config.GOOGLE_PASSWORD
-                    logger.info("設定ファイルからGoogleパスワードを読み込みました")
-                
-                # 設定が無い場合はユーザー入力を求める
-                if not password:
-                    password = getpass.getpass("Googleアカウントのパスワードを入力してください: ")
-                
-                password_field.clear()
-                password_field.send_keys(password)
-                password_field.send_keys(Keys.RETURN)
-                time.sleep(5)
-                
-                # 認証が完了するまで待機
-                logger.info("認証が完了するまで待機しています...")
-                max_wait_time = 60  # 最大待機時間（秒）
-                wait_interval = 3    # 確認間隔（秒）
-                elapsed_time = 0
-                
-                while elapsed_time < max_wait_time:
-                    current_url = self.driver.current_url
-                    if self.base_url in current_url:
-                        logger.info("認証が完了し、Green Japanに戻りました")
-                        return True
-                    
-                    time.sleep(wait_interval)
-                    elapsed_time += wait_interval
-                    logger.info(f"認証待機中... 経過時間: {elapsed_time}秒")
-                
-                # タイムアウト
-                logger.error("認証のタイムアウトが発生しました")
-                return False
+        Returns:
+            dict: 求人データの辞書
+        """
+        # 求人詳細ページに遷移（この1回の読み込みでカード項目と詳細項目を両方取得する）
+        with self.metrics.stage("detail_navigation"):
+            self.load_page(job_url)
+            if self.extraction_mode == "structured":
+                # 構造化データは描画を待たずに読める（読み込み完了のみ待つ）
+                self.wait_for_page_ready("求人詳細ページ")
             else:
-                logger.error(f"Googleアカウント認証ページに遷移できませんでした: {current_url}")
-                return False
+                # 詳細項目のラベルが描画されるまで待機
+                self.wait_for_page_ready("求人詳細ページ", (By.CSS_SELECTOR, "p[class*='css-']"))
+        
+        if self.extraction_mode == "structured":
+            if self.get_structured_info(job_url, job_data):
+                return job_data
+            # 構造化データがない場合は画面の要素から取得する
+            with self.metrics.stage("detail_navigation"):
+                self.wait_for_page_ready("求人詳細ページ", (By.CSS_SELECTOR, "p[class*='css-']"))
 
-        except Exception as e:
-            logger.error(f"Google アカウントでのログイン中にエラーが発生しました: {str(e)}")
-            # エラー発生時にスクリーンショットを保存
-            try:
-                screenshot_path = os.path.join(self.output_dir, "error_screenshot.png")
-                self.driver.save_screenshot(screenshot_path)
-                logger.info(f"エラー時のスクリーンショットを保存しました: {screenshot_path}")
-            except:
-                pass
-            return False
-    
-    def login_with_email_password(self):
+        # 読み込み済みの詳細ページからカード項目・詳細項目・会社情報を取得（再読み込みしない）
+        self.get_detailed_info(job_url, job_data, page_loaded=True)
+        
+        return job_data
+
+    @staticmethod
+    def new_job_data(job_url, salary=""):
         """
-        Green Japanにログインする
+        求人データの辞書を初期値で作成する
         
+        Args:
+            job_url (str): 求人詳細ページのURL
+            salary (str): お気に入り一覧から取得済みの給与情報
+            
         Returns:
-            bool: ログイン成功ならTrue、失敗ならFalse
+            dict: 各項目を初期化した求人データの辞書
         """
-        try:
-            logger.info("ログインページにアクセスしています...")
-            self.driver.get(self.login_url)
-            
-            # config.pyからログイン情報を読み込む
-            email = ""
-            password = ""
-            
-            if HAS_CONFIG and hasattr(config, 'EMAIL') and config.EMAIL:
-                email = config.EMAIL
-                
-            if HAS_CONFIG and hasattr(config, 'PASSWORD') and config.PASSWORD:
-                password = config.PASSWORD
+        return {
+            "企業名": "",
+            "給与": salary,  # 給与情報を事前に取得した値から割り当て
+            "勤務地": "",
+            "時間": "",
+            "働き方": "",
+            "平均年齢": "",
+            "みなし残業": "",
+            "平均残業": "",
+            "休日日数": "",
+            "実務経験": "",
+            "利用言語": "",
+            "掲載ページ": job_url,
+            "社員数": "",
+            "設立年数": "",
+            "採用人数": "",
+            "応募資格": "",
+            "必須資格": "",
+            "歓迎資格": "",
+            "希望度": "個別で記入",
+            "結果": "個別で記入",
+            "HPの作りこみ": "個別で記入",
+            "転職会議の点数": "個別で記入",
+            "ライトハウス": "個別で記入",
+        }
+
+    def scrape_jobs_parallel(self, job_urls, job_salaries, max_workers, max_per_host=None):
+        """
+        ログイン済みCookieを引き継いだ複数のChromeセッションで求人詳細ページを並列取得する
+        
+        Args:
+            job_urls (list): 求人詳細ページのURLリスト
+            job_salaries (list): job_urlsと同じ順序の給与情報リスト
+            max_workers (int): 起動するワーカーセッション数
+            max_per_host (int): 同一ホストへの同時アクセス数の上限（省略時はconfig.MAX_CONNECTIONS_PER_HOST）
             
-            # メールアドレスとパスワードの入力を要求（未指定の場合）
-            if not email:
-                email = input("Green Japanのメールアドレスを入力してください: ")
-            if not password:
-                password = getpass.getpass("Green Japanのパスワードを入力してください: ")
+        Returns:
+            list: お気に入りの並び順を保った求人データのリスト（失敗した求人は除く）
+        """
+        if max_per_host is None:
+            max_per_host = getattr(config, 'MAX_CONNECTIONS_PER_HOST', max_workers) if HAS_CONFIG else max_workers
+        max_workers = min(max_workers, len(job_urls))
+        
+        cookies = self.driver.get_cookies()
+        results = [None] * len(job_urls)
+        idle_workers = queue.Queue()
+        workers = []
+        host_limits = {}
+        host_lock = threading.Lock()
+        
+        def host_limit(url):
+            host = urlparse(url).netloc
+            with host_lock:
+                if host not in host_limits:
+                    host_limits[host] = threading.BoundedSemaphore(max(1, max_per_host))
+                return host_limits[host]
+        
+        def run(i, job_url):
+            worker = idle_workers.get()
+            try:
+                logger.info(f"求人 {i+1}/{len(job_urls)} の情報を取得中...")
+                loads_before = worker.page_load_count
+                with host_limit(job_url):
+                    job_salary = job_salaries[i] if i < len(job_salaries) else ""
+                    results[i] = worker.scrape_job(job_url, job_salary)
+                if self.checkpoint is not None:
+                    self.complete_job(results[i])
+                logger.info(f"求人 {i+1} のページ読み込み回数: {worker.page_load_count - loads_before}")
+            except Exception as e:
+                logger.error(f"求人 {i+1} の処理中にエラーが発生しました: {str(e)}")
+            finally:
+                idle_workers.put(worker)
+        
+        try:
+            for _ in range(max_workers):
+                worker = self.create_worker(cookies)
+                workers.append(worker)
+                idle_workers.put(worker)
+            logger.info(f"{len(workers)}個のワーカーセッションで並列取得します（ホストあたり最大{max_per_host}）")
             
-            # メールアドレス入力
-            email_field = self.wait.until(EC.presence_of_element_located((By.ID, "user_email")))
-            email_field.clear()
-            email_field.send_keys(email)
+            with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+                list(executor.map(run, range(len(job_urls)), job_urls))
+        finally:
+            for worker in workers:
+                try:
+                    worker.close()
+                except Exception as e:
+                    logger.warning(f"ワーカーの終了中にエラー: {str(e)}")
+        
+        return [job_data for job_data in results if job_data is not None]
+
+    def scrape_jobs_pipeline(self, job_urls, job_salaries, queue_size=None, preload=None):
+        """
+        取得・抽出・出力の3つの処理段階を上限付きキューでつなぎ、別々のスレッドで並行して求人を処理する
+        
+        取得（呼び出し元のスレッド）はブラウザまたはHTTPエンジンで求人詳細ページと会社情報ページのHTMLを取得し、
+        抽出（lxmlでHTMLから項目を取り出す）と出力（チェックポイント・出力ファイルへの追記）は別のスレッドで行う。
+        ブラウザで取得する場合は、次の求人を2つ目のタブで先に読み込み始めておく
+        （構造化データから抽出する場合は、APIのレスポンスをページごとに選べなくなるため先読みしない）。
+        HTMLから抽出できなかった求人は、最後にブラウザで1件ずつ取得し直す。
+        
+        Args:
+            job_urls (list): 求人詳細ページのURLリスト
+            job_salaries (list): job_urlsと同じ順序の給与情報リスト
+            queue_size (int): 処理段階の間のキューの長さの上限（省略時はconfig.PIPELINE_QUEUE_SIZE）
+            preload (bool): 次の求人を2つ目のタブで先に読み込むか（省略時はconfig.PIPELINE_PRELOAD、ブラウザで取得する場合のみ）
+        """
+        if queue_size is None:
+            queue_size = getattr(config, 'PIPELINE_QUEUE_SIZE', 4) if HAS_CONFIG else 4
+        if preload is None:
+            preload = getattr(config, 'PIPELINE_PRELOAD', True) if HAS_CONFIG else True
+        preload = preload and self.fetch_backend != "http" and self.extraction_mode != "structured"
+        
+        parse_queue = StageQueue("parse", queue_size, self.metrics)
+        export_queue = StageQueue("export", queue_size, self.metrics)
+        # HTMLから抽出できなかった求人（パイプラインの終了後にブラウザで取得し直す）
+        fallbacks = []
+        
+        def parse_stage():
+            while True:
+                item = parse_queue.get()
+                if item is StageQueue.DONE:
+                    export_queue.put(StageQueue.DONE)
+                    return
+                try:
+                    if self.parse_fetched_job(item):
+                        export_queue.put(item["job_data"])
+                    else:
+                        fallbacks.append(item)
+                except Exception as e:
+                    logger.error(f"求人 {item['index']+1} の抽出中にエラーが発生しました: {str(e)}")
+        
+        def export_stage():
+            while True:
+                job_data = export_queue.get()
+                if job_data is StageQueue.DONE:
+                    return
+                try:
+                    with self.metrics.stage("export"):
+                        self.complete_job(job_data)
+                except Exception as e:
+                    logger.error(f"求人の出力中にエラーが発生しました: {str(e)}")
+        
+        stages = [threading.Thread(target=parse_stage, name="pipeline-parse", daemon=True),
+                  threading.Thread(target=export_stage, name="pipeline-export", daemon=True)]
+        for stage in stages:
+            stage.start()
+        logger.info(f"パイプラインで取得します（キューの上限 {queue_size}件、次の求人の先読み: {'あり' if preload else 'なし'}）")
+        
+        tabs = self.open_preload_tab() if preload else None
+        pending_companies = set()
+        try:
+            for i, job_url in enumerate(job_urls):
+                job_salary = job_salaries[i] if i < len(job_salaries) else ""
+                item = {"index": i, "job_url": job_url, "job_data": self.new_job_data(job_url, job_salary)}
+                self.metrics.record_job()
+                logger.info(f"求人 {i+1}/{len(job_urls)} の情報を取得中...")
+                try:
+                    next_url = job_urls[i + 1] if tabs and i + 1 < len(job_urls) else None
+                    self.fetch_job_pages(item, pending_companies, tabs=tabs, next_url=next_url)
+                except Exception as e:
+                    logger.error(f"求人 {i+1} の取得中にエラーが発生しました: {str(e)}")
+                    fallbacks.append(item)
+                    continue
+                parse_queue.put(item)
+        finally:
+            parse_queue.put(StageQueue.DONE)
+            for stage in stages:
+                stage.join()
+            if tabs:
+                self.close_preload_tab(tabs)
+        
+        for name, stats in (self.metrics.summary()["queues"] or {}).items():
+            logger.info(
+                f"キュー[{name}]: 平均の長さ {stats['avg_depth']} / 最大 {stats['max_depth']}、"
+                f"満杯で待った時間 {stats['put_wait_seconds']}秒 / 空で待った時間 {stats['get_wait_seconds']}秒"
+            )
+        
+        # HTMLから抽出できなかった求人はブラウザで取得し直す（各段階のスレッドは終了済み）
+        for item in sorted(fallbacks, key=lambda item: item["index"]):
+            try:
+                logger.info(f"求人 {item['index']+1} はブラウザで取得し直します: {item['job_url']}")
+                job_url = item["job_url"]
+                job_data = self.new_job_data(job_url, item["job_data"]["給与"])
+                self.complete_job(self._scrape_job_selenium(job_url, job_data))
+            except Exception as e:
+                logger.error(f"求人 {item['index']+1} の処理中にエラーが発生しました: {str(e)}")
+
+    def open_preload_tab(self):
+        """
+        次の求人を先に読み込むための2つ目のタブを開く
+        
+        Returns:
+            list: [元のタブ, 2つ目のタブ] のウィンドウハンドル（開けなかった場合はNone）
+        """
+        try:
+            main_tab = self.driver.current_window_handle
+            self.driver.switch_to.new_window("tab")
+            preload_tab = self.driver.current_window_handle
+            # 遮断するURLの設定はタブごとに行う
+            if lean_load_enabled():
+                self.enable_lean_load()
+            self.driver.switch_to.window(main_tab)
+            return [main_tab, preload_tab]
+        except Exception as e:
+            logger.warning(f"先読み用のタブを開けませんでした（先読みせずに取得します）: {str(e)}")
+            return None
+
+    def close_preload_tab(self, tabs):
+        """open_preload_tabで開いたタブを閉じ、元のタブに戻る"""
+        main_tab, preload_tab = tabs
+        try:
+            self.driver.switch_to.window(preload_tab)
+            self.driver.close()
+        except Exception as e:
+            logger.warning(f"先読み用のタブを閉じられませんでした: {str(e)}")
+        finally:
+            self.driver.switch_to.window(main_tab)
+
+    def fetch_job_pages(self, item, pending_companies, tabs=None, next_url=None):
+        """
+        パイプラインの取得段階：求人詳細ページと会社情報ページのHTMLを取得し、itemに格納する
+        
+        ブラウザで取得する場合、求人ごとに2つのタブを交互に使い、この求人のページを待つ前に
+        もう一方のタブで次の求人（next_url）の読み込みを始める。
+        
+        Args:
+            item (dict): index・job_url・job_dataを格納した項目（html・tree・payloads・company_url・company_htmlなどを追加する）
+            pending_companies (set): この実行で取得を始めた会社のキャッシュキー（同じ会社の会社情報ページは1回だけ取得する）
+            tabs (list): open_preload_tabのウィンドウハンドル（先読みしない場合はNone）
+            next_url (str): 先に読み込み始める次の求人のURL
             
-            # パスワード入力
-            password_field = self.driver.find_element(By.ID, "user_password")
-            password_field.clear()
-            password_field.send_keys(password)
+        Raises:
+            Exception: 求人詳細ページを取得できなかった場合（itemはブラウザで取得し直す）
+        """
+        job_url = item["job_url"]
+        job_data = item["job_data"]
+        with self.metrics.stage("detail_navigation"):
+            if self.fetch_backend == "http":
+                html = self.fetch_html(job_url)
+                if html is None:
+                    raise Exception("HTTPエンジンで求人詳細ページを取得できませんでした")
+            else:
+                if tabs is None or item["index"] == 0:
+                    self.load_page(job_url)
+                else:
+                    # 前の求人の処理中に読み込みを始めたタブに切り替える
+                    self.driver.switch_to.window(tabs[item["index"] % 2])
+                if next_url:
+                    self.preload_page(tabs[(item["index"] + 1) % 2], next_url)
+                    self.driver.switch_to.window(tabs[item["index"] % 2])
+                target_path = urlparse(job_url).path.rstrip("/")
+                if not self.wait_for(lambda driver: urlparse(driver.current_url).path.rstrip("/") == target_path,
+                                     "求人詳細ページへの遷移"):
+                    raise Exception(f"求人詳細ページに遷移しませんでした: {self.driver.current_url}")
+                if self.extraction_mode == "structured":
+                    self.wait_for_page_ready("求人詳細ページ")
+                else:
+                    self.wait_for_page_ready("求人詳細ページ", (By.CSS_SELECTOR, "p[class*='css-']"))
+                html = self.driver.page_source
+                self.archive_page(job_url, html)
+        item["html"] = html
+        item["tree"] = tree = parse_html(html)
+        if self.extraction_mode == "structured":
+            # ブラウザの場合はAPIのレスポンスも含める（パフォーマンスログの読み出しはWebDriverを使うためこの段階で行う）
+            item["payloads"] = (
+                html_next_data(tree) if self.fetch_backend == "http" else self.collect_structured_payloads(job_url)
+            )
+        
+        # 会社情報ページ（構造化データに会社情報がある場合・キャッシュにある場合・この実行で取得済みの場合は取得しない）
+        company_url = html_company_url(tree, job_url)
+        item["company_url"] = company_url
+        item["company_html"] = None
+        if not company_url:
+            return
+        if self.extraction_mode == "structured" and structured_company_texts(item["payloads"], job_url):
+            return
+        key = CompanyCache.make_key(company_url)
+        if key in pending_companies:
+            # 抽出段階で、先に取得した同じ会社の情報をキャッシュから格納する
+            item["company_pending"] = True
+            return
+        if self.load_cached_company_info(company_url, job_data):
+            return
+        with self.metrics.stage("company_fetch"):
+            if self.fetch_backend == "http":
+                item["company_html"] = self.fetch_html(company_url)
+            else:
+                self.load_page(company_url)
+                # 会社情報の項目が描画されるまで待機
+                self.wait_for_page_ready("会社情報ページ", (By.XPATH, COMPANY_CONTAINER_XPATH))
+                item["company_html"] = self.driver.page_source
+                self.archive_page(company_url, item["company_html"])
+        if item["company_html"] is not None and self.company_cache is not None:
+            pending_companies.add(key)
+
+    def preload_page(self, tab, url):
+        """
+        指定したタブで、読み込みの完了を待たずにページの読み込みを始める
+        
+        Args:
+            tab (str): ウィンドウハンドル
+            url (str): 読み込むURL
+        """
+        self.driver.switch_to.window(tab)
+        self.record_page_bytes()
+        self.page_load_count += 1
+        self.driver.execute_script("window.location.assign(arguments[0]);", url)
+
+    def parse_fetched_job(self, item):
+        """
+        パイプラインの抽出段階：fetch_job_pagesで取得したHTMLから詳細項目と会社情報を取り出す（WebDriverは使わない）
+        
+        Args:
+            item (dict): fetch_job_pagesでHTMLを格納した項目
             
-            # ログインボタンをクリック
-            login_button = self.driver.find_element(By.NAME, "commit")
-            login_button.click()
+        Returns:
+            bool: 詳細項目を抽出できた場合はTrue（Falseの場合はブラウザで取得し直す）
+        """
+        job_data = item["job_data"]
+        tree = item["tree"]
+        with self.metrics.stage("field_extraction"):
+            # 会社情報は詳細項目を抽出できなかった場合もキャッシュに格納する（同じ会社の以降の求人で使用する）
+            company_url = item["company_url"]
+            if item["company_html"] is not None:
+                company_tree = parse_html(item["company_html"])
+                company_texts = []
+                if self.extraction_mode == "structured":
+                    company_texts = structured_company_texts(html_next_data(company_tree), company_url)
+                apply_company_texts(company_texts or html_company_texts(company_tree), job_data)
+                self.store_company_info(company_url, job_data)
             
-            # ログイン成功の確認
-            self.wait.until(lambda driver: self.base_url in driver.current_url)
-            logger.info("ログインに成功しました")
-            return True
+            extracted = found_company = False
+            if self.extraction_mode == "structured":
+                extracted, found_company = apply_structured_data(item["payloads"], job_data, tree)
+            if not extracted:
+                extracted = extract_detail_tree(tree, job_data)
+            if not extracted:
+                logger.info(f"HTMLに詳細項目が含まれていないためブラウザで取得し直します: {item['job_url']}")
+                return False
             
-        except Exception as e:
-            logger.error(f"ログイン中にエラーが発生しました: {str(e)}")
-            return False
-    
-    def scrape_favorites(self, max_retries=None, retry_delay=None):
+            if found_company and company_url:
+                self.store_company_info(company_url, job_data)
+            elif item.get("company_pending"):
+                # この実行で先に取得した同じ会社の情報（抽出段階は求人の順に処理するため格納済み）
+                self.load_cached_company_info(company_url, job_data)
+        # 以降の段階にはHTMLを渡さない
+        for name in ("html", "tree", "payloads", "company_html"):
+            item.pop(name, None)
+        logger.info(f"求人 {item['index']+1} の情報を抽出しました")
+        return True
+
+    def create_worker(self, cookies=None):
         """
-        お気に入りページから求人情報をスクレイピングする
+        並列取得用のワーカーを起動する（Chromeプロファイルは使用せず、Cookieでログイン状態を引き継ぐ）
         
         Args:
-            max_retries (int): スクレイピング失敗時の最大リトライ回数
-            retry_delay (int): リトライまでの待機時間（秒）
+            cookies (list): driver.get_cookies()で取得したCookieのリスト
             
         Returns:
-            pd.DataFrame: スクレイピングしたデータのデータフレーム
+            GreenScraper: ワーカー用のスクレイパー
         """
-        # config.pyから設定を読み込む
-        if max_retries is None and HAS_CONFIG and hasattr(config, 'MAX_RETRIES'):
-            max_retries = config.MAX_RETRIES
-        elif max_retries is None:
-            max_retries = 2
-            
-        if retry_delay is None and HAS_CONFIG and hasattr(config, 'RETRY_DELAY'):
-            retry_delay = config.RETRY_DELAY
-        elif retry_delay is None:
-            retry_delay = 5
+        options = Options()
+        if HAS_CONFIG and hasattr(config, 'HEADLESS_MODE') and config.HEADLESS_MODE:
+            options.add_argument("--headless")
+        self._apply_common_chrome_options(options)
         
-        all_job_data = []
-        retry_count = 0
+        if self.driver_path:
+            driver = webdriver.Chrome(service=Service(self.driver_path), options=options)
+        else:
+            driver = webdriver.Chrome(options=options)
         
-        while retry_count <= max_retries:
+        worker = GreenScraper(driver=driver, base_url=self.base_url, metrics=self.metrics)
+        worker.company_cache = self.company_cache
+        worker.page_archive = self.page_archive
+        if cookies:
+            worker.load_cookies(cookies)
+        return worker
+
+    def load_cookies(self, cookies):
+        """
+        Cookieをブラウザに設定してログイン状態を復元する
+        
+        Args:
+            cookies (list): driver.get_cookies()形式のCookieのリスト
+        """
+        # Cookieはドメインが一致するページを開いた状態でしか設定できない
+        self.load_page(self.base_url)
+        for cookie in cookies:
             try:
-                logger.info("お気に入りページにアクセスしています...")
-                self.driver.get(self.favorites_url)
-                # 動的ロード対応: ページ最下部までスクロールして全件読み込む
-                self.infinite_scroll(scroll_pause_time=2.0, max_scrolls=100)
-                
-                # (更新) 新しい DOM 構造に合わせてリンク要素を取得
-                job_links = self.wait.until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR,
-                        "#__next > div.MuiBox-root[class*='css-'] > div > div[class*='css-'] > div.MuiBox-root[class*='css-'] > div > a"
-                    ))
-                )
-                logger.info(f"{len(job_links)}件の求人リンクが見つかりました")
-                
-                # 各求人リンクのURLを事前に取得して保存
-                job_urls = []
-                for link in job_links:
-                    try:
-                        job_url = link.get_attribute("href")
-                        job_urls.append(job_url)
-                    except Exception as e:
-                        logger.warning(f"求人URLの取得中にエラー: {str(e)}")
-                
-                logger.info(f"取得したURL数: {len(job_urls)}")
-                logger.info(f"取得したURL: {job_urls}")
-                
-                
-                # 各リンクに対応する給与情報を取得する準備
-                job_salaries = []
+                self.driver.add_cookie(cookie)
+            except Exception:
+                # ドメイン不一致などで失敗した場合は現在のホストに対して設定する
                 try:
-                    # XPathを使って各求人カードの給与情報を取得
-                    for i in range(1, len(job_urls) + 1):
-                        try:
-                            # 提供されたXPathパターンを使用
-                            xpath = f"/html/body/div[1]/div[1]/div/div[1]/div[{i}]/div/a/div[2]/div[2]/div[1]/span"
-                            
-                            # 要素の取得を試みる
-                            salary_elems = self.driver.find_elements(By.XPATH, xpath)
-                            
-                            if salary_elems and len(salary_elems) > 0:
-                                salary_text = salary_elems[0].text.strip()
-                                # 「円」が含まれる値のみを追加
-                                if "円" in salary_text:
-                                    job_salaries.append(salary_text)
-                                    logger.info(f"求人 {i} の給与情報: {salary_text}")
-                                else:
-                                    job_salaries.append("")
-                                    logger.info(f"求人 {i} の給与情報に「円」が含まれていないためスキップ")
-                            else:
-                                job_salaries.append("")
-                                logger.warning(f"求人 {i} の給与情報要素が見つかりませんでした")
-                        except Exception as e:
-                            job_salaries.append("")
-                            logger.warning(f"求人 {i} の給与情報取得中にエラー: {str(e)}")
-                    
-                    logger.info(f"取得した給与情報数: {len(job_salaries)}")
+                    cookie = {k: v for k, v in cookie.items() if k not in ("domain", "sameSite")}
+                    self.driver.add_cookie(cookie)
                 except Exception as e:
-                    logger.warning(f"給与情報の取得に失敗: {str(e)}")
-                
-                # URLごとに詳細ページにアクセスして情報を取得
-                for i, job_url in enumerate(job_urls):
-                    try:
-                        # ループ回数の制御
-                        # if i >= 4:
-                        #     break  
-                        logger.info(f"求人 {i+1}/{len(job_urls)} の情報を取得中...")
-                        
-                        # 求人詳細ページに遷移
-                        self.driver.get(job_url)
-                        # ページ読み込みのために3秒待機
-                        time.sleep(3)
-
-                        # 各項目の初期化
-                        job_data = {
-                            "企業名": "",
-                            "給与": job_salaries[i] if i < len(job_salaries) else "",  # 給与情報を事前に取得した値から割り当て
-                            "勤務地": "",
-                            "時間": "",
-                            "働き方": "",
-                            "平均年齢": "",
-                            "みなし残業": "",
-                            "平均残業": "",
-                            "休日日数": "",
-                            "実務経験": "",
-                            "利用言語": "",
-                            "掲載ページ": job_url,
-                            "社員数": "",
-                            "設立年数": "",
-                            "採用人数": "",
-                            "応募資格": "",
-                            "必須資格": "",
-                            "歓迎資格": "",
-                            "希望度": "個別で記入",
-                            "結果": "個別で記入",
-                            "HPの作りこみ": "個別で記入",
-                            "転職会議の点数": "個別で記入",
-                            "ライトハウス": "個別で記入",
-                        }
-                        
-                        # 詳細情報を取得するロジックを試行
-                        try:
-                            # 詳細項目を取得
-                            detail_items = self.driver.find_elements(By.CSS_SELECTOR, 
-                                "#__next > div.MuiBox-root[class*='css-'] > div > div.MuiContainer-root[class*='css-'] > div > div > div > div[class*='css-'] > div")
-                            
-                            # DOM構造を確認し、該当する詳細情報を取得
-                            for item in detail_items:
-                                try:
-                                    item_text = item.text
-                                    
-                                    if "勤務地" in item_text:
-                                        job_data["勤務地"] = item_text.replace("勤務地：", "").strip()
-                                    elif "時間" in item_text:
-                                        job_data["時間"] = item_text.replace("時間：", "").strip()
-                                    elif "働き方" in item_text:
-                                        job_data["働き方"] = item_text.replace("働き方：", "").strip()
-                                    
-                                    # 言語情報の取得（タグから）
-                                    language_tags = self.driver.find_elements(By.CSS_SELECTOR, ".card-tag__item")
-                                    if language_tags:
-                                        languages = [tag.text for tag in language_tags]
-                                        job_data["利用言語"] = ", ".join(languages)
-                                except Exception as e:
-                                    logger.warning(f"詳細項目の取得中にエラー: {str(e)}")
-                        except Exception as e:
-                            logger.warning(f"詳細項目の全体取得に失敗: {str(e)}")
-                        
-                        # 詳細ページへアクセスして追加情報を取得
-                        self.get_detailed_info(job_url, job_data)
-                        
-                        all_job_data.append(job_data)
-                        
-                    except Exception as e:
-                        logger.error(f"求人 {i+1} の処理中にエラーが発生しました: {str(e)}")
-                
-                # 全ての求人の処理が完了したらループを抜ける
-                break
-                
-            except Exception as e:
-                logger.error(f"スクレイピング中にエラーが発生しました: {str(e)}")
-                retry_count += 1
-                
-                if retry_count <= max_retries:
-                    logger.info(f"{retry_delay}秒後にリトライします ({retry_count}/{max_retries})...")
-                    time.sleep(retry_delay)
-                else:
-                    logger.error("最大リトライ回数に達しました。処理を終了します。")
-                    break
-        
-        # DataFrameに変換
-        return pd.DataFrame(all_job_data)
-    
+                    logger.warning(f"Cookie {cookie.get('name')} の設定に失敗: {str(e)}")
+
     def parse_requirements(self, raw_text: str) -> tuple:
         """
         応募資格テキストから必須資格と歓迎資格を抽出する
         @param raw_text: 応募資格の生テキスト
         @return: (必須資格, 歓迎資格)
         """
-        # ──── 「必須要件」ヘッダー候補 ────
-        # ◆必須要件
-        # 【必須…】（【必須（MUST）】など）
-        # ■必須スキル
-        # ■必須要件■（パターン３）
-        # 【MUST】
-        must_pattern = re.search(
-            r"(?:"
-              r"◆必.*?"
-              r"|【必.*?】"
-              r"|■必.*?"
-              r"|【MUST】"
-            r")"
-            r"([\s\S]*?)(?=◆|【|■|$)",
-            raw_text
-        )
-
-        # ──── 「歓迎要件」ヘッダー候補 ────
-        # ◆歓迎要件
-        # 【歓迎…】（【歓迎（WANT）】など）
-        # ■歓迎スキル
-        # 【WANT】
-        # 【優遇スキル】（パターン１の後半を歓迎扱い）
-        want_pattern = re.search(
-            r"(?:"
-              r"◆歓.*?"
-              r"|【歓.*?】"
-              r"|■歓.*?"
-              r"|【優遇.*?】"
-              r"|【WANT.*?】"
-            r")"
-            r"([\s\S]*?)(?=◆|【|■|$)",
-            raw_text
-        )
-
-        must = must_pattern.group(1).strip() if must_pattern else ""
-        want = want_pattern.group(1).strip() if want_pattern else ""
-        return must, want
+        # 見出し（◆/【】/■/＜＞/MUST/WANT/優遇/尚可/求める人物像/Requirements/Preferred）で
+        # セクションに分割する（正規表現はモジュール読み込み時にコンパイル済み）
+        return parse_requirements_text(raw_text)
 
-    def get_detailed_info(self, job_url, job_data):
+    def get_detailed_info(self, job_url, job_data, page_loaded=False):
         """
         求人詳細ページにアクセスして追加情報を取得する
         
+        会社情報ページへ遷移した状態で終了する（元のページには戻らない）。
+        
         Args:
             job_url (str): 求人詳細ページのURL
             job_data (dict): 更新する求人データの辞書
+            page_loaded (bool): 詳細ページが既に表示されている場合はTrue（再読み込みしない）
         """
         try:
-            # 現在のURLを保存
-            current_url = self.driver.current_url
+            if not page_loaded:
+                # 同じタブで詳細ページにアクセス（新しいタブを開かない）
+                logger.info(f"詳細ページにアクセス: {job_url}")
+                self._load_detail_page(job_url)
             
-            # 同じタブで詳細ページにアクセス（新しいタブを開かない）
-            logger.info(f"詳細ページにアクセス: {job_url}")
-            self.driver.get(job_url)
-            
-            # ページ読み込みのために待機
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "body")))
+            # 詳細ページからの抽出（会社情報ページへの遷移の前まで）の所要時間
+            extraction_started = time.monotonic()
+            self._snapshot_detail_page(job_url, job_data)
             
             # try:
             #     # 会社情報セクションを取得
@@ -768,67 +4175,15 @@ class GreenScraper:
                         logger.warning(f"企業名要素の取得に失敗: {e}")
                 
                 # 各情報の取得
-                if not job_data["給与"]:
-                    salary = self.get_field_value("年収")
-                    if salary and "円" in salary:
-                        job_data["給与"] = salary
-                
-                if not job_data["勤務地"]:
-                    location = self.get_field_value("勤務地")
-                    if location:
-                        job_data["勤務地"] = location
-                
-                work_time = self.get_field_value("勤務時間")
-                if work_time:
-                    job_data["時間"] = work_time
-
-                holiday = self.get_field_value("休日・休暇")
-                if holiday:
-                    job_data["休日日数"] = holiday
-
-                benefits = self.get_field_value("待遇・福利厚生")
-                if benefits:
-                    job_data["待遇・福利厚生"] = benefits
-                
-                work_style = self.get_field_value("働き方")
-                if work_style:
-                    job_data["働き方"] = work_style
-
-                number_of_employees = self.get_field_value("採用人数")
-                if number_of_employees:
-                    job_data["採用人数"] = number_of_employees
-                
-                application_qualification = self.get_field_value("応募資格")
-                if application_qualification:
-                    job_data["応募資格"] = application_qualification
-                    # 応募資格テキストを解析して必須資格と歓迎資格に分割
-                    must, want = self.parse_requirements(application_qualification)
-                    if must:
-                        job_data["必須資格"] = must
-                    # 必須資格が抽出できなかった場合はページ上のフィールドをフォールバック取得
-                    elif self.get_field_value("必須資格"):
-                        job_data["必須資格"] = self.get_field_value("必須資格")
-                    if want:
-                        job_data["歓迎資格"] = want
-                    # 歓迎資格が抽出できなかった場合はページ上のフィールドをフォールバック取得
-                    elif self.get_field_value("歓迎資格"):
-                        job_data["歓迎資格"] = self.get_field_value("歓迎資格")
-                
-                hope_degree = self.get_field_value("希望度")
-                if hope_degree:
-                    job_data["希望度"] = hope_degree
+                self._apply_field_values(job_data)
                 
                 try:
-                    # 指定されたXPathを使用して利用言語を取得
-                    xpath = "//*[@id=\"__next\"]/div[1]/div/div[1]/div/div/div/div[1]/div[3]/div[4]/span"
-                    language_elems = self.driver.find_elements(By.XPATH, xpath)
-                    
-                    if language_elems and len(language_elems) > 0:
+                    # 指定されたXPathを使用して利用言語を取得（全要素のテキストを1回で取得）
+                    languages = [text.strip() for text in self.element_texts(LANGUAGE_XPATH) if text.strip()]
+                    if languages:
                         # 複数の言語要素がある場合は結合
-                        languages = [elem.text.strip() for elem in language_elems if elem.text.strip()]
-                        if languages:
-                            job_data["利用言語"] = ", ".join(languages)
-                            logger.info(f"XPathで取得した利用言語: {job_data['利用言語']}")
+                        job_data["利用言語"] = ", ".join(languages)
+                        logger.info(f"XPathで取得した利用言語: {job_data['利用言語']}")
                 except Exception as e:
                     logger.warning(f"XPathによる利用言語取得中にエラー: {str(e)}")
                 
@@ -862,88 +4217,463 @@ class GreenScraper:
                 # except Exception as e:
                 #     logger.warning(f"給与取得中にエラー: {e}")
 
-                # try:
-                #     # 勤務地ラベル確認
-                #     label_location = self.driver.find_element(
-                #         By.CSS_SELECTOR,
-                #         "#__next > div.MuiBox-root[class*='css-'] > div > div.MuiContainer-root.MuiContainer-maxWidthMd.MuiContainer-disableGutters[class*='css-'] > div > div > div > div[class*='css-'] > div:nth-child(11) > p.MuiTypography-root.MuiTypography-body2.MuiTypography-alignJustify[class*='css-']"
-                #     )
-                #     if "勤務地" in label_location.text and not job_data["勤務地"]:
-                #         loc_elem = self.driver.find_element(
-                #             By.CSS_SELECTOR,
-                #             "#__next > div.MuiBox-root[class*='css-'] > div > div.MuiContainer-root.MuiContainer-maxWidthMd.MuiContainer-disableGutters[class*='css-'] > div > div > div > div[class*='css-'] > div:nth-child(11) > p.MuiTypography-root.MuiTypography-body2.MuiTypography-alignJustify[class*='css-']"
-                #         )
-                #         job_data["勤務地"] = loc_elem.text.strip()
-                # except Exception as e:
-                #     logger.warning(f"勤務地取得中にエラー: {e}")
+                # try:
+                #     # 勤務地ラベル確認
+                #     label_location = self.driver.find_element(
+                #         By.CSS_SELECTOR,
+                #         "#__next > div.MuiBox-root[class*='css-'] > div > div.MuiContainer-root.MuiContainer-maxWidthMd.MuiContainer-disableGutters[class*='css-'] > div > div > div > div[class*='css-'] > div:nth-child(11) > p.MuiTypography-root.MuiTypography-body2.MuiTypography-alignJustify[class*='css-']"
+                #     )
+                #     if "勤務地" in label_location.text and not job_data["勤務地"]:
+                #         loc_elem = self.driver.find_element(
+                #             By.CSS_SELECTOR,
+                #             "#__next > div.MuiBox-root[class*='css-'] > div > div.MuiContainer-root.MuiContainer-maxWidthMd.MuiContainer-disableGutters[class*='css-'] > div > div > div > div[class*='css-'] > div:nth-child(11) > p.MuiTypography-root.MuiTypography-body2.MuiTypography-alignJustify[class*='css-']"
+                #         )
+                #         job_data["勤務地"] = loc_elem.text.strip()
+                # except Exception as e:
+                #     logger.warning(f"勤務地取得中にエラー: {e}")
+
+            self.metrics.record_stage("field_extraction", time.monotonic() - extraction_started)
+            
+            # 会社情報の取得
+            # 会社情報のリンクを取得して遷移
+            try:
+                # 指定されたXPathを持つaリンクを探す
+                company_link = self.driver.find_element(By.XPATH, COMPANY_LINK_XPATH)
+                
+                # リンクのテキストを取得
+                link_text = company_link.text.strip()
+                logger.info(f"取得したリンクのテキスト: {link_text}")
+                
+                # リンクをクリックして遷移（キャッシュにあれば会社情報ページへは遷移しない）
+                company_url = company_link.get_attribute("href")
+                if not self._open_company_page(company_link, company_url, job_data):
+                    return
+                
+                logger.info("会社情報ページに遷移しました")
+
+                # 会社情報ページのデータを取得
+            #     try:
+            #         # 設立年数の取得
+            #         establishment_years_elem = self.driver.find_element(By.XPATH, "/html/body/div[1]/div[1]/div/div[2]/div[2]/div/div[6]/div/p")
+            #         job_data["設立年数"] = establishment_years_elem.text.strip()
+            #         logger.info(f"設立年数: {job_data['設立年数']}")
+            #     except Exception as e:
+            #         logger.warning(f"設立年数の取得中にエラーが発生しました: {str(e)}")
+            #         job_data["設立年数"] = ""
+
+            #     # 社員数の取得
+            #     try:
+            #         # 社員数の要素を取得
+            #         employee_count_elem = self.driver.find_element(By.XPATH, "//*[@id='__next']/div[1]/div/div[2]/div[2]/div/div[11]/div/p")
+            #         job_data["社員数"] = employee_count_elem.text.strip()
+            #         logger.info(f"社員数: {job_data['社員数']}")
+            #     except Exception as e:
+            #         logger.warning(f"社員数の取得中にエラーが発生しました: {str(e)}")
+            #         job_data["社員数"] = ""
+                
+            #     # 平均年齢の取得
+            #     try:
+            #         # 平均年齢の要素を取得
+            #         average_age_elem = self.driver.find_element(By.XPATH, "/html/body/div[1]/div[1]/div/div[2]/div[2]/div/div[12]/div/p")
+            #         job_data["平均年齢"] = average_age_elem.text.strip()
+            #         logger.info(f"平均年齢: {job_data['平均年齢']}")
+            #     except Exception as e:
+            #         logger.warning(f"平均年齢の取得中にエラーが発生しました: {str(e)}")
+            #         job_data["平均年齢"] = ""
+                job_data = self.get_company_info(job_data)
+                if company_url:
+                    self.store_company_info(company_url, job_data)
+                logger.info(f"会社情報: {job_data}")
+            except Exception as e:
+                logger.warning(f"会社情報ページへの遷移中にエラーが発生しました: {str(e)}")
+            
+        except Exception as e:
+            logger.error(f"詳細ページのアクセス中にエラーが発生しました: {str(e)}")
+            self.clear_field_snapshot()
+            try:
+                # エラー回復：お気に入りページに戻る
+                logger.info("エラー回復：お気に入りページに戻ります")
+                self.load_page(self.favorites_url)
+                self.wait_for_page_ready("お気に入りページ")
+            except:
+                logger.error("回復失敗：ブラウザセッションが無効です")
+    
+    def _load_detail_page(self, job_url):
+        """求人詳細ページを読み込み、body要素が現れるまで待機する（処理段階 detail_navigation）"""
+        with self.metrics.stage("detail_navigation"):
+            self.load_page(job_url)
+            
+            # ページ読み込みのために待機
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "body")))
+
+    def _snapshot_detail_page(self, job_url, job_data):
+        """
+        表示中の求人詳細ページを保存し、カード項目・利用言語タグとラベル→値の索引を1回ずつ取得する
+        
+        Args:
+            job_url (str): 求人詳細ページのURL
+            job_data (dict): 更新する求人データの辞書
+        """
+        self.archive_driver_page(job_url)
+        
+        # カード項目と利用言語タグをページ単位で1回だけ取得する
+        try:
+            cards = self.driver.execute_script(JOB_CARD_SCRIPT, DETAIL_ITEMS_SELECTOR) or {}
+            apply_card_items(cards.get("items") or [], cards.get("tags") or [], job_data)
+        except Exception as e:
+            logger.warning(f"詳細項目の全体取得に失敗: {str(e)}")
+        
+        # ラベル→値を一括取得（以降のget_field_valueは索引から応答）
+        if self.use_field_snapshot:
+            self.snapshot_fields()
+
+    def _open_company_page(self, company_link, company_url, job_data):
+        """
+        求人詳細ページの会社情報リンクをクリックし、会社情報の項目が描画されるまで待機する（処理段階 company_navigation）
+        
+        Args:
+            company_link (WebElement): 会社情報ページへのリンク
+            company_url (str): 会社情報ページのURL
+            job_data (dict): 更新する求人データの辞書
+            
+        Returns:
+            bool: 遷移した場合はTrue（キャッシュから会社情報を格納した場合は遷移せずFalse）
+        """
+        # ページを離れるためスナップショットを破棄
+        self.clear_field_snapshot()
+        if company_url and self.load_cached_company_info(company_url, job_data):
+            return False
+        
+        with self.metrics.stage("company_navigation"):
+            self.record_page_bytes()
+            company_link.click()
+            self.page_load_count += 1
+            
+            # 会社情報の項目が描画されるまで待機
+            self.wait_for_page_ready("会社情報ページ", (By.XPATH, COMPANY_CONTAINER_XPATH))
+        if company_url:
+            self.archive_driver_page(company_url)
+        return True
+
+    def _apply_field_values(self, job_data):
+        """get_field_valueで取得できる詳細項目をjob_dataに格納する（表示中のページ、またはsnapshot_fieldsの索引から）"""
+        apply_field_values(self.get_field_value, job_data)
+
+    def collect_structured_payloads(self, page_url=None):
+        """
+        表示中のページの構造化データ（__NEXT_DATA__と、ページが取得したAPIのJSONレスポンス）を取得する
+        
+        APIのレスポンスはパフォーマンスログのNetwork.responseReceivedから、表示中のページ（最後に読み込んだ文書）が
+        取得したJSONを選び、Network.getResponseBodyで本文を取得する。
+        
+        Args:
+            page_url (str): 表示中のページのURL（指定するとAPIのレスポンスをまとめてアーカイブに保存する）
+            
+        Returns:
+            list: JSONを読み込んだ値のリスト
+        """
+        payloads = []
+        try:
+            next_data = self.driver.execute_script(NEXT_DATA_SCRIPT)
+            if next_data:
+                payloads.append(json.loads(next_data))
+        except Exception as e:
+            logger.debug(f"__NEXT_DATA__の取得に失敗しました: {str(e)}")
+        
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"パフォーマンスログを取得できませんでした: {str(e)}")
+            return payloads
+        responses = []
+        loader_id = None
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get("method") != "Network.responseReceived":
+                continue
+            params = message.get("params", {})
+            if params.get("type") == "Document":
+                # 前のページのレスポンスが残っている場合に備え、最後に読み込んだ文書のものだけを使う
+                loader_id = params.get("loaderId")
+                responses = []
+            elif params.get("type") in ("XHR", "Fetch") and "json" in params.get("response", {}).get("mimeType", ""):
+                responses.append(params)
+        api_payloads = []
+        for params in responses:
+            if loader_id is not None and params.get("loaderId") != loader_id:
+                continue
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                api_payloads.append(json.loads(body.get("body", "")))
+            except Exception as e:
+                logger.debug(f"APIレスポンスの本文を取得できませんでした: {params.get('response', {}).get('url')}: {str(e)}")
+        if page_url and api_payloads:
+            # __NEXT_DATA__はページのHTMLに含まれるため、APIのレスポンスのみ1つのJSONの配列として保存する
+            self.archive_page(page_url, json.dumps(api_payloads, ensure_ascii=False), "json")
+        return payloads + api_payloads
+
+    def get_structured_info(self, job_url, job_data):
+        """
+        表示中の求人詳細ページの構造化データから情報を取得する（会社情報がなければ会社情報ページから取得）
+        
+        Args:
+            job_url (str): 求人詳細ページのURL
+            job_data (dict): 更新する求人データの辞書
+            
+        Returns:
+            bool: 構造化データから詳細項目を取得できた場合はTrue（Falseの場合job_dataは変更しない）
+        """
+        with self.metrics.stage("field_extraction"):
+            payloads = self.collect_structured_payloads(job_url)
+            found_job, found_company = apply_structured_data(payloads, job_data)
+        if not found_job:
+            logger.info(f"構造化データがないため画面の要素から取得します: {job_url}")
+            return False
+        self.archive_driver_page(job_url)
+        
+        # 利用言語は構造化データから取得しないため、表示中のページのタグから取得する
+        try:
+            languages = [text.strip() for text in self.element_texts(LANGUAGE_XPATH) if text.strip()]
+            if languages:
+                job_data["利用言語"] = ", ".join(languages)
+        except Exception as e:
+            logger.warning(f"利用言語の取得中にエラー: {str(e)}")
+        
+        try:
+            company_url = self.driver.find_element(By.XPATH, COMPANY_LINK_XPATH).get_attribute("href")
+        except Exception as e:
+            logger.warning(f"会社情報ページのリンクが見つかりませんでした: {str(e)}")
+            company_url = None
+        if found_company:
+            if company_url:
+                self.store_company_info(company_url, job_data)
+        elif company_url:
+            self.get_company_info(job_data, company_url=company_url)
+        return True
+
+    def get_detailed_info_http(self, job_url, job_data):
+        """
+        HTTPエンジンで求人詳細ページと会社情報ページを取得し、ブラウザなしで情報を抽出する
+        
+        Args:
+            job_url (str): 求人詳細ページのURL
+            job_data (dict): 更新する求人データの辞書
+            
+        Returns:
+            bool: 抽出できた場合はTrue（Falseの場合job_dataは変更されず、Seleniumで取得し直す）
+        """
+        with self.metrics.stage("detail_navigation"):
+            html = self.fetch_html(job_url)
+        if html is None:
+            return False
+        with self.metrics.stage("field_extraction"):
+            tree = parse_html(html)
+            found_company = False
+            extracted = False
+            if self.extraction_mode == "structured":
+                extracted, found_company = apply_structured_data(html_next_data(tree), job_data, tree)
+            if not extracted:
+                extracted = extract_detail_tree(tree, job_data)
+        if not extracted:
+            logger.info(f"HTMLに詳細項目が含まれていないためSeleniumで取得します: {job_url}")
+            return False
+        
+        # 会社情報ページ（構造化データに会社情報が含まれていた場合は取得しない）
+        company_url = html_company_url(tree, job_url)
+        if found_company:
+            if company_url:
+                self.store_company_info(company_url, job_data)
+        elif company_url:
+            self.get_company_info(job_data, company_url=company_url)
+        else:
+            logger.warning(f"会社情報ページのリンクが見つかりませんでした: {job_url}")
+        return True
+
+    def fetch_html(self, url):
+        """
+        HTTPエンジンでページのHTMLを取得する（初回呼び出し時にブラウザのCookieを引き継いだエンジンを作成）
+        
+        Args:
+            url (str): 取得するURL
+            
+        Returns:
+            str: HTML文字列（取得できなかった場合はNone）
+        """
+        self.page_load_count += 1
+        html = self.get_http_engine().fetch(url)
+        if html is not None:
+            self.archive_page(url, html)
+        return html
+
+    def archive_page(self, url, content, content_type="html"):
+        """
+        取得したページの本文をアーカイブに保存する（config.ARCHIVE_PAGESが無効な場合は何もしない）
+        
+        Args:
+            url (str): ページのURL
+            content (str): HTML、またはJSONの文字列
+            content_type (str): "html" または "json"
+        """
+        if self.page_archive is None or not content:
+            return
+        try:
+            self.page_archive.add(url, content, content_type)
+        except Exception as e:
+            logger.warning(f"ページのアーカイブへの保存に失敗しました: {url}: {str(e)}")
+
+    def archive_driver_page(self, url):
+        """
+        ブラウザで表示中のページのHTMLをアーカイブに保存する（無効な場合はWebDriverへ問い合わせない）
+        
+        Args:
+            url (str): ページのURL
+        """
+        if self.page_archive is None:
+            return
+        try:
+            self.archive_page(url, self.driver.page_source)
+        except Exception as e:
+            logger.warning(f"表示中のページのHTMLを取得できませんでした: {url}: {str(e)}")
 
-            # 会社情報の取得
-            # 会社情報のリンクを取得して遷移
-            try:
-                # 指定されたXPathを持つaリンクを探す
-                company_link = self.driver.find_element(By.XPATH, "/html/body/div[1]/header/div[3]/div[2]/nav/div/div/a[1]")
-                
-                # リンクのテキストを取得
-                link_text = company_link.text.strip()
-                logger.info(f"取得したリンクのテキスト: {link_text}")
-                
-                # リンクをクリックして遷移
-                company_link.click()
-                
-                # ページ遷移後に待機
-                time.sleep(2)
-                
-                logger.info("会社情報ページに遷移しました")
+    def get_http_engine(self):
+        """ブラウザのCookieを引き継いだHTTPエンジンを返す（初回呼び出し時に作成）"""
+        if self.http_engine is None:
+            timeout = getattr(config, 'HTTP_TIMEOUT', 10) if HAS_CONFIG else 10
+            self.http_engine = HttpFetchEngine.from_driver(self.driver, timeout=timeout)
+        return self.http_engine
 
-                # 会社情報ページのデータを取得
-            #     try:
-            #         # 設立年数の取得
-            #         establishment_years_elem = self.driver.find_element(By.XPATH, "/html/body/div[1]/div[1]/div/div[2]/div[2]/div/div[6]/div/p")
-            #         job_data["設立年数"] = establishment_years_elem.text.strip()
-            #         logger.info(f"設立年数: {job_data['設立年数']}")
-            #     except Exception as e:
-            #         logger.warning(f"設立年数の取得中にエラーが発生しました: {str(e)}")
-            #         job_data["設立年数"] = ""
+    def wait_for(self, condition, description, timeout=None):
+        """
+        条件が満たされるまで待機し、待機時間をログに記録する
+        
+        Args:
+            condition (callable): WebDriverWait.untilに渡す条件
+            description (str): ログに記録する待機内容
+            timeout (float): 最大待機時間（秒、省略時はPAGE_WAIT_TIMEOUT）
+            
+        Returns:
+            条件の戻り値（タイムアウトした場合はFalse）
+        """
+        if timeout is None:
+            timeout = self.page_wait_timeout
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(condition)
+            logger.info(f"待機[{description}]: {time.monotonic() - started:.2f}秒")
+            return result
+        except TimeoutException:
+            logger.warning(f"待機[{description}]: {timeout}秒でタイムアウトしました")
+            return False
 
-            #     # 社員数の取得
-            #     try:
-            #         # 社員数の要素を取得
-            #         employee_count_elem = self.driver.find_element(By.XPATH, "//*[@id='__next']/div[1]/div/div[2]/div[2]/div/div[11]/div/p")
-            #         job_data["社員数"] = employee_count_elem.text.strip()
-            #         logger.info(f"社員数: {job_data['社員数']}")
-            #     except Exception as e:
-            #         logger.warning(f"社員数の取得中にエラーが発生しました: {str(e)}")
-            #         job_data["社員数"] = ""
-                
-            #     # 平均年齢の取得
-            #     try:
-            #         # 平均年齢の要素を取得
-            #         average_age_elem = self.driver.find_element(By.XPATH, "/html/body/div[1]/div[1]/div/div[2]/div[2]/div/div[12]/div/p")
-            #         job_data["平均年齢"] = average_age_elem.text.strip()
-            #         logger.info(f"平均年齢: {job_data['平均年齢']}")
-            #     except Exception as e:
-            #         logger.warning(f"平均年齢の取得中にエラーが発生しました: {str(e)}")
-            #         job_data["平均年齢"] = ""
-                job_data = self.get_company_info(job_data)
-                logger.info(f"会社情報: {job_data}")
-            except Exception as e:
-                logger.warning(f"会社情報ページへの遷移中にエラーが発生しました: {str(e)}")
+    def wait_for_page_ready(self, description, locator=None):
+        """
+        ページの読み込み完了（document.readyState、Next.jsの#__nextの描画）と、指定した要素の出現を待機する
+        
+        軽量読み込みの場合はDOM構築の完了（readyStateが"interactive"）で読み込み完了とみなし、
+        画像などのサブリソースの読み込みを待たない（page_load_strategy "eager"と同じ基準）。
+        
+        Args:
+            description (str): ログに記録する待機内容
+            locator (tuple): 出現を待つ要素の (By, セレクタ)（省略時は読み込み完了のみ）
             
-            # 元のページに戻る
-            logger.info(f"元のURLに戻ります: {current_url}")
-            self.driver.get(current_url)
-            time.sleep(2)  # ページ遷移のための待機
+        Returns:
+            bool: タイムアウトせずに待機できた場合はTrue
+        """
+        ready_states = ["interactive", "complete"] if self.lean_load else ["complete"]
+        
+        def page_ready(driver):
+            return driver.execute_script(
+                "var root = document.getElementById('__next');"
+                "return arguments[0].indexOf(document.readyState) >= 0 && (!root || root.childElementCount > 0);",
+                ready_states
+            )
+        if locator is not None:
+            return bool(self.wait_for(
+                lambda driver: page_ready(driver) and driver.find_elements(*locator),
+                description
+            ))
+        return bool(self.wait_for(page_ready, description))
+
+    def load_page(self, url):
+        """
+        URLへ遷移し、ページ読み込み回数を記録する
+        
+        Args:
+            url (str): 遷移先のURL
+        """
+        self.record_page_bytes()
+        self.page_load_count += 1
+        self.driver.get(url)
+
+    def enable_lean_load(self, patterns=None):
+        """
+        CDPのNetwork.setBlockedURLsで、画像・動画・Webフォント・解析/広告タグのURLを読み込まないようにする（Chromeのみ）
+        
+        Args:
+            patterns (list): 遮断するURLのパターン（省略時はconfig.LEAN_BLOCKED_URL_PATTERNSまたはLEAN_BLOCKED_URL_PATTERNS）
             
+        Returns:
+            bool: 設定できた場合はTrue
+        """
+        # wait_for_page_readyはDOM構築の完了で読み込み完了とみなす（遮断の設定に失敗した場合も同じ）
+        self.lean_load = True
+        if patterns is None:
+            patterns = getattr(config, 'LEAN_BLOCKED_URL_PATTERNS', None) if HAS_CONFIG else None
+        patterns = list(patterns or LEAN_BLOCKED_URL_PATTERNS)
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            logger.info(f"軽量読み込みを有効にしました（遮断するURLのパターン {len(patterns)}件）")
+            return True
         except Exception as e:
-            logger.error(f"詳細ページのアクセス中にエラーが発生しました: {str(e)}")
-            try:
-                # エラー回復：お気に入りページに戻る
-                logger.info("エラー回復：お気に入りページに戻ります")
-                self.driver.get(self.favorites_url)
-                time.sleep(3)  # ページ読み込みのために待機
-            except:
-                logger.error("回復失敗：ブラウザセッションが無効です")
-    
+            logger.warning(f"軽量読み込みの設定に失敗しました: {str(e)}")
+            return False
+
+    def record_page_bytes(self):
+        """
+        現在のページで転送したバイト数を計測値に記録する（config.PAGE_BYTES_METRICSが有効な場合のみ）
+        
+        ページを離れる直前に呼び出し、DOM構築の完了後に読み込まれたリソースも含める。
+        Resource TimingのtransferSizeの合計のため、Timing-Allow-Originのない別オリジンのリソース（解析タグ・CDNなど）は
+        含まれない（実際の転送量の下限）。含まれなかったリソース数も記録する。
+        """
+        if not self.measure_page_bytes:
+            return
+        try:
+            result = self.driver.execute_script(PAGE_BYTES_SCRIPT)
+        except Exception as e:
+            logger.debug(f"転送バイト数の取得に失敗しました: {str(e)}")
+            return
+        if not result or not str(result.get("url", "")).startswith("http"):
+            return
+        self.metrics.record_page_bytes(result["bytes"], result.get("unmeasured", 0))
+        logger.debug(f"転送バイト数: {result['bytes']:,} バイト以上（リソース {result['resources']}件、"
+                     f"うちサイズ不明 {result.get('unmeasured', 0)}件）: {result['url']}")
+
+    def postprocess(self, data):
+        """
+        scrape_favoritesが返したDataFrameに正規化した列（NORMALIZED_COLUMNS）を追加する
+        
+        config.NORMALIZE_FIELDSがFalseの場合はそのまま返す。
+        
+        Args:
+            data (pd.DataFrame): scrape_favoritesが返す求人データ
+            
+        Returns:
+            pd.DataFrame: 正規化した列を追加したデータフレーム
+        """
+        if not self.normalize_enabled() or data.empty:
+            return data
+        with self.metrics.stage("postprocess"):
+            return normalize_job_columns(data)
+
+    def normalize_enabled(self):
+        """正規化した列（NORMALIZED_COLUMNS）を追加するかどうか（config.NORMALIZE_FIELDS）"""
+        return getattr(config, 'NORMALIZE_FIELDS', True) if HAS_CONFIG else True
+
     def save_to_excel(self, data):
         """
         スクレイピングしたデータをExcelに保存する
@@ -958,13 +4688,15 @@ class GreenScraper:
         file_path = os.path.join(self.output_dir, f"green_jobs_{timestamp}.xlsx")
         
         try:
-            # Excelファイルを作成
-            writer = pd.ExcelWriter(file_path, engine='openpyxl')
-            
-            # DataFrameをExcelに書き込む（B2セルから開始）
-            data.to_excel(writer, sheet_name='求人情報', startrow=1, startcol=1, index=False)
-            
-            writer.close()
+            with self.metrics.stage("export"):
+                # Excelファイルを作成
+                writer = pd.ExcelWriter(file_path, engine='openpyxl')
+                
+                # DataFrameをExcelに書き込む（B2セルから開始、リストの列は書き込めないため除く）
+                data = data.drop(columns=[name for name in LIST_COLUMNS if name in data])
+                data.to_excel(writer, sheet_name='求人情報', startrow=1, startcol=1, index=False)
+                
+                writer.close()
             logger.info(f"データを {file_path} に保存しました")
             return file_path
             
@@ -972,33 +4704,209 @@ class GreenScraper:
             logger.error(f"Excelへの保存中にエラーが発生しました: {str(e)}")
             return None
     
+    def save_columnar(self, data, file_format=None):
+        """
+        文字列の項目に数値列（給与下限・上限、社員数、設立年、平均年齢、年間休日など）を加え、Parquet/Featherで保存する
+        
+        Args:
+            data (pd.DataFrame): 保存するデータフレーム
+            file_format (str): "parquet" または "feather"（省略時はconfig.COLUMNAR_FORMAT、未設定なら保存しない）
+            
+        Returns:
+            str: 保存したファイルのパス（保存しない・失敗した場合はNone）
+        """
+        if file_format is None:
+            file_format = getattr(config, 'COLUMNAR_FORMAT', "") if HAS_CONFIG else ""
+        if not file_format:
+            return None
+        if file_format not in ("parquet", "feather"):
+            logger.warning(f"対応していない出力形式です: {file_format}")
+            return None
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = os.path.join(self.output_dir, f"green_jobs_{timestamp}.{file_format}")
+        
+        try:
+            with self.metrics.stage("export"):
+                typed = data if all(name in data for name in NORMALIZED_COLUMNS) else normalize_job_columns(data)
+                typed = typed.reset_index(drop=True)
+                # 文字列の項目はstring型に揃える（欠損値と空文字を区別して保存する）
+                for name in typed.columns:
+                    if typed[name].dtype == object and name not in LIST_COLUMNS:
+                        typed[name] = typed[name].astype("string")
+                if file_format == "parquet":
+                    typed.to_parquet(file_path, index=False)
+                else:
+                    typed.to_feather(file_path)
+            logger.info(f"データを {file_path} に保存しました")
+            return file_path
+        except ImportError:
+            logger.warning(f"pyarrowがインストールされていないため、{file_format}形式では保存できません")
+            return None
+        except Exception as e:
+            logger.error(f"{file_format}形式での保存中にエラーが発生しました: {str(e)}")
+            return None
+
+    def write_metrics(self):
+        """
+        計測結果をJSON（出力ディレクトリのmetrics_YYYYMMDD_HHMMSS.json）に保存し、
+        config.METRICS_PROMETHEUS_PATHが設定されていればPrometheus形式でも書き出す
+        
+        Returns:
+            str: 保存したJSONファイルのパス（計測が無効・保存に失敗した場合はNone）
+        """
+        if not self.metrics_enabled:
+            return None
+        try:
+            # 最後に開いていたページの転送バイト数も含める
+            self.record_page_bytes()
+            summary = self.metrics.summary(self.page_load_count)
+            stages = ", ".join(f"{name}={stats['seconds']}秒" for name, stats in summary["stages"].items())
+            logger.info(
+                f"計測結果: 求人{summary['jobs']}件, {summary['elapsed_seconds']}秒, "
+                f"WebDriverコマンド{summary['driver_commands']['total']}回（1件あたり{summary['driver_commands']['per_job']}回）, {stages}"
+            )
+            if summary["page_bytes"]:
+                page_bytes = summary["page_bytes"]
+                logger.info(f"転送バイト数: {page_bytes['pages']}ページ, 1ページあたり平均{page_bytes['avg']:,}バイト"
+                            f"（p50 {page_bytes['p50']:,} / p95 {page_bytes['p95']:,}、"
+                            f"サイズを取得できない別オリジンのリソース {page_bytes['unmeasured_resources']}件を含まない）")
+            timestamp = self.metrics.started_at.strftime("%Y%m%d_%H%M%S")
+            file_path = os.path.join(self.output_dir, f"metrics_{timestamp}.json")
+            self.metrics.write_json(file_path, self.page_load_count)
+            prometheus_path = getattr(config, 'METRICS_PROMETHEUS_PATH', "") if HAS_CONFIG else ""
+            if prometheus_path:
+                self.metrics.write_prometheus(prometheus_path, self.page_load_count)
+            logger.info(f"計測結果を {file_path} に保存しました")
+            return file_path
+        except Exception as e:
+            logger.warning(f"計測結果の保存中にエラーが発生しました: {str(e)}")
+            return None
+
     def close(self):
         """WebDriverを閉じる"""
+        if self.http_engine is not None:
+            self.http_engine.close()
+        # ワーカーは親のキャッシュを共有しているため閉じない
+        if self.company_cache is not None and self.owns_company_cache:
+            logger.info(f"会社情報キャッシュ: ヒット {self.company_cache.hits}件 / ミス {self.company_cache.misses}件")
+            self.company_cache.close()
+        if self.job_store is not None:
+            self.job_store.close()
+        if self.page_archive is not None and self.owns_page_archive:
+            logger.info(f"ページのアーカイブ: 保存 {self.page_archive.stored}件 / 保存済みの内容 {self.page_archive.deduplicated}件")
+            self.page_archive.close()
         self.driver.quit()
         logger.info("WebDriverを閉じました")
 
     # ―――――― 無限スクロールメソッドの追加 ――――――
-    def infinite_scroll(self, scroll_pause_time: float = 1.0, max_scrolls: int = 100):
+    def infinite_scroll(self, scroll_pause_time: float = 1.0, max_scrolls: int = 100,
+                        link_selector: str = None):
         """
         ページ下部までスクロールし、動的ロードされるコンテンツを全件読み込む
+        
+        スクロールごとの待機はブラウザ内で行い（1回のスクリプト実行）、リンク数が増えた時点で次のスクロールに進む。
+        DOMの変化がscroll_pause_time秒止まってもリンク数が増えなければ、全件読み込んだとみなして終了する。
 
-        @param scroll_pause_time: スクロール後の待機時間（秒）
+        @param scroll_pause_time: DOMの変化がこの時間（秒）止まったら読み込み完了とみなす
         @param max_scrolls: 最大スクロール回数
+        @param link_selector: 数を数える要素のCSSセレクタ（省略時はページの高さで判断）
         """
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        timeout = max(self.page_wait_timeout, scroll_pause_time)
+        self.driver.set_script_timeout(timeout + 5)
+        started = time.monotonic()
+        last_value = None
         for i in range(max_scrolls):
-            # ページ最下部までスクロール
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(scroll_pause_time)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                logger.info(f"スクロール完了: {i+1}回")
+            value = self.driver.execute_async_script(
+                SCROLL_WAIT_SCRIPT, link_selector, int(scroll_pause_time * 1000), int(timeout * 1000)
+            )
+            if last_value is not None and value <= last_value:
+                logger.info(f"スクロール完了: {i+1}回（{time.monotonic() - started:.2f}秒）")
                 return
-            last_height = new_height
+            last_value = value
         logger.warning(f"最大スクロール回数({max_scrolls})に到達しました")
 
+    def install_api_capture(self):
+        """
+        以降に開くページでお気に入り一覧APIのレスポンスを記録するスクリプトを登録する（Chromeのみ、1回だけ）
+        """
+        if self._api_capture_installed:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": API_CAPTURE_SCRIPT})
+            self._api_capture_installed = True
+        except Exception as e:
+            logger.debug(f"APIレスポンス記録スクリプトを登録できませんでした: {str(e)}")
+
+    def favorites_total(self):
+        """
+        記録したお気に入り一覧APIのレスポンスから総件数を取得する（読み込み漏れの確認用）
+        
+        Returns:
+            int: お気に入りの総件数（記録がない・総件数を含まない場合はNone）
+        """
+        try:
+            responses = self.driver.execute_script("return window.__greenApiResponses || [];")
+        except Exception as e:
+            logger.debug(f"APIレスポンスの取得に失敗: {str(e)}")
+            return None
+        for response in responses:
+            total = find_total_count(response.get("body"))
+            if total is not None:
+                logger.info(f"一覧APIの総件数: {total}件 ({response.get('url')})")
+                return total
+        return None
+
+    def element_texts(self, xpath):
+        """
+        XPathに一致する全要素のテキストを1回のスクリプト実行で取得する
+        
+        要素ごとに.textを呼ぶとドライバーとの往復が要素数だけ発生するため、まとめて取得する。
+        
+        Args:
+            xpath (str): 対象要素のXPath
+            
+        Returns:
+            list: 各要素のテキストのリスト（文書順）
+        """
+        return [text or "" for text in self.driver.execute_script(XPATH_TEXTS_SCRIPT, xpath) or []]
+
+    def snapshot_fields(self):
+        """
+        現在のページのラベルと値を1回のexecute_scriptで取得し、索引として保持する
+        
+        保持中はget_field_valueがWebDriverへ問い合わせずに索引から値を返す。
+        
+        Returns:
+            list: [ラベル, 値] のリスト（文書順）
+        """
+        try:
+            self._field_snapshot = self.driver.execute_script(FIELD_SNAPSHOT_SCRIPT) or []
+        except Exception as e:
+            logger.warning(f"ラベル一括取得中にエラー: {e}")
+            self._field_snapshot = None
+        self._field_cache = {}
+        if self._field_snapshot is not None:
+            logger.info(f"ラベルを一括取得しました: {len(self._field_snapshot)}件")
+        return self._field_snapshot
+
+    def clear_field_snapshot(self):
+        """ラベル→値のスナップショットを破棄する（ページ遷移前に呼び出す）"""
+        self._field_snapshot = None
+        self._field_cache = {}
+
     def get_field_value(self, field_name):
         """フィールド名から値を柔軟に取得する"""
+        # スナップショットがあれば索引から応答（ドライバーへの往復なし）
+        if self._field_snapshot is not None:
+            if field_name not in self._field_cache:
+                value = ""
+                for label, label_value in self._field_snapshot:
+                    if field_name in (label or ""):
+                        value = label_value or ""
+                        break
+                self._field_cache[field_name] = value
+            return self._field_cache[field_name]
+        
         try:
             # フィールド名を含むラベル要素を検索
             labels = self.driver.find_elements(By.CSS_SELECTOR, "p[class*='css-']")
@@ -1014,65 +4922,254 @@ class GreenScraper:
             logger.warning(f"{field_name}の取得中にエラー: {e}")
             return ""
 
-    def get_company_info(self, job_data):
+    def get_company_info(self, job_data, company_url=None, browser=False):
         """
         会社情報ページから情報を柔軟に取得する
         固定XPathではなく、ラベルテキストを元に情報を特定
         
         Args:
             job_data (dict): 更新する求人データ辞書
+            company_url (str): 会社情報ページのURL（省略時はブラウザで表示中のページから取得）
+            browser (bool): TrueならHTTPエンジンを使わずブラウザで取得する
         
         Returns:
             dict: 更新された求人データ辞書
         """
+        if company_url and self.load_cached_company_info(company_url, job_data):
+            return job_data
+        
+        with self.metrics.stage("company_fetch"):
+            return self._get_company_info(job_data, company_url, browser)
+
+    def _get_company_info(self, job_data, company_url, browser=False):
+        """get_company_infoの本体（キャッシュにない場合にページから取得する）"""
         try:
-            # 基本コンテナXPath
-            base_container = "/html/body/div[1]/div[1]/div/div[2]/div[2]/div"
-            
-            # コンテナ内の全div要素を取得
-            container_divs = self.driver.find_elements(By.XPATH, f"{base_container}/div")
-            logger.info(f"コンテナ内のdiv要素数: {len(container_divs)}")
-            
-            # すべてのdiv要素を処理 （ラベル／値を改行で分割して抽出）
-            for i, div in enumerate(container_divs):
-                div_text = div.text.strip()
-                logger.info(f"div[{i}] テキスト: {div_text}")
-                
-                # 改行で分割
-                lines = div_text.split('\n')
-                if len(lines) < 2:
-                    continue
-                
-                label = lines[0].strip()
-                value = '\n'.join(lines[1:]).strip()
-                
-                # ラベルに応じて job_data を更新
-                if "設立" in label:
-                    job_data["設立年数"] = value
-                    logger.info(f"設立年数を格納: {value}")
-                    continue
-                if "社員数" in label or "従業員数" in label:
-                    job_data["社員数"] = value
-                    logger.info(f"社員数を格納: {value}")
-                    continue
-                if "平均年齢" in label:
-                    job_data["平均年齢"] = value
-                    logger.info(f"平均年齢を格納: {value}")
-                    continue
-            
-            # （必要であればこれまでのSVGアイコン検索やバックアップ処理を後段に残します）
-            
-            logger.info(f"最終取得情報: 設立年数={job_data.get('設立年数','未取得')}, 社員数={job_data.get('社員数','未取得')}, 平均年齢={job_data.get('平均年齢','未取得')}")
+            # コンテナ内の全div要素のテキストを取得
+            div_texts = None
+            structured = self.extraction_mode == "structured"
+            if company_url and self.fetch_backend == "http" and not browser:
+                html = self.fetch_html(company_url)
+                if html is not None:
+                    tree = parse_html(html)
+                    if structured:
+                        div_texts = structured_company_texts(html_next_data(tree), company_url)
+                    if not div_texts:
+                        div_texts = html_company_texts(tree)
+            if div_texts is None:
+                if company_url:
+                    self.load_page(company_url)
+                    if structured:
+                        self.wait_for_page_ready("会社情報ページ")
+                        div_texts = structured_company_texts(self.collect_structured_payloads(company_url), company_url)
+                    if not div_texts:
+                        # 会社情報の項目が描画されるまで待機
+                        self.wait_for_page_ready("会社情報ページ", (By.XPATH, COMPANY_CONTAINER_XPATH))
+                    self.archive_driver_page(company_url)
+                if not div_texts:
+                    div_texts = self.element_texts(COMPANY_CONTAINER_XPATH)
+            apply_company_texts(div_texts, job_data)
+            if company_url:
+                self.store_company_info(company_url, job_data)
             return job_data
             
         except Exception as e:
             logger.error(f"会社情報の取得中にエラー: {e}")
             return job_data
-def main():
-    """メイン実行関数"""
+
+    def load_cached_company_info(self, company_url, job_data):
+        """
+        キャッシュにある会社情報をjob_dataに格納する
+        
+        Args:
+            company_url (str): 会社情報ページのURL
+            job_data (dict): 更新する求人データ辞書
+            
+        Returns:
+            bool: キャッシュにあった場合はTrue
+        """
+        if self.company_cache is None:
+            return False
+        cached = self.company_cache.get(company_url)
+        if cached is None:
+            return False
+        job_data.update(cached)
+        logger.info(f"会社情報をキャッシュから取得しました: {company_url}")
+        return True
+
+    def store_company_info(self, company_url, job_data):
+        """
+        job_dataの会社情報をキャッシュに保存する
+        
+        Args:
+            company_url (str): 会社情報ページのURL
+            job_data (dict): 会社情報を格納済みの求人データ辞書
+        """
+        if self.company_cache is not None:
+            self.company_cache.put(company_url, job_data)
+
+def _init_reextract_worker():
+    """reextract_archiveのワーカープロセスの初期化（項目ごとのINFOログを出力しない）"""
+    logging.disable(logging.INFO)
+
+
+def _reextract_page(task):
+    """
+    アーカイブの1ページから項目を抽出し直す（reextract_archiveのワーカープロセスで実行する）
+    
+    Args:
+        task (tuple): (アーカイブのディレクトリ, URL, 種類, HTMLのハッシュ, APIのJSONのハッシュ, 抽出方法)
+        
+    Returns:
+        tuple: (URL, 種類, 抽出した項目の辞書, 会社情報ページのURL)。求人詳細ページから項目を抽出できない場合は辞書がNone
+    """
+    root, url, kind, html_digest, json_digest, extraction_mode = task
+    tree = parse_html(PageArchive.read(root, html_digest)) if html_digest else None
+    payloads = html_next_data(tree) if tree is not None else []
+    if json_digest:
+        payloads = payloads + json.loads(PageArchive.read(root, json_digest))
+    
+    if kind == "company":
+        company_data = {"設立年数": "", "社員数": "", "平均年齢": ""}
+        texts = structured_company_texts(payloads, url) if extraction_mode == "structured" else []
+        if not texts and tree is not None:
+            texts = html_company_texts(tree)
+        apply_company_texts(texts, company_data)
+        return url, kind, company_data, None
+    
+    job_data = GreenScraper.new_job_data(url)
+    extracted = False
+    if extraction_mode == "structured":
+        extracted, _ = apply_structured_data(payloads, job_data, tree)
+    if not extracted and tree is not None:
+        extracted = extract_detail_tree(tree, job_data)
+    company_url = html_company_url(tree, url) if tree is not None else None
+    return url, kind, job_data if extracted else None, company_url
+
+
+def reextract_archive(archive_dir, workers=None, output=None):
+    """
+    アーカイブに保存したページから、ブラウザやネットワークを使わずに全項目を抽出し直す
+    
+    抽出ロジック（ラベルによる項目の取得、応募資格の解析、会社情報のラベルの解析）は取得時と同じものを使い、
+    ページ単位でプロセスプールに分散する。URLごとに最後に保存したページを使用する。
+    
+    Args:
+        archive_dir (str): アーカイブのディレクトリ（config.PAGE_ARCHIVE_DIR、省略時は output_YYYYMMDD/archive）
+        workers (int): ワーカープロセス数（省略時はCPU数）
+        output (str): 結果を保存するファイル（.csv ならCSV、それ以外はExcel。省略時はアーカイブのディレクトリに保存）
+        
+    Returns:
+        pd.DataFrame: 抽出し直した求人データ
+    """
+    if not HAS_LXML:
+        print("lxmlがインストールされていないため、抽出し直せません")
+        return pd.DataFrame()
+    if not os.path.exists(os.path.join(archive_dir, PageArchive.INDEX_NAME)):
+        print(f"ページのアーカイブがありません: {archive_dir}")
+        return pd.DataFrame()
+    extraction_mode = "structured" if structured_extraction_enabled() else "dom"
+    
+    # URLごとに最後に保存したHTMLとAPIのJSON
+    pages = OrderedDict()
+    for (url, kind, content_type), record in PageArchive.read_index(archive_dir).items():
+        if kind in ("job", "company"):
+            pages.setdefault((url, kind), {})[content_type] = record["sha256"]
+    tasks = [
+        (archive_dir, url, kind, digests.get("html"), digests.get("json"), extraction_mode)
+        for (url, kind), digests in pages.items()
+    ]
+    
+    started = time.monotonic()
+    jobs = []
+    companies = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_reextract_worker) as executor:
+        chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+        for url, kind, data, company_url in executor.map(_reextract_page, tasks, chunksize=chunksize):
+            if kind == "company":
+                companies[CompanyCache.make_key(url)] = data
+            elif data is not None:
+                jobs.append((data, company_url))
+            else:
+                logger.warning(f"詳細項目を抽出できませんでした: {url}")
+    
+    # 求人に会社情報ページの項目を結合する（構造化データから取得済みの項目は上書きしない）
+    rows = []
+    for job_data, company_url in jobs:
+        company_data = companies.get(CompanyCache.make_key(company_url)) if company_url else None
+        if company_data:
+            for name, value in company_data.items():
+                if value and not job_data.get(name):
+                    job_data[name] = value
+        rows.append(job_data)
+    result = pd.DataFrame(rows)
+    print(f"{len(tasks)}ページから求人{len(rows)}件を抽出し直しました（{time.monotonic() - started:.1f}秒）")
+    if result.empty:
+        return result
+    
+    if getattr(config, 'NORMALIZE_FIELDS', True) if HAS_CONFIG else True:
+        result = normalize_job_columns(result)
+    if output is None:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(archive_dir, f"green_jobs_reextract_{timestamp}.xlsx")
+    if output.endswith(".csv"):
+        result.to_csv(output, index=False, encoding="utf-8-sig")
+    else:
+        # リストの列はExcelに書き込めないため除く（save_to_excelと同じ配置）
+        result.drop(columns=[name for name in LIST_COLUMNS if name in result]).to_excel(
+            output, sheet_name='求人情報', startrow=1, startcol=1, index=False
+        )
+    print(f"データを {output} に保存しました")
+    return result
+
+
+def query_job_store(name, days=None, company=None, min_salary=None, output=None):
+    """
+    求人データの保存先（config.JOB_STORE_PATH）に問い合わせて結果を表示する（ブラウザは起動しない）
+    
+    Args:
+        name (str): 問い合わせの種類（JobStore.QUERIESのいずれか）
+        days (float): 直近の日数に絞り込む（省略時は全期間）
+        company (str): 企業名に含まれる文字列
+        min_salary (float): 給与（万円）がこの金額以上の求人に絞り込む
+        output (str): 結果を保存するCSVファイルのパス（省略時は表示のみ）
+        
+    Returns:
+        pd.DataFrame: 問い合わせ結果
+    """
+    store_path = getattr(config, 'JOB_STORE_PATH', "job_store.db") if HAS_CONFIG else "job_store.db"
+    if not os.path.exists(store_path):
+        print(f"求人データの保存先がありません: {store_path}")
+        return pd.DataFrame()
+    since = time.time() - days * 86400 if days else None
+    store = JobStore(store_path)
+    try:
+        result = store.query(name, since=since, company=company,
+                             min_salary=int(min_salary * 10000) if min_salary else None)
+    finally:
+        store.close()
+    if output:
+        result.to_csv(output, index=False, encoding="utf-8-sig")
+        print(f"{len(result)}件を {output} に保存しました")
+    elif result.empty:
+        print("該当する求人はありません")
+    else:
+        print(result.to_string(index=False))
+    return result
+
+
+def main(resume=False):
+    """
+    メイン実行関数
+    
+    Args:
+        resume (bool): Trueなら前回中断した実行のチェックポイントから再開する
+    """
     scraper = GreenScraper()
     
     try:
+        # 保存済みのセッションが有効ならログイン処理（ログイン方法の入力を含む）を省略する
+        session_restored = scraper.restore_session()
+        
         # ログイン方法の設定
         use_google = False
         
@@ -1095,29 +5192,64 @@ def main():
                 use_google = True
             elif has_green_auth:
                 logger.info("Green Japan認証情報が設定されているため、通常ログインを使用します")
-            else:
+            elif not session_restored:
                 # 両方未設定の場合は入力を求める
                 use_google = input("Google アカウントでログインしますか？ (y/n): ").strip().lower() == 'y'
-        else:
+        elif not session_restored:
             # configファイルがない場合は入力を求める
             use_google = input("Google アカウントでログインしますか？ (y/n): ").strip().lower() == 'y'
         
-        if scraper.login(use_google=use_google):
+        if session_restored or scraper.login(use_google=use_google):
             # お気に入りページのスクレイピング
-            job_data = scraper.scrape_favorites()
+            if HAS_CONFIG and getattr(config, 'ASYNC_MODE', False):
+                job_data = asyncio.run(scraper.scrape_favorites_async(resume=resume))
+            else:
+                job_data = scraper.scrape_favorites(resume=resume)
+            job_data = scraper.postprocess(job_data)
             
-            # 結果の保存
-            if not job_data.empty:
+            # 結果の保存（STREAMING_EXPORTが有効な場合は取得中に書き込み済み）
+            if scraper.export_path:
+                print(f"\n処理が完了しました。データは {scraper.export_path} に保存されています。")
+            elif not job_data.empty:
                 file_path = scraper.save_to_excel(job_data)
                 if file_path:
                     print(f"\n処理が完了しました。データは {file_path} に保存されています。")
             else:
                 print("\nスクレイピングされたデータがありません。")
+            
+            # 分析用に型付きの列形式でも保存（COLUMNAR_FORMATを設定した場合）
+            # （STREAMING_EXPORTが有効な場合は出力ファイルを閉じる際に保存済み）
+            columnar_path = scraper.columnar_path
+            if not job_data.empty:
+                columnar_path = scraper.save_columnar(job_data)
+            if columnar_path:
+                print(f"数値列を加えたデータは {columnar_path} に保存されています。")
         else:
             print("\nログインに失敗しました。")
     finally:
-        # ブラウザを閉じる
+        # 計測結果を保存してブラウザを閉じる
+        scraper.write_metrics()
         scraper.close()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Green Japan お気に入りページスクレイピングツール")
+    parser.add_argument("--resume", action="store_true", help="前回中断した実行のチェックポイントから再開する")
+    parser.add_argument("--query", choices=JobStore.QUERIES,
+                        help="スクレイピングせずに求人データの保存先に問い合わせる"
+                             "（salary-rose: 給与が上がった求人、removed: 前回からお気に入りを外れた求人、"
+                             "new: 新しく保存した求人、changes: 項目の変更履歴、search: 保存済みの求人）")
+    parser.add_argument("--days", type=float, help="--query の対象を直近の日数に絞り込む")
+    parser.add_argument("--company", help="--query の対象を企業名に含まれる文字列で絞り込む")
+    parser.add_argument("--min-salary", type=float, help="--query の対象を給与（万円）がこの金額以上の求人に絞り込む")
+    parser.add_argument("--output", help="--query の結果を保存するCSVファイル（--reextract では .csv 以外はExcel）")
+    parser.add_argument("--reextract", metavar="ARCHIVE_DIR",
+                        help="スクレイピングせずに、ページのアーカイブ（config.ARCHIVE_PAGES）から項目を抽出し直す")
+    parser.add_argument("--workers", type=int, help="--reextract のワーカープロセス数（省略時はCPU数）")
+    args = parser.parse_args()
+    if args.reextract:
+        reextract_archive(args.reextract, workers=args.workers, output=args.output)
+    elif args.query:
+        query_job_store(args.query, days=args.days, company=args.company,
+                        min_salary=args.min_salary, output=args.output)
+    else:
+        main(resume=args.resume)
\ No newline at end of file